@@ -0,0 +1,194 @@
+"""Vectorized solutions for many linear markets at once.
+
+Each market is a demand curve `P = demand_intercept + demand_slope * Q` and a
+supply curve `P = supply_intercept + supply_slope * Q`, as in `econ101.Demand`
+and `econ101.Supply`. Arguments are scalars or NumPy arrays that broadcast
+against each other, and results are dicts of columns. Solvers take an
+optional *dtype*: with `dtype=np.float32` inputs are cast once and all
+columns are computed and returned in single precision.
+"""
+import numpy as np
+
+COLUMNS = (
+    "price_consumer",
+    "price_producer",
+    "quantity",
+    "consumer_surplus",
+    "producer_surplus",
+    "government",
+    "dwl",
+)
+
+
+def _cast(dtype, *values):
+    """*values* as arrays of *dtype*, or unchanged when *dtype* is None."""
+    if dtype is None:
+        return values
+    return tuple(np.asarray(v, dtype=dtype) for v in values)
+
+
+def market_quantity(demand_intercept, demand_slope, supply_intercept, supply_slope):
+    """Market clearing quantity without interventions."""
+    return (demand_intercept - supply_intercept) / (supply_slope - demand_slope)
+
+
+def equilibrium(demand_intercept, demand_slope, supply_intercept, supply_slope, tax=0, dtype=None):
+    """Prices, quantity, surpluses and DWL under a per-unit *tax*.
+    Negative taxes are subsidies. Quantities are not allowed to be negative."""
+    demand_intercept, demand_slope, supply_intercept, supply_slope, tax = _cast(
+        dtype, demand_intercept, demand_slope, supply_intercept, supply_slope, tax
+    )
+    q_market = market_quantity(
+        demand_intercept, demand_slope, supply_intercept, supply_slope
+    )
+    distortion = tax / (supply_slope - demand_slope)
+    q = np.maximum(q_market - distortion, 0)
+    q_efficient = np.maximum(q_market, 0)
+
+    p_consumer = demand_intercept + demand_slope * q
+    p_producer = supply_intercept + supply_slope * q
+    welfare = _welfare(demand_intercept, demand_slope, supply_intercept, supply_slope)
+    return {
+        "price_consumer": p_consumer,
+        "price_producer": p_producer,
+        "quantity": q,
+        "consumer_surplus": 0.5 * (demand_intercept - p_consumer) * q,
+        "producer_surplus": 0.5 * (p_producer - supply_intercept) * q,
+        "government": tax * q,
+        "dwl": welfare(q_efficient) - welfare(q),
+    }
+
+
+CONTROL_COLUMNS = COLUMNS + ("shortage", "excess_supply", "quota_rent")
+
+
+def price_ceiling(demand_intercept, demand_slope, supply_intercept, supply_slope, ceiling, dtype=None):
+    """Outcome under a maximum price. A binding ceiling leaves a shortage and
+    the supplied quantity is traded, assuming it goes to the buyers who value it most."""
+    demand_intercept, demand_slope, supply_intercept, supply_slope, ceiling = _cast(
+        dtype, demand_intercept, demand_slope, supply_intercept, supply_slope, ceiling
+    )
+    p_market = demand_intercept + demand_slope * market_quantity(
+        demand_intercept, demand_slope, supply_intercept, supply_slope
+    )
+    price = np.minimum(ceiling, p_market)
+    return _price_control(demand_intercept, demand_slope, supply_intercept, supply_slope, price)
+
+
+def price_floor(demand_intercept, demand_slope, supply_intercept, supply_slope, floor, dtype=None):
+    """Outcome under a minimum price. A binding floor leaves unsold excess
+    supply and the demanded quantity is traded, produced at the lowest cost."""
+    demand_intercept, demand_slope, supply_intercept, supply_slope, floor = _cast(
+        dtype, demand_intercept, demand_slope, supply_intercept, supply_slope, floor
+    )
+    p_market = demand_intercept + demand_slope * market_quantity(
+        demand_intercept, demand_slope, supply_intercept, supply_slope
+    )
+    price = np.maximum(floor, p_market)
+    return _price_control(demand_intercept, demand_slope, supply_intercept, supply_slope, price)
+
+
+def quota(demand_intercept, demand_slope, supply_intercept, supply_slope, limit, dtype=None):
+    """Outcome under a maximum traded quantity. Consumers pay the demand price at
+    the quota, producers receive the supply price and quota holders keep the difference."""
+    demand_intercept, demand_slope, supply_intercept, supply_slope, limit = _cast(
+        dtype, demand_intercept, demand_slope, supply_intercept, supply_slope, limit
+    )
+    q_market = market_quantity(demand_intercept, demand_slope, supply_intercept, supply_slope)
+    q = np.maximum(np.minimum(limit, q_market), 0)
+    return _controlled(
+        demand_intercept,
+        demand_slope,
+        supply_intercept,
+        supply_slope,
+        q=q,
+        p_consumer=demand_intercept + demand_slope * q,
+        p_producer=supply_intercept + supply_slope * q,
+        excess=0 * q,
+    )
+
+
+def _price_control(demand_intercept, demand_slope, supply_intercept, supply_slope, price):
+    q_demanded = np.maximum((price - demand_intercept) / demand_slope, 0)
+    q_supplied = np.maximum((price - supply_intercept) / supply_slope, 0)
+    return _controlled(
+        demand_intercept,
+        demand_slope,
+        supply_intercept,
+        supply_slope,
+        q=np.minimum(q_demanded, q_supplied),
+        p_consumer=price,
+        p_producer=price,
+        excess=q_demanded - q_supplied,
+    )
+
+
+def _controlled(
+    demand_intercept, demand_slope, supply_intercept, supply_slope, q, p_consumer, p_producer, excess
+):
+    """Columns for traded quantity *q* at given prices and *excess* demand.
+    Surpluses are areas between the curves and prices up to *q*."""
+    q_market = np.maximum(
+        market_quantity(demand_intercept, demand_slope, supply_intercept, supply_slope), 0
+    )
+    welfare = _welfare(demand_intercept, demand_slope, supply_intercept, supply_slope)
+
+    return {
+        "price_consumer": p_consumer,
+        "price_producer": p_producer,
+        "quantity": q,
+        "consumer_surplus": (demand_intercept - p_consumer) * q + 0.5 * demand_slope * q**2,
+        "producer_surplus": (p_producer - supply_intercept) * q - 0.5 * supply_slope * q**2,
+        "government": 0 * q,
+        "dwl": welfare(q_market) - welfare(q),
+        "shortage": np.maximum(excess, 0),
+        "excess_supply": np.maximum(-excess, 0),
+        "quota_rent": (p_consumer - p_producer) * q,
+    }
+
+
+def _welfare(demand_intercept, demand_slope, supply_intercept, supply_slope):
+    """Total surplus as a function of traded quantity: the area between the curves up to q."""
+
+    def welfare(q):
+        return (demand_intercept - supply_intercept) * q + 0.5 * (demand_slope - supply_slope) * q**2
+
+    return welfare
+
+
+SUPPLY_COLUMNS = ("firm", "price", "quantity", "revenue", "cost", "profit", "shutdown")
+
+
+def supply_schedule(price, constant, linear, quadratic, dtype=None):
+    """Profit-maximizing output of price-taking firms with total costs
+    `constant + linear * q + quadratic * q**2`, one row per firm and price.
+
+    Each firm produces where P = MC, or shuts down when the price is below
+    minimal average variable cost (the *linear* coefficient) and only pays
+    its fixed cost. Without a quadratic term output is unbounded (infinite)
+    at prices above marginal cost. Rows are ordered by firm, then price."""
+    price, constant, linear, quadratic = _cast(dtype, price, constant, linear, quadratic)
+    p = np.ravel(price)[None, :]
+    c0, c1, c2 = (np.ravel(c)[:, None] for c in (constant, linear, quadratic))
+    c0, c1, c2 = np.broadcast_arrays(c0, c1, c2)
+    dtype = np.result_type(p, c0, c1, c2, 0.0)  # keeps float32 inputs in single precision
+
+    shutdown = p < c1
+    with np.errstate(divide="ignore", invalid="ignore"):
+        q = np.where(c2 > 0, (p - c1) / (2 * c2), np.where(p > c1, np.inf, 0.0))
+    q = np.where(shutdown, 0.0, q).astype(dtype, copy=False)
+    with np.errstate(invalid="ignore"):
+        rising = np.where(c2 != 0, c2 * q, 0.0).astype(dtype, copy=False)  # avoids 0 * inf
+        revenue = p * q
+        cost = c0 + q * (c1 + rising)
+        profit = q * (p - c1 - rising) - c0
+    shape = np.broadcast_shapes(p.shape, c1.shape)
+    return {
+        "firm": np.broadcast_to(np.arange(shape[0])[:, None], shape).ravel(),
+        "price": np.broadcast_to(p, shape).ravel(),
+        "quantity": np.broadcast_to(q, shape).ravel(),
+        "revenue": np.broadcast_to(revenue, shape).ravel(),
+        "cost": np.broadcast_to(cost, shape).ravel(),
+        "profit": np.broadcast_to(profit, shape).ravel(),
+        "shutdown": np.broadcast_to(shutdown, shape).ravel(),
+    }
@@ -0,0 +1,56 @@
+"""Time the kernels in `loops` compiled (numba) against their pure Python versions.
+
+    python benchmark_loops.py
+
+Without numba both columns run the same Python code.
+"""
+import time
+
+import numpy as np
+
+import loops
+
+
+def timed(func, args, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func(*args)
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    rng = np.random.default_rng(0)
+    n = 200
+    cases = {
+        "step_search": (
+            loops.step_search,
+            (
+                rng.uniform(10, 20, n),
+                -rng.uniform(0.5, 2, n),
+                rng.uniform(0, 5, n),
+                rng.uniform(0.5, 2, n),
+                True,
+                1.0,
+                1.0,
+                0.01,
+            ),
+            3,
+        ),
+        "pure_nash": (loops.pure_nash, (rng.integers(0, 10, (2, 2, 2)).astype(float),), 10000),
+        "ppf_shortfall": (
+            loops.ppf_shortfall,
+            (rng.uniform(1, 3, n), rng.uniform(1, 3, n), 100.0, 2000.0, 1000.0),
+            1000,
+        ),
+    }
+    print("numba:", "yes" if loops.HAVE_NUMBA else "not installed, both paths are Python")
+    print("{:<15}{:>14}{:>14}{:>10}".format("kernel", "python, s", "compiled, s", "speedup"))
+    for name, (kernel, args, repeat) in cases.items():
+        kernel(*args)  # compile outside the timing
+        python = timed(getattr(loops.python, name), args, repeat)
+        compiled = timed(kernel, args, repeat)
+        print("{:<15}{:>14.2e}{:>14.2e}{:>10.1f}".format(name, python, compiled, python / compiled))
+
+
+if __name__ == "__main__":
+    main()
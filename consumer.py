@@ -0,0 +1,211 @@
+"""Consumer choice on a two-good budget line.
+
+A budget line is an `econ101.LinearConstraint` with prices `p1`, `p2` and income
+`endowment`. Utility classes below maximize utility on it in closed form.
+Utility parameters, prices and income may be NumPy arrays, so one utility
+object describes a whole population of heterogeneous consumers and all
+methods broadcast over consumers, prices and incomes without Python loops.
+
+```
+from consumer import CobbDouglas, MarketDemand
+
+u = CobbDouglas(alpha=rng.uniform(0.2, 0.8, 10**5))
+market = MarketDemand(u, income=rng.uniform(10, 100, 10**5), other_price=1)
+market.q(3.0)        # market demand for good 1 at price 3
+market.linear(3.0)   # econ101.Demand tangent to market demand at price 3
+```
+"""
+import numpy as np
+
+import econ101
+
+
+class Utility:
+    """Base class for two-good utility functions."""
+
+    def utility(self, x1, x2):
+        raise NotImplementedError
+
+    def marshallian(self, p1, p2, income):
+        """Uncompensated demand, a tuple of (x1, x2) maximizing utility given *income*."""
+        raise NotImplementedError
+
+    def expenditure(self, p1, p2, u):
+        """Minimal expenditure needed to reach utility *u*."""
+        raise NotImplementedError
+
+    def indirect_utility(self, p1, p2, income):
+        """Maximal utility given prices and *income*."""
+        return self.utility(*self.marshallian(p1, p2, income))
+
+    def hicksian(self, p1, p2, u):
+        """Compensated demand, a tuple of (x1, x2) minimizing expenditure to reach *u*."""
+        return self.marshallian(p1, p2, self.expenditure(p1, p2, u))
+
+    def choice(self, constraint: econ101.LinearConstraint):
+        """Optimal bundle (x1, x2) on a budget line."""
+        return self.marshallian(constraint.p1, constraint.p2, constraint.endowment)
+
+    def __call__(self, x1, x2):
+        return self.utility(x1, x2)
+
+
+class CobbDouglas(Utility):
+    def __init__(self, alpha=0.5):
+        """Cobb-Douglas utility `x1**alpha * x2**(1 - alpha)`."""
+        self.alpha = np.asarray(alpha, dtype=float)
+
+    def utility(self, x1, x2):
+        return x1**self.alpha * x2 ** (1 - self.alpha)
+
+    def marshallian(self, p1, p2, income):
+        return self.alpha * income / p1, (1 - self.alpha) * income / p2
+
+    def expenditure(self, p1, p2, u):
+        a = self.alpha
+        return u * (p1 / a) ** a * (p2 / (1 - a)) ** (1 - a)
+
+
+class CES(Utility):
+    def __init__(self, alpha=0.5, rho=0.5):
+        """Constant elasticity of substitution utility
+        `(alpha * x1**rho + (1 - alpha) * x2**rho)**(1 / rho)`, with `rho < 1`, `rho != 0`."""
+        self.alpha = np.asarray(alpha, dtype=float)
+        self.rho = np.asarray(rho, dtype=float)
+        if (self.rho >= 1).any() or (self.rho == 0).any():
+            raise ValueError("CES requires rho < 1 and rho != 0.")
+
+    @property
+    def sigma(self):
+        """Elasticity of substitution."""
+        return 1 / (1 - self.rho)
+
+    def utility(self, x1, x2):
+        a, r = self.alpha, self.rho
+        return (a * x1**r + (1 - a) * x2**r) ** (1 / r)
+
+    def _weights(self, p1, p2):
+        s = self.sigma
+        return self.alpha**s * p1 ** (1 - s), (1 - self.alpha) ** s * p2 ** (1 - s)
+
+    def price_index(self, p1, p2):
+        """Cost of one unit of utility."""
+        w1, w2 = self._weights(p1, p2)
+        return (w1 + w2) ** (1 / (1 - self.sigma))
+
+    def marshallian(self, p1, p2, income):
+        w1, w2 = self._weights(p1, p2)
+        total = w1 + w2
+        return income * w1 / (p1 * total), income * w2 / (p2 * total)
+
+    def indirect_utility(self, p1, p2, income):
+        return income / self.price_index(p1, p2)
+
+    def expenditure(self, p1, p2, u):
+        return u * self.price_index(p1, p2)
+
+
+class PerfectSubstitutes(Utility):
+    def __init__(self, a1=1, a2=1):
+        """Perfect substitutes utility `a1 * x1 + a2 * x2`.
+        Consumers indifferent between the goods split income equally."""
+        self.a1 = np.asarray(a1, dtype=float)
+        self.a2 = np.asarray(a2, dtype=float)
+
+    def utility(self, x1, x2):
+        return self.a1 * x1 + self.a2 * x2
+
+    def _utility_per_dollar(self, p1, p2):
+        return self.a1 / p1, self.a2 / p2
+
+    def marshallian(self, p1, p2, income):
+        b1, b2 = self._utility_per_dollar(p1, p2)
+        share1 = np.where(b1 > b2, 1.0, np.where(b1 < b2, 0.0, 0.5))
+        return share1 * income / p1, (1 - share1) * income / p2
+
+    def indirect_utility(self, p1, p2, income):
+        return income * np.maximum(*self._utility_per_dollar(p1, p2))
+
+    def expenditure(self, p1, p2, u):
+        return u / np.maximum(*self._utility_per_dollar(p1, p2))
+
+
+class PerfectComplements(Utility):
+    def __init__(self, a1=1, a2=1):
+        """Perfect complements (Leontief) utility `min(x1 / a1, x2 / a2)`."""
+        self.a1 = np.asarray(a1, dtype=float)
+        self.a2 = np.asarray(a2, dtype=float)
+
+    def utility(self, x1, x2):
+        return np.minimum(x1 / self.a1, x2 / self.a2)
+
+    def marshallian(self, p1, p2, income):
+        u = self.indirect_utility(p1, p2, income)
+        return self.a1 * u, self.a2 * u
+
+    def indirect_utility(self, p1, p2, income):
+        return income / (self.a1 * p1 + self.a2 * p2)
+
+    def expenditure(self, p1, p2, u):
+        return u * (self.a1 * p1 + self.a2 * p2)
+
+
+class MarketDemand:
+    def __init__(self, utility: Utility, income, other_price=1, good=1):
+        """Market demand for *good* (1 or 2) of consumers described by *utility* and
+        *income* arrays, holding the price of the other good fixed at *other_price*.
+
+        Works as the `other` curve in `econ101.Aggregate.equilibrium()` and as
+        a member of `econ101.Aggregate`."""
+        if good not in (1, 2):
+            raise ValueError("Good must be 1 or 2.")
+        self.utility = utility
+        self.income = np.asarray(income, dtype=float)
+        self.other_price = other_price
+        self.good = good
+        self.reference_price = 1
+        self._tangent = None  # (key, linear()) at the reference price
+
+    def quantities(self, p):
+        """Quantity demanded by each consumer at price *p*, consumers on the last axis.
+        An array of prices adds leading axes."""
+        p = np.asarray(p, dtype=float)[..., None]
+        if self.good == 1:
+            return self.utility.marshallian(p, self.other_price, self.income)[0]
+        return self.utility.marshallian(self.other_price, p, self.income)[1]
+
+    def q(self, p):
+        """Market quantity demanded at price *p* (scalar or array)."""
+        q = self.quantities(p)
+        return q.sum(axis=-1) if q.ndim else q
+
+    def dq_dp(self, p, rel_step=1e-6):
+        """Derivative of market demand with respect to price (central difference)."""
+        h = rel_step * np.maximum(np.abs(p), 1)
+        return (self.q(p + h) - self.q(p - h)) / (2 * h)
+
+    def linear(self, price=None) -> econ101.Demand:
+        """Linear demand curve tangent to market demand at *price*."""
+        if price is None:
+            price = self.reference_price
+        slope = 1 / self.dq_dp(price)
+        intercept = price - slope * self.q(price)
+        return econ101.Demand(float(intercept), float(slope))
+
+    def _reference_tangent(self) -> econ101.Demand:
+        """`linear()` at the reference price, refitted only when the reference
+        or other price changes. Utility and income are taken as fixed."""
+        key = self.reference_price, self.other_price
+        if self._tangent is None or self._tangent[0] != key:
+            self._tangent = key, self.linear()
+        return self._tangent[1]
+
+    @property
+    def slope(self):
+        """Slope of `linear()` at the reference price, used by `econ101.Aggregate`."""
+        return self._reference_tangent().slope
+
+    @property
+    def intercept(self):
+        """Intercept of `linear()` at the reference price."""
+        return self._reference_tangent().intercept
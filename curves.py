@@ -14,12 +14,15 @@ _______________________*____________ Q (Quantity) axis
                        ^ q_intercept
 ```
 """
-from dataclasses import dataclass
+import copy
+from dataclasses import dataclass, fields, replace
 
 import numpy as np
 import matplotlib.pyplot as plt  # type: ignore
 from matplotlib.axes import Axes  # type: ignore
 
+import kernel
+
 
 def make_qp_curve(intercept: float, slope: float) -> "Curve":
     """Create curve in Q(P) form."""
@@ -36,6 +39,29 @@ class Curve:
     intercept: float
     slope: float
 
+    def __post_init__(self):
+        # kept off the dataclass fields, so asdict(), repr and == ignore it
+        self._observers = []
+
+    def __copy__(self) -> "Curve":
+        """Copy without the observers of this curve."""
+        return replace(self)
+
+    def __deepcopy__(self, memo) -> "Curve":
+        return type(self)(**{f.name: copy.deepcopy(getattr(self, f.name), memo) for f in fields(self)})
+
+    def subscribe(self, callback) -> None:
+        """Call *callback(curve, old_intercept)* after every shift of this curve."""
+        self._observers.append(callback)
+
+    def unsubscribe(self, callback) -> None:
+        self._observers.remove(callback)
+
+    @property
+    def coef(self):
+        """Coefficients in ascending order, as used by `kernel`."""
+        return self.intercept, self.slope
+
     @property
     def q_intercept(self):
         """Line intercept at quantity axis."""
@@ -47,7 +73,7 @@ class Curve:
 
     def q(self, p):
         """Shorthand for quantity() method."""
-        return -(self.intercept / self.slope) + (p / self.slope)
+        return kernel.inverse(self.coef, p)
 
     def price(self, quantity):
         """Price given *quantity* demanded or supplied."""
@@ -55,12 +81,15 @@ class Curve:
 
     def p(self, q):
         """Shorthand for price() method."""
-        return self.intercept + self.slope * q
+        return kernel.evaluate(self.coef, q)
 
     def vertical_shift(self, delta: float) -> "Curve":
         """Shift curve vertically by amount delta. Shifts demand curve to the right.
         Shifts supply curve to the left."""
+        old_intercept = self.intercept
         self.intercept += delta
+        for callback in self._observers:
+            callback(self, old_intercept)
         return self
 
     def horizontal_shift(self, delta: float) -> "Curve":
@@ -71,15 +100,8 @@ class Curve:
     def equilibrium(self, other_curve: "Curve") -> "Point":
         """Returns a point of intersection of two curves.
         Allows for negative prices or quantities."""
-        v1 = np.array([1, -self.slope])
-        v2 = np.array([1, -other_curve.slope])
-        A = np.array([v1, v2])
-        # FIXME: must use ndarray of matrix
-        b = self.intercept, other_curve.intercept
-        b = np.matrix(b).T  # type: ignore
-        x = np.linalg.inv(A) * b
-        x = x.squeeze()
-        return Point(price=x[0, 0], quantity=x[0, 1])
+        p, q = kernel.intersect(self.coef, other_curve.coef)
+        return Point(price=p, quantity=q)
 
     def plot(self, ax=None, color="black", linewidth=2, max_q=None) -> Axes:
         if ax is None:
@@ -110,6 +132,79 @@ class Curve:
         return ax
 
 
+@dataclass
+class CurveArray:
+    """Many P(Q) lines stored as columns of intercepts and slopes.
+
+    Methods work on all curves at once and broadcast against price or
+    quantity arrays. Indexing returns a single curve of type *kind*.
+    Columns are stored as *dtype*; `np.float32` halves the memory of large
+    populations of curves.
+    """
+
+    intercept: np.ndarray
+    slope: np.ndarray
+    kind: type = Curve
+    dtype: type = np.float64
+
+    def __post_init__(self):
+        self.intercept = np.asarray(self.intercept, dtype=self.dtype)
+        self.slope = np.asarray(self.slope, dtype=self.dtype)
+
+    @classmethod
+    def from_curves(cls, curves, dtype=np.float64) -> "CurveArray":
+        """Collect a sequence of curves into columns."""
+        curves = list(curves)
+        kind = type(curves[0]) if curves else Curve
+        return cls(
+            intercept=[c.intercept for c in curves],
+            slope=[c.slope for c in curves],
+            kind=kind,
+            dtype=dtype,
+        )
+
+    @property
+    def coef(self):
+        """Coefficient columns in ascending order, as used by `kernel`."""
+        return self.intercept, self.slope
+
+    def __len__(self) -> int:
+        return self.intercept.size
+
+    def __getitem__(self, key):
+        if np.ndim(self.intercept[key]):
+            return CurveArray(self.intercept[key], self.slope[key], self.kind, self.dtype)
+        return self.kind(float(self.intercept[key]), float(self.slope[key]))
+
+    @property
+    def q_intercept(self) -> np.ndarray:
+        """Line intercepts at quantity axis."""
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(self.slope != 0, -self.intercept / self.slope, np.nan)
+
+    def q(self, p):
+        """Quantity of each curve at price *p*."""
+        return kernel.inverse(self.coef, p)
+
+    def p(self, q):
+        """Price of each curve at quantity *q*."""
+        return kernel.evaluate(self.coef, q)
+
+    def total_q(self, p):
+        """Aggregate quantity at price *p* (a scalar or array of prices), the
+        horizontal sum of the curves with negative quantities counted as zero.
+        Summed pairwise in the column dtype."""
+        p = np.asarray(p, dtype=self.dtype)
+        shape = self.intercept.shape + (1,) * p.ndim
+        q = kernel.inverse((self.intercept.reshape(shape), self.slope.reshape(shape)), p)
+        return kernel.pairwise_sum(np.maximum(q, 0))
+
+    def equilibrium(self, other) -> "Point":
+        """Intersections with *other* curves, as a point with array coordinates."""
+        p, q = kernel.intersect(self.coef, other.coef)
+        return Point(price=p, quantity=q)
+
+
 def plotline(ax, p1: "Point", p2: "Point", color="black", linewidth=2) -> None:
     """Plot a line connecting two points: *p1* and *p2*."""
     y1, x1 = p1.tuple()
@@ -176,8 +271,12 @@ class Demand(Curve):
 
 class Supply(Curve):
     def producer_surplus(self, price: float) -> float:
-        """Calculate producer surplus (PS) at a given *price*."""
-        raise NotImplementedError
+        """Calculate producer surplus (PS) at a given *price*: the area between
+        the price and the curve, zero if nothing is supplied."""
+        qs = self.q(price)
+        if qs <= 0:
+            return 0
+        return 0.5 * qs * (price - self.intercept)
 
     def plot_surplus(self, price, ax=None):
         """Fill producer surplus (PS) area."""
@@ -1,10 +1,14 @@
 import abc
+import functools
 import numbers
 
 import matplotlib as mpl
 import matplotlib.pyplot as plt
 import numpy as np
 
+import kernel
+import sampling
+
 ############################################################
 #### Plot Helpers
 plotprops = {"color": "black", "linewidth": 2}
@@ -30,18 +34,13 @@ class PolyBase(np.polynomial.Polynomial):
 
     def p(self, q: float):
         "Price given a value q"
-        return self.__call__(q)
-
-    def q(self, p):
-        "Quantity given a value p"
+        return kernel.evaluate(self.coef, q)
 
-        coef2 = (self.coef[0] - p, *self.coef[1:])[::-1]
-        roots = np.roots(coef2)
-
-        if roots.shape == (1,):
-            return roots[0]
-        else:
-            return roots
+    def q(self, p, branch="largest"):
+        """Quantity given a price or an array of prices p.
+        For curves that are not monotone, *branch* picks the largest or the
+        smallest nonnegative quantity, see `kernel.inverse()`."""
+        return kernel.inverse(self.coef, p, branch)
 
     def plot(self, ax=None, max_q=100, label=None, min_plotted_q=0):
         """Plot the cost curve.
@@ -50,10 +49,11 @@ class PolyBase(np.polynomial.Polynomial):
         if ax == None:
             ax = plt.gca()
 
-        x_vals = np.linspace(0, max_q, max_q * 5 + 1)
-        # if self.reciprocal != 0:
-        x_vals = x_vals[x_vals >= min_plotted_q]
-        y_vals = self(x_vals)
+        if kernel.is_affine(self.coef):
+            x_vals = np.array([min_plotted_q, max_q], dtype=float)
+            y_vals = self.p(x_vals)
+        else:
+            x_vals, y_vals = sampling.adaptive(self.p, min_plotted_q, max_q)
 
         ax.plot(x_vals, y_vals, label=label)
         # ax.set_xlabel("Quantity")
@@ -398,37 +398,24 @@ class Cost(PolyBase):
         return AverageCost(self.coef)
 
     def efficient_scale(self):
-        """Find q that minimizes average cost."""
-
-        # Avg Cost = constant/q + linear + quadratic * q
-        # d/dq Avg Cost = - constant/q**2 + quadratic = 0
-        # q**2 = constant / quadratic
-        coef = self.coef
-        try:
-            constant = coef[0]
-            quad = coef[2]
-
-            return np.sqrt(constant / quad)
-
-        except IndexError:
-            "increasing returns to scale forever"
-            if constant > 0:
-                return np.inf
-
-            elif len(coef) <= 2:  # linear costs
-                raise ValueError("constant returns to scale")
+        """Find q that minimizes average cost, for any polynomial degree."""
+        coef = _coef_key(self.coef)
+        if len(coef) <= 2 and coef[0] == 0:  # linear costs
+            raise ValueError("constant returns to scale")
+        # infinite if increasing returns to scale forever
+        return min_average_cost(coef)[0]
 
     def breakeven_price(self):
         """Assume perfect competition and find price such that economic profit is zero."""
 
-        # find MC = ATC
-        return self.marginal_cost().cost(self.efficient_scale())
+        # minimal ATC, where MC = ATC
+        return min_average_cost(_coef_key(self.coef))[1]
 
     def shutdown_price(self):
         """Assume perfect competition and find price such that total revenue = total variable cost."""
 
-        var = self.variable_cost()
-        return var.marginal_cost().cost(var.efficient_scale())
+        # minimal AVC
+        return min_average_cost(_coef_key(self.variable_cost().coef))[1]
 
     def long_run_plot(self, ax=None):
         ac = self.average_cost()
@@ -512,15 +499,31 @@ class AverageCost:
         self.coef = coef
 
     def __call__(self, q):
-        return Cost(self.coef)(q) / q
+        """Average cost at q, vectorized over quantity arrays."""
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return kernel.evaluate(self.coef, q) / q
 
     def cost(self, q):
         return self(q)
 
-    def plot(self, ax=None, max_q=10):
+    def plot(self, ax=None, max_q=10, label=None, min_plotted_q=0.01):
         if ax == None:
             ax = plt.gca()
 
-        xs = np.linspace(0.01, max_q, int(10 * max_q))
-        ys = self(xs)
+        xs, ys = sampling.adaptive(self, min_plotted_q, max_q)
         ax.plot(xs, ys, label=label)
+
+
+def _coef_key(coef) -> tuple:
+    return tuple(float(c) for c in coef)
+
+
+@functools.lru_cache(maxsize=4096)
+def min_average_cost(coef: tuple):
+    """Cached (efficient scale, minimal average cost) for a tuple of cost coefficients."""
+    return kernel.average_cost_minimum(coef)
+
+
+def efficient_scales(costs):
+    """Efficient scale and breakeven price for a batch of Cost objects in one vectorized pass."""
+    return kernel.average_cost_minimum(kernel.columns([c.coef for c in costs]))
@@ -1,6 +1,15 @@
+import copy
+
 import matplotlib.pyplot as plt
 import numpy as np
 
+import batch
+import instrument
+import kernel
+import loops
+import sampling
+import surplus
+
 
 class Curve:
     def __init__(self, intercept, slope, inverse=True):
@@ -22,44 +31,70 @@ class Curve:
                 self.q_intercept = -self.intercept / self.slope
             else:
                 self.q_intercept = np.nan
+        self.observers = []
+
+    def __copy__(self):
+        """Copy without the observers of this curve."""
+        new = object.__new__(type(self))
+        new.__dict__.update(self.__dict__)
+        new.observers = []
+        return new
+
+    def __deepcopy__(self, memo):
+        new = self.__copy__()
+        memo[id(self)] = new
+        state = {k: v for k, v in self.__dict__.items() if k != "observers"}
+        new.__dict__.update(copy.deepcopy(state, memo))
+        return new
+
+    def subscribe(self, callback):
+        """Call *callback(curve, old_intercept)* after every shift of this curve."""
+        self.observers.append(callback)
+
+    def unsubscribe(self, callback):
+        self.observers.remove(callback)
+
+    def _notify(self, old_intercept):
+        for callback in self.observers:
+            callback(self, old_intercept)
+
+    @property
+    def coef(self):
+        """Coefficients in ascending order, as used by `kernel`."""
+        return self.intercept, self.slope
 
     def q(self, p):
         """Quantity demanded or supplied at price p."""
-        return (self.intercept / (-self.slope)) + (p / self.slope)
+        return kernel.inverse(self.coef, p)
 
     def p(self, q):
         """Price when quantity demanded/supplied is at q."""
-        return self.intercept + self.slope * q
+        return kernel.evaluate(self.coef, q)
 
     def vertical_shift(self, delta):
         """Shift curve vertically by amount delta. Shifts demand curve to the right.
         Shifts supply curve to the left."""
+        old_intercept = self.intercept
         self.intercept += delta
         if self.slope != 0:
             self.q_intercept = -self.intercept / self.slope
+        self._notify(old_intercept)
 
     def horizontal_shift(self, delta):
         """Shift curve horizontally by amount delta. Positive values are shifts to the right."""
+        old_intercept = self.intercept
         equiv_vert = delta * -self.slope
         self.intercept += equiv_vert
         if self.slope != 0:
             self.q_intercept = -self.intercept / self.slope
+        self._notify(old_intercept)
 
+    @instrument.instrumented
     def equilibrium(self, other_curve):
         """Returns a tuple (p, q). Allows for negative prices or quantities."""
+        return kernel.intersect(self.coef, other_curve.coef)
 
-        v1 = np.array([1, -self.slope])
-        v2 = np.array([1, -other_curve.slope])
-
-        b = self.intercept, other_curve.intercept
-
-        A = np.matrix((v1, v2))
-        b = np.matrix(b).T
-
-        x = np.linalg.inv(A) * b
-        x = x.squeeze()
-        return x[0, 0], x[0, 1]  # p, q
-
+    @instrument.instrumented
     def plot(self, ax=None, color="black", linewidth=2, max_q=10, clean=True):
         if ax == None:
             ax = plt.gca()
@@ -82,6 +117,7 @@ class Curve:
             ax.spines["top"].set_visible(False)
             ax.spines["right"].set_visible(False)
 
+    @instrument.instrumented
     def equilibrium_plot(
         self, other_curve, ax=None, linewidth=2, annotate=False, clean=True
     ):
@@ -153,7 +189,14 @@ class Curve:
         # ax.set_xlim(min_x, max_x)
 
     def externality(self, externality, is_signed=True, is_positive=None):
-        """Creates marginal social cost or benefit given a Curve and externality."""
+        """Creates marginal social cost or benefit given a Curve and externality.
+
+        A signed *externality* is added to the price: positive values raise the
+        demand curve to MSB or the supply curve to MSC. With *is_positive* the
+        sign follows from the kind of externality instead: a positive
+        externality raises demand and lowers supply, a negative one lowers
+        demand and raises supply. See the `externality` module for efficient
+        outcomes and Pigouvian taxes."""
 
         is_demand = self.slope < 0  # figure out if this is supply or demand curve
 
@@ -168,8 +211,8 @@ class Curve:
             else:
                 externality = +np.abs(externality)
 
-        social_curve = Curve(
-            self.intercept + self.externalitiy, self.slope, inverse=True
+        social_curve = type(self)(
+            self.intercept + externality, self.slope, inverse=True
         )
         return social_curve
 
@@ -183,23 +226,24 @@ class SocialBenefit:
         self.demand_array = demand_array
 
     def marginal_social_benefit(self, q):
-        """Vertical summation of demand curves"""
+        """Vertical summation of demand curves, vectorized over quantity arrays."""
         benefit = 0
         for curve in self.demand_array:
-            benefit += np.max([0, curve.p(q)])
+            benefit = benefit + np.maximum(0, curve.p(q))
         return benefit
 
+    @instrument.instrumented
     def plot(self, ax=None, color="black", linewidth=2, max_q=10, clean=True):
         if ax == None:
             ax = plt.gca()
 
         intercepts = sorted([x.q_intercept for x in self.demand_array])
-        slopes = sorted([x.slope for x in self.demand_array])
 
         max_x = intercepts[-1]
 
-        x_vec = np.linspace(0, max_x, 1000)
-        y_vec = [self.msb(x) for x in x_vec]
+        # MSB is piecewise linear with kinks where demand curves hit zero
+        x_vec = sampling.vertices(intercepts, 0, max_x)
+        y_vec = self.msb(x_vec)
 
         ax.plot(x_vec, y_vec, color=color, linewidth=linewidth)
 
@@ -210,6 +254,7 @@ class SocialBenefit:
             ax.spines["top"].set_visible(False)
             ax.spines["right"].set_visible(False)
 
+    @instrument.instrumented
     def efficient_outcome(self, other, quantity_guess=1, tolerance=0.05):
         """Find MSB and quantity with another aggregate or curve object. MSB as price does not give the
         corresponding quantity."""
@@ -243,8 +288,10 @@ class SocialBenefit:
                 - other.productive_efficiency(quantity_guess)[1]
             )
 
+        instrument.record("SocialBenefit.efficient_outcome", iterations=counter)
         return self.msb(quantity_guess), quantity_guess
 
+    @instrument.instrumented
     def private_outcome(self, mc_array):
         """Find private outcome. MC array must be ordered in alignment with demand_array."""
 
@@ -272,6 +319,7 @@ class SocialBenefit:
         b = np.matrix(b_values).T
 
         # return A, b
+        instrument.record("SocialBenefit.private_outcome", matrix_size=A.shape[0])
         x = np.linalg.inv(A) * b
         x = x.squeeze()
         return x  # q decisions
@@ -335,13 +383,47 @@ class Aggregate:
         self.is_demand = slopes[0] < 0
         self.is_supply = not self.is_demand
 
+    def _columns(self):
+        """Intercepts and slopes of member curves as float arrays."""
+        intercept = np.array([curve.intercept for curve in self.curve_array], float)
+        slope = np.array([curve.slope for curve in self.curve_array], float)
+        return intercept, slope
+
+    def kink_table(self):
+        """Sorted intercepts with prefix sums for exact surplus (see `surplus`).
+        Members must be linear curves. The table is kept until a member shifts
+        or the list of members changes."""
+        if getattr(self, "_kink_table", None) is None or self._kink_members != self.curve_array:
+            if not _is_linear(self):
+                raise TypeError("Exact surplus needs linear member curves; use `linear()` of non-linear members.")
+            for curve in getattr(self, "_kink_members", []):
+                curve.unsubscribe(self._drop_kink_table)
+            self._kink_members = list(self.curve_array)
+            for curve in self._kink_members:
+                curve.subscribe(self._drop_kink_table)
+            self._kink_table = surplus.KinkTable(*self._columns())
+        return self._kink_table
+
+    def _drop_kink_table(self, curve, old_intercept):
+        self._kink_table = None
+
+    def surplus(self, p):
+        """Total consumer (demand) or producer (supply) surplus at price p,
+        vectorized over price arrays."""
+        return self.kink_table().surplus(p)
+
+    def surplus_by_curve(self, p):
+        """Surplus of each member curve at price p, shaped (n curves,) + shape of p."""
+        return self.kink_table().participants(p)
+
     def q(self, p):
-        """Find aggregate quantity at price p."""
+        """Find aggregate quantity at price p, vectorized over price arrays."""
         total_q = 0
         for curve in self.curve_array:
-            total_q += np.max([0, curve.q(p)])
+            total_q = total_q + np.maximum(0, curve.q(p))
         return total_q
 
+    @instrument.instrumented
     def productive_efficiency(self, Q):
         """Find q1, ..., qn and p at total quantity Q."""
 
@@ -379,6 +461,7 @@ class Aggregate:
         b = np.matrix(b_values).T
 
         # return A, b
+        instrument.record("Aggregate.productive_efficiency", matrix_size=A.shape[0])
         x = np.linalg.inv(A) * b
         x = x.squeeze()
         return x[0, :-1], x[0, -1]  # q1 ... qn, MC
@@ -392,6 +475,7 @@ class Aggregate:
     def distributive_efficiency(self, Q):
         return self.productive_efficiency(Q)
 
+    @instrument.instrumented
     def plot(self, ax=None, color="black", linewidth=2, max_q=10, clean=True):
         if ax == None:
             ax = plt.gca()
@@ -401,17 +485,17 @@ class Aggregate:
 
         if np.min(slopes) < 0:  # demand curves
             max_y = intercepts[-1]
-
-            y_vec = np.linspace(0, max_y, 1000)
-            x_vec = [self.q(y) for y in y_vec]
-
-            ax.plot(x_vec, y_vec, color=color, linewidth=linewidth)
         else:  # supply curve
-            max_y = intercepts[-1] * 2
-            y_vec = np.linspace(0, np.max([10, max_y * 2]), 1000)
-            x_vec = [self.q(y) for y in y_vec]
+            max_y = np.max([10, intercepts[-1] * 4])
 
-            ax.plot(x_vec, y_vec, color=color, linewidth=linewidth)
+        if all(kernel.is_affine(getattr(x, "coef", ())) for x in self.curve_array):
+            # exact plot through the kinks at the curve intercepts
+            y_vec = sampling.vertices(intercepts, 0, max_y)
+            x_vec = self.q(y_vec)
+        else:
+            y_vec, x_vec = sampling.adaptive(self.q, 0, max_y)
+
+        ax.plot(x_vec, y_vec, color=color, linewidth=linewidth)
         if clean:
             self.plot_clean()
 
@@ -457,16 +541,51 @@ class Aggregate:
         ax.spines["top"].set_visible(False)
         ax.spines["right"].set_visible(False)
 
+    @instrument.instrumented
     def equilibrium(self, other, price_guess=1, tolerance=0.05):
         """Find market clearing price and quantity with another aggregate or curve object."""
 
+        if _is_linear(self) and _is_linear(other):
+            price_guess, counter = self._linear_step_search(other, float(price_guess), float(tolerance))
+        else:
+            price_guess, counter = self._step_search(other, price_guess, tolerance)
+
+        # get points on supply and demand
+        # use local linearity to find exact solution
+        # p1 = price_guess, self.q(price_guess)
+        # p2 = price_guess, self.q(price_guess)
+
+        # returns point on the object on which the method is called
+        instrument.record("Aggregate.equilibrium", iterations=counter)
+        return price_guess, self.q(price_guess)
+
+    def _linear_step_search(self, other, price_guess, tolerance):
+        """Price walk over intercept and slope columns, compiled when numba is available."""
+        intercept, slope = self._columns()
+        if isinstance(other, Aggregate):
+            other_intercept, other_slope = other._columns()
+        else:
+            other_intercept, other_slope = np.array([other.intercept], float), np.array([other.slope], float)
+        sign = 1.0 if self.is_demand else -1.0
+        return loops.step_search(
+            intercept,
+            slope,
+            other_intercept,
+            other_slope,
+            isinstance(other, Aggregate),
+            sign,
+            price_guess,
+            tolerance,
+        )
+
+    def _step_search(self, other, price_guess, tolerance):
+        """Price walk for any curves with a q(p) method, such as `consumer.MarketDemand`."""
         surplus = self.q(price_guess) - other.q(price_guess)
         if self.is_demand:
             excess_demand = surplus
         else:
             excess_demand = -surplus
 
-        has_cycled = False
         counter, last_counter = 0, 0
         scale = 1
         while np.abs(excess_demand) > tolerance:
@@ -474,28 +593,20 @@ class Aggregate:
                 price_guess += tolerance * scale
 
                 if counter > last_counter:
-                    has_cycled = True
                     scale *= 0.5
                 counter += 1
                 last_counter = counter
             else:  # must be strictly negative bc while condition
                 price_guess -= tolerance
                 counter += 1
-            # print(price_guess, surplus)
             surplus = self.q(price_guess) - other.q(price_guess)
             if self.is_demand:
                 excess_demand = surplus
             else:
                 excess_demand = -surplus
+        return price_guess, counter
 
-        # get points on supply and demand
-        # use local linearity to find exact solution
-        # p1 = price_guess, self.q(price_guess)
-        # p2 = price_guess, self.q(price_guess)
-
-        # returns point on the object on which the method is called
-        return price_guess, self.q(price_guess)
-
+    @instrument.instrumented
     def equilibrium_plot(self, other, ax=None):
         if ax == None:
             ax = plt.gca()
@@ -549,6 +660,13 @@ class Aggregate:
         ax.set_xticks(important_x)
 
 
+def _is_linear(obj) -> bool:
+    """True for a linear `Curve` or an `Aggregate` made only of them."""
+    if isinstance(obj, Aggregate):
+        return all(isinstance(curve, Curve) for curve in obj.curve_array)
+    return isinstance(obj, Curve)
+
+
 class Demand(Curve):
     """Creates linear, downward-sloping demand curve."""
 
@@ -581,27 +699,18 @@ class Supply(Curve):
         Curve.__init__(self, intercept, slope, inverse)
 
     def producer_surplus(self, p):
+        """Area between price *p* and the supply curve up to the quantity
+        supplied, as in `Equilibrium.surplus()`. With a negative intercept
+        this includes the part below zero price."""
         qs = self.q(p)
 
         if qs <= 0:
             return 0
 
-        if self.intercept >= 0:
-            tri_height = -self.intercept + p
-            tri_base = qs
-
-            ps1 = 0.5 * tri_base * tri_height
-
-            return ps1
+        tri_height = -self.intercept + p
+        tri_base = qs
 
-        # get rectangle
-        rect_w = self.q_intercept
-        rect_h = p
-        rect_area = rect_w * rect_h
-
-        tri_area = 0.5 * (qs - rect_w) * p
-
-        return tri_area + rect_area
+        return 0.5 * tri_base * tri_height
 
     def plot_surplus(self, demand, ax=None, annotate=False):
         # p,q = self.equilibrium(demand)
@@ -628,8 +737,7 @@ class Equilibrium:
         self.q, self.market_q = q, q
         self.demand = demand
         self.supply = supply
-        self.tax = 0
-        self.subsidy = 0
+        self._clear_policy()
         self.p_consumer = self.p
         self.p_producer = self.p
         self.dwl = 0
@@ -647,6 +755,7 @@ class Equilibrium:
         if clean:
             self.plot_clean(ax, fresh_ticks=fresh_ticks)
 
+    @instrument.instrumented
     def plot(self, ax=None, annotate=False, clean=True, fresh_ticks=True):
         """Plot the intersection of two curves."""
         if ax == None:
@@ -738,13 +847,17 @@ class Equilibrium:
     def surplus(self):
         """Returns producer surplus, consumer surplus, government revenue.
         Negative government revenue indicates government expenditure."""
-        ps = self.supply.producer_surplus(e.p_producer)
-        cs = self.demand.consumer_surplus(e.p_consumer)
+        # areas between each curve and its price over the traded quantity,
+        # which also covers binding price controls
+        q = self.q
+        ps = (self.p_producer - self.supply.intercept) * q - 0.5 * self.supply.slope * q**2
+        cs = (self.demand.intercept - self.p_consumer) * q + 0.5 * self.demand.slope * q**2
         # Govt revenue
         govt = (self.tax - self.subsidy) * self.q
 
         return ps, cs, govt
 
+    @instrument.instrumented
     def plot_surplus(self, ax=None, annotate=True, items=["cs", "ps", "govt"]):
         if ax == None:
             ax = plt.gca()
@@ -800,6 +913,7 @@ class Equilibrium:
             if "ps" in items:
                 ax.text(x_pos, ps_y, "PS", ha="center", va="center")
 
+    @instrument.instrumented
     def plot_dwl(self, ax=None, annotate=True):
         """Plot deadweight loss region."""
         if ax == None:
@@ -849,8 +963,10 @@ class Equilibrium:
     def set_tax(self, tax):
         """Impose a per-unit tax. This overwrites other taxes or subsidies instead of adding to them.
         Nominal incidence is not considered,
-        so this works for taxes/subsidies imposed on either demand or supply."""
+        so this works for taxes/subsidies imposed on either demand or supply.
+        Any price control or quota is lifted."""
 
+        self._clear_policy()
         self.tax = tax
 
         # Change in market quantity
@@ -870,11 +986,11 @@ class Equilibrium:
         if self.q < 0:
             self.q = 0
 
-        # calculate DWL
-        self.dwl = np.abs(self.distortion * self.tax * 0.5)
-
-        # clear any subsidy
-        self.subsidy = 0
+        # calculate DWL, capped at total surplus when the tax is prohibitive
+        result = batch.equilibrium(*self._curve_coef(), self.tax)
+        self.dwl = float(result["dwl"])
+        self.consumer_surplus = float(result["consumer_surplus"])
+        self.producer_surplus = float(result["producer_surplus"])
 
     def set_subsidy(self, subsidy):
         """Impose a per-unit subsidy. This overwrites other taxes or subsidies instead of adding to them."""
@@ -883,6 +999,47 @@ class Equilibrium:
         self.distortion = -self.distortion
         self.tax = 0  # correct tax to zero
 
+    def set_price_ceiling(self, ceiling):
+        """Impose a maximum price. A binding ceiling creates a shortage."""
+        self._set_control(batch.price_ceiling(*self._curve_coef(), ceiling))
+
+    def set_price_floor(self, floor):
+        """Impose a minimum price. A binding floor creates excess supply."""
+        self._set_control(batch.price_floor(*self._curve_coef(), floor))
+
+    def set_quota(self, limit):
+        """Impose a maximum traded quantity. Quota holders earn the quota rent."""
+        self._set_control(batch.quota(*self._curve_coef(), limit))
+
+    def _curve_coef(self):
+        return (*self.demand.coef, *self.supply.coef)
+
+    def _clear_policy(self):
+        """Reset the state of taxes, subsidies, price controls and quotas."""
+        self.tax = 0
+        self.subsidy = 0
+        self.distortion = 0
+        self.shortage = 0
+        self.excess_supply = 0
+        self.quota_rent = 0
+
+    def _set_control(self, result):
+        """Store the outcome of a price control or quota, replacing taxes and subsidies."""
+        self._clear_policy()
+        self.q = float(result["quantity"])
+        self.p_consumer = float(result["price_consumer"])
+        self.p_producer = float(result["price_producer"])
+        if self.p_consumer != self.p_producer:
+            self.p = self.p_consumer, self.p_producer
+        else:
+            self.p = self.p_consumer
+        self.consumer_surplus = float(result["consumer_surplus"])
+        self.producer_surplus = float(result["producer_surplus"])
+        self.dwl = float(result["dwl"])
+        self.shortage = float(result["shortage"])
+        self.excess_supply = float(result["excess_supply"])
+        self.quota_rent = float(result["quota_rent"])
+
 
 ### COSTS
 
@@ -899,15 +1056,12 @@ class Cost:
         self.reciprocal = reciprocal
 
     def cost(self, q):
-        """Return cost at quantity q."""
-        if self.reciprocal == 0:  # allows for q = 0 calcs
-            return self.constant + self.linear * q + self.quadratic * (q**2)
-        return (
-            self.constant
-            + self.linear * q
-            + self.quadratic * (q**2)
-            + self.reciprocal * (1 / q)
-        )
+        """Return cost at quantity q, vectorized over quantity arrays."""
+        polynomial = kernel.evaluate((self.constant, self.linear, self.quadratic), q)
+        if np.all(self.reciprocal == 0):  # allows for q = 0 calcs
+            return polynomial
+        with np.errstate(divide="ignore"):
+            return polynomial + self.reciprocal * np.divide(1.0, q)
 
     def variable_cost(self):
         """Return Cost object less fixed costs."""
@@ -957,6 +1111,7 @@ class Cost:
         var = self.variable_cost()
         return var.marginal_cost().cost(var.efficient_scale())
 
+    @instrument.instrumented
     def plot(self, ax=None, max_q=100, label=None, min_plotted_q=0.1):
         """Plot the cost curve.
         min_plotted_q is used when the cost goes to infinity as q->0 to keep y-limits from also going to infinity.
@@ -967,7 +1122,7 @@ class Cost:
         x_vals = np.linspace(0, max_q, max_q * 5 + 1)
         if self.reciprocal != 0:
             x_vals = x_vals[x_vals >= min_plotted_q]
-        y_vals = [self.cost(q) for q in x_vals]
+        y_vals = self.cost(x_vals)
 
         ax.plot(x_vals, y_vals, label=label)
         ax.set_xlabel("Quantity")
@@ -988,6 +1143,13 @@ class TotalCost(Cost):
         Inverse if P(Q), as opposed to Q(P)."""
         Cost.__init__(self, constant, linear, quadratic)
 
+    def supply_schedule(self, prices, dtype=None):
+        """Table (dict of columns) of profit-maximizing quantity, revenue, cost,
+        profit and shutdown flag at each of *prices*. Coefficients may be arrays
+        describing many firms. See `batch.supply_schedule`."""
+        return batch.supply_schedule(prices, self.constant, self.linear, self.quadratic, dtype)
+
+    @instrument.instrumented
     def long_run_plot(self, ax=None):
         ac = self.average_cost()
         mc = self.marginal_cost()
@@ -1008,6 +1170,7 @@ class TotalCost(Cost):
         ax.set_xlim(0, max_q)
         ax.legend()
 
+    @instrument.instrumented
     def cost_profit_plot(self, p, ax=None, items=["tc", "tr", "profit"]):
         if ax == None:
             ax = plt.gca()
@@ -1019,7 +1182,8 @@ class TotalCost(Cost):
         q = mc.q(p)
 
         # plot AC and MC
-        self.average_cost().plot(label="ATC")
+        ac = self.average_cost()
+        ac.plot(label="ATC")
         mc.plot(label="MC")
 
         # plot price and quantity
@@ -1027,7 +1191,7 @@ class TotalCost(Cost):
         ax.plot([q, q], [0, p], linestyle="dashed", color="gray")
         ax.plot([q], [p], marker="o")
 
-        atc_of_q = self.average_cost().cost(q)
+        atc_of_q = ac.cost(q)
 
         if "profit" in items:
             # profit
@@ -1069,16 +1233,10 @@ class MarginalCost(Cost):
         Cost.__init__(self, constant, linear, quadratic, currency)
 
     def q(self, p):
+        """Quantity where marginal cost equals p, vectorized over price arrays.
+        For quadratic MC this is the rising branch."""
         # p = self.constant + self.linear * q + self.quadratic * q**2
-        # self.quadratic * q**2 + self.linear * q + self.constant - p
-        roots = np.roots([self.quadratic, self.linear, self.constant - p])
-
-        if self.quadratic != 0:
-            print("No quadratic MC please.")
-
-        root = roots[0]
-
-        return root
+        return kernel.inverse((self.constant, self.linear, self.quadratic), p)
 
     def supply(self):
         """Convert to a supply object"""
@@ -1097,6 +1255,7 @@ class LongRunCompetitiveEquilibrium:
         self.market_q = self.demand.q(self.p)
         self.n_firms = self.market_q / self.firm_q
 
+    @instrument.instrumented
     def plot(self, fig=None):
         # fig, ax = plt.subplots(1,2, sharey = True)
         if fig == None:
@@ -1160,71 +1319,28 @@ class Game:
             self.payoffs10 = self.Au1[0], self.Bu0[1]
             self.payoffs11 = self.Au1[1], self.Bu1[1]
 
-    def best_response(self, action_profile):
-        """If multiple, this chooses the action already specified."""
-
-        action_profile = str(action_profile[0]) + str(action_profile[1])
-        payoffs = self.__dict__["payoffs" + action_profile]
-
-        profile_list = list(action_profile)  # convert for mutability
-
-        br_profile = list()
-        for player in [0, 1]:
-            action = action_profile[player]
-            deviation = 1 - int(action)
-
-            profile_list = list(action_profile)  # convert for mutability
-            profile_list[player] = str(deviation)
-
-            deviation_profile = "".join(profile_list)
+        self.player_names = list(player_names)
+        self.A_action_names = list(A_action_names)
+        self.B_action_names = list(B_action_names)
 
-            dev_payoffs = self.__dict__["payoffs" + deviation_profile]
-
-            if dev_payoffs[player] > payoffs[player]:
-                br = deviation
-            else:
-                br = action
-            br_profile.append(br)
+        # payoffs indexed by (A action, B action, player)
+        self.payoffs = np.array(
+            [[self.payoffs00, self.payoffs01], [self.payoffs10, self.payoffs11]], dtype=float
+        )
 
-        return br_profile
+    def best_response(self, action_profile):
+        """Best response actions [A, B] to *action_profile* such as "01" or (0, 1).
+        If multiple, this chooses the action already specified."""
+        a, b = int(action_profile[0]), int(action_profile[1])
+        return list(loops.best_response(self.payoffs, a, b))
 
+    @instrument.instrumented
     def nash(self):
         """Returns a set pure strategy nash equilibria."""
+        nash = loops.pure_nash(self.payoffs)
+        return {"A{}B{}".format(a, b) for a in (0, 1) for b in (0, 1) if nash[a, b]}
 
-        equilibria = set()
-        for action_profile in ["00", "01", "10", "11"]:
-            payoffs = self.__dict__["payoffs" + action_profile]
-
-            is_equilibrium = True
-            # consider deviations
-            profile_list = list(action_profile)  # convert for mutability
-            for player in [0, 1]:  ### Simplify this with new best response method
-                action = action_profile[player]
-                deviation = 1 - int(action)
-
-                profile_list = list(action_profile)  # convert for mutability
-                profile_list[player] = str(deviation)
-
-                deviation_profile = "".join(profile_list)
-
-                dev_payoffs = self.__dict__["payoffs" + deviation_profile]
-
-                if dev_payoffs[player] > payoffs[player]:
-                    is_equilibrium = False
-
-            # did equilibria survive
-
-            if is_equilibrium:
-                # rename
-                renamed = ""
-                for action, player in zip(action_profile, "AB"):
-                    new = player + action
-                    renamed += new
-
-                equilibria.add(renamed)
-
-        return equilibria
-
+    @instrument.instrumented
     def table(self, ax=None, show_solution=True):
         if ax == None:
             ax = plt.gca()
@@ -1233,8 +1349,8 @@ class Game:
             # point is an aciton profile
             br = self.best_response(point)
 
-            A_is_br = br[0] == point[0]
-            B_is_br = br[1] == point[1]
+            A_is_br = br[0] == int(point[0])
+            B_is_br = br[1] == int(point[1])
 
             xy = -int(point[0]), int(point[1])
 
@@ -1283,7 +1399,7 @@ class Game:
         ax.text(
             -0.08,
             0.5,
-            "Player A",
+            self.player_names[0],
             rotation=90,
             transform=ax.transAxes,
             ha="right",
@@ -1294,7 +1410,7 @@ class Game:
         ax.text(
             0,
             0.25,
-            "action 1",
+            self.A_action_names[1],
             rotation=90,
             transform=ax.transAxes,
             ha="right",
@@ -1305,7 +1421,7 @@ class Game:
         ax.text(
             0,
             0.75,
-            "action 0",
+            self.A_action_names[0],
             rotation=90,
             transform=ax.transAxes,
             ha="right",
@@ -1316,7 +1432,7 @@ class Game:
         ax.text(
             0.5,
             1.08,
-            "Player B",
+            self.player_names[1],
             rotation=0,
             transform=ax.transAxes,
             ha="center",
@@ -1327,7 +1443,7 @@ class Game:
         ax.text(
             0.75,
             1,
-            "action 1",
+            self.B_action_names[1],
             rotation=0,
             transform=ax.transAxes,
             ha="center",
@@ -1338,7 +1454,7 @@ class Game:
         ax.text(
             0.25,
             1,
-            "action 0",
+            self.B_action_names[0],
             rotation=0,
             transform=ax.transAxes,
             ha="center",
@@ -1422,6 +1538,7 @@ class LinearConstraint:
 
         self.endowment = endowment
 
+    @instrument.instrumented
     def plot(self, ax=None, linewidth=2):
         if ax == None:
             ax = plt.gca()
@@ -1522,6 +1639,7 @@ class JointPPF:
 
         # self.kink = self.__dict__[comp_adv1].max1, self.__dict__[comp_adv2].max2
 
+    @instrument.instrumented
     def plot(self, ax=None, title="Joint PPF"):
         if ax == None:
             ax = plt.gca()
@@ -1564,45 +1682,11 @@ class JointPPF:
     def efficiency(self, good1, good2):
         """Return if a point is inefficient, efficient, or unattainable."""
 
-        # let comp_adv for good 1 make good 1
-
-        endowment = self.ppf1.endowment
-        # good1_ppf = self.__dict__[self.comp_adv1]
-        # good2_ppf = self.__dict__[self.comp_adv2]
-
-        # comp adv in good1, descending
-        comp_adv_order = [self.ppf_array[x[2]] for x in self.good1_opp_costs]
-
-        # p1 = good1_ppf.p1
-        # p2 = good2_ppf.p2
-
-        # make good 1
-        good1_made = 0
-        left = good1 - good1_made
-        comp_adv_index = -1
-
-        while left > 0:
-            comp_adv_index += 1
-            ppf = comp_adv_order[comp_adv_index]
-
-            time_nec = left / ppf.p1
-            contribution = np.min([time_nec / ppf.p1, endowment / ppf.p1])
-
-            time_left = np.max([0, endowment - time_nec])
-            left -= contribution
-
-        if good1 == 0:
-            time_left = endowment
-            comp_adv_index = 0
-
-        # make good 2
-        good2_left = good2
-        for ppf in comp_adv_order[comp_adv_index:]:
-            contribution = time_left / ppf.p2
-
-            good2_left -= contribution
-            # change time left to endowment for non-transitional ppfs for next iterations
-            time_left = endowment
+        # producers ordered by comparative advantage in good 1
+        order = [self.ppf_array[x[2]] for x in self.good1_opp_costs]
+        p1 = np.array([ppf.p1 for ppf in order], float)
+        p2 = np.array([ppf.p2 for ppf in order], float)
+        good2_left = loops.ppf_shortfall(p1, p2, float(self.ppf1.endowment), float(good1), float(good2))
 
         if good2_left < 0:
             return "inefficient"
@@ -0,0 +1,222 @@
+"""Pure exchange economy with many agents and goods.
+
+Agents own *endowments* (an N x K array for N agents and K goods) and sell
+them at prices `p` for income `endowment @ p`, which is the budget
+(`econ101.LinearConstraint`) they spend on their preferred bundle. Walrasian
+prices make the aggregate excess demand zero. Preferences and endowments are
+held in arrays and demand of all agents is computed at once.
+
+```
+from exchange import ExchangeEconomy, MultiCobbDouglas
+
+economy = ExchangeEconomy(MultiCobbDouglas(rng.uniform(size=(10**4, 10))),
+                          endowments=rng.uniform(size=(10**4, 10)))
+result = economy.walras(method="newton")
+result.prices, result.history["max_excess"]
+```
+"""
+from dataclasses import dataclass
+
+import numpy as np
+import matplotlib.pyplot as plt  # type: ignore
+
+import econ101
+from consumer import Utility
+
+
+class MultiCobbDouglas:
+    def __init__(self, alpha):
+        """Cobb-Douglas preferences over K goods, `prod(x_k ** alpha_k)`.
+        Rows of *alpha* (one per agent) are normalized to budget shares."""
+        alpha = np.atleast_2d(np.asarray(alpha, dtype=float))
+        self.alpha = alpha / alpha.sum(axis=-1, keepdims=True)
+
+    def demand(self, prices, income):
+        """Bundles of all agents, shape (..., N, K), at *prices* (..., K) and *income* (..., N)."""
+        return self.alpha * income[..., None] / prices[..., None, :]
+
+
+class MultiCES:
+    def __init__(self, alpha, sigma=0.5):
+        """CES preferences over K goods with weights *alpha* (one row per agent)
+        and elasticity of substitution *sigma* (a scalar or one per agent)."""
+        self.alpha = np.atleast_2d(np.asarray(alpha, dtype=float))
+        self.sigma = np.asarray(sigma, dtype=float)[..., None]
+        if (self.sigma <= 0).any():
+            raise ValueError("Elasticity of substitution must be positive.")
+
+    def demand(self, prices, income):
+        p = prices[..., None, :]
+        weights = self.alpha**self.sigma * p ** (1 - self.sigma)
+        return income[..., None] * weights / (p * weights.sum(axis=-1, keepdims=True))
+
+
+class TwoGoods:
+    def __init__(self, utility: Utility):
+        """Use a two-good `consumer.Utility` (with parameter arrays over agents)
+        in an exchange economy."""
+        self.utility = utility
+
+    def demand(self, prices, income):
+        x1, x2 = self.utility.marshallian(prices[..., 0:1], prices[..., 1:2], income)
+        x1, x2 = np.broadcast_arrays(x1, x2)
+        return np.stack([x1, x2], axis=-1)
+
+
+@dataclass
+class WalrasResult:
+    """Walrasian prices, allocation and convergence history of a solver run."""
+
+    prices: np.ndarray
+    allocation: np.ndarray
+    excess_demand: np.ndarray
+    converged: bool
+    iterations: int
+    history: dict  # columns: iteration, max_excess, step
+
+
+class ExchangeEconomy:
+    def __init__(self, preferences, endowments, good_names=None):
+        """Exchange economy of agents with *preferences* (`MultiCobbDouglas`,
+        `MultiCES`, `TwoGoods` or a `consumer.Utility`) and *endowments* (N x K)."""
+        if isinstance(preferences, Utility):
+            preferences = TwoGoods(preferences)
+        self.preferences = preferences
+        self.endowments = np.atleast_2d(np.asarray(endowments, dtype=float))
+        self.total = self.endowments.sum(axis=0)
+        if good_names is None:
+            good_names = [f"Good {k + 1}" for k in range(self.n_goods)]
+        self.good_names = good_names
+
+    @property
+    def n_agents(self) -> int:
+        return self.endowments.shape[0]
+
+    @property
+    def n_goods(self) -> int:
+        return self.endowments.shape[1]
+
+    def income(self, prices):
+        """Value of each agent's endowment, shape (..., N)."""
+        return np.asarray(prices, dtype=float) @ self.endowments.T
+
+    def budget(self, agent, prices) -> econ101.LinearConstraint:
+        """Budget line of *agent* in a two-good economy."""
+        if self.n_goods != 2:
+            raise ValueError("Budget lines are drawn for two goods only.")
+        p1, p2 = (float(p) for p in prices)
+        income = float(self.income(prices)[agent])
+        return econ101.LinearConstraint(p1=p1, p2=p2, endowment=income, good_names=self.good_names)
+
+    def demand(self, prices):
+        """Bundles demanded by all agents at *prices*, shape (..., N, K)."""
+        prices = np.asarray(prices, dtype=float)
+        return self.preferences.demand(prices, self.income(prices))
+
+    def excess_demand(self, prices):
+        """Aggregate excess demand for each good, shape (..., K)."""
+        return self.demand(prices).sum(axis=-2) - self.total
+
+    def jacobian(self, prices, rel_step=1e-6):
+        """Derivatives of excess demand (rows) by prices (columns), from central
+        differences evaluated in one batched call."""
+        p = np.asarray(prices, dtype=float)
+        h = rel_step * p
+        shifts = np.diag(h)
+        z = self.excess_demand(np.concatenate([p + shifts, p - shifts]))
+        k = self.n_goods
+        return ((z[:k] - z[k:]) / (2 * h[:, None])).T
+
+    def walras(
+        self,
+        prices=None,
+        method="newton",
+        numeraire=0,
+        tolerance=1e-10,
+        max_iter=1000,
+        step=0.5,
+    ) -> WalrasResult:
+        """Find Walrasian prices with the price of *numeraire* fixed at 1.
+
+        "tatonnement" raises prices of goods in excess demand,
+        `p *= exp(step * z / total_endowment)`. "newton" solves the linearized
+        excess demand of the non-numeraire goods (Walras' law makes the last
+        equation redundant) and halves steps that do not reduce excess demand
+        or would make a price nonpositive. Convergence is reached when every
+        excess demand is below *tolerance* times the total endowment of the good."""
+        if method not in ("newton", "tatonnement"):
+            raise ValueError("Method must be 'newton' or 'tatonnement'.")
+        p = np.ones(self.n_goods) if prices is None else np.array(prices, dtype=float)
+        p = p / p[numeraire]
+        others = np.arange(self.n_goods) != numeraire
+
+        history = {"iteration": [], "max_excess": [], "step": []}
+        z = self.excess_demand(p)
+        converged = False
+        for iteration in range(max_iter + 1):
+            error = np.abs(z / self.total).max()
+            history["iteration"].append(iteration)
+            history["max_excess"].append(error)
+            if error <= tolerance:
+                converged = True
+                history["step"].append(0.0)
+                break
+            if method == "tatonnement":
+                change = step * z / self.total
+                change[numeraire] = 0
+                p_new = p * np.exp(change)
+                size = np.abs(change).max()
+            else:
+                j = self.jacobian(p)[np.ix_(others, others)]
+                dp = np.zeros_like(p)
+                dp[others] = np.linalg.solve(j, -z[others])
+                size = 1.0
+                while True:
+                    p_new = p + size * dp
+                    if (p_new > 0).all():
+                        z_new = self.excess_demand(p_new)
+                        if np.abs(z_new / self.total).max() < error or size < 1e-8:
+                            break
+                    size /= 2
+            history["step"].append(size)
+            p = p_new
+            z = self.excess_demand(p)
+
+        return WalrasResult(
+            prices=p,
+            allocation=self.demand(p),
+            excess_demand=z,
+            converged=converged,
+            iterations=iteration,
+            history={key: np.asarray(value) for key, value in history.items()},
+        )
+
+    def edgeworth_plot(self, prices=None, ax=None):
+        """Edgeworth box of a two-agent, two-good economy with the endowment,
+        the budget line at *prices* (Walrasian by default) and both demands."""
+        if (self.n_agents, self.n_goods) != (2, 2):
+            raise ValueError("Edgeworth box needs two agents and two goods.")
+        if ax is None:
+            ax = plt.gca()
+        if prices is None:
+            prices = self.walras().prices
+        prices = np.asarray(prices, dtype=float)
+        width, height = self.total
+        e = self.endowments[0]
+
+        # budget line through the endowment, clipped to the box
+        x = np.linspace(0, width, 2)
+        y = e[1] - prices[0] / prices[1] * (x - e[0])
+        ax.plot(x, y, color="C0", linewidth=2)
+        ax.plot(*e, marker="o", color="black")
+        ax.annotate("Endowment", e, textcoords="offset points", xytext=(5, 5))
+        for agent, bundle in enumerate(self.demand(prices)):
+            if agent == 1:
+                bundle = self.total - bundle
+            ax.plot(*bundle, marker="o", color=f"C{agent + 1}")
+
+        ax.set_xlim(0, width)
+        ax.set_ylim(0, height)
+        ax.set_xlabel(self.good_names[0])
+        ax.set_ylabel(self.good_names[1])
+        return ax
@@ -0,0 +1,219 @@
+"""Randomized exercises with solutions, written as LaTeX and a JSON answer key.
+
+Parameters are random integers chosen so that the answers are "nice" (the
+equilibrium, the taxed quantity and the efficient scale are integers). Each
+batch of problems is drawn and solved at once with the vectorized engines
+(`batch.equilibrium`, array coefficients of `econ101.TotalCost`, and NumPy
+best responses for 2 x 2 games). Problems are deduplicated by a hash of
+their canonical parameters, so equivalent games (the same game with actions
+relabelled) appear only once.
+
+```
+import exercises
+
+exercises.write_problem_set("problems.tex", "answers.json", exercises.generate(1000, seed=1))
+```
+"""
+import hashlib
+import json
+from dataclasses import dataclass, field
+from itertools import islice
+
+import numpy as np
+
+import batch
+import econ101
+
+KINDS = ("tax", "cost", "game")
+
+
+@dataclass
+class Exercise:
+    kind: str
+    key: str  # hash of canonical parameters
+    params: dict
+    solution: dict = field(default_factory=dict)
+
+    @property
+    def text(self) -> str:
+        return TEMPLATES[self.kind](self.params)
+
+
+def canonical_key(kind, params) -> str:
+    """Hash of the parameters that define a problem, identical for equivalent problems."""
+    if kind == "game":
+        params = {"payoffs": min(_relabellings(params["payoffs"]))}
+    blob = json.dumps([kind, params], sort_keys=True)
+    return hashlib.sha1(blob.encode()).hexdigest()[:16]
+
+
+def _relabellings(payoffs):
+    """A 2 x 2 game with either player's actions swapped, as nested tuples."""
+    a = np.asarray(payoffs)  # (row action, column action, player)
+    for rows in (a, a[::-1]):
+        for table in (rows, rows[:, ::-1]):
+            yield tuple(map(tuple, table.reshape(4, 2).tolist()))
+
+
+def tax_problems(rng, n) -> list:
+    """Linear markets with a per-unit tax; integer equilibrium and taxed quantity."""
+    q = rng.integers(2, 31, n)
+    demand_slope = rng.integers(1, 11, n)
+    supply_slope = rng.integers(1, 11, n)
+    supply_intercept = rng.integers(0, 51, n)
+    p = supply_intercept + supply_slope * q
+    demand_intercept = p + demand_slope * q
+    reduction = rng.integers(1, q)  # tax lowers quantity by a whole unit count
+    tax = reduction * (demand_slope + supply_slope)
+
+    taxed = batch.equilibrium(demand_intercept, -demand_slope, supply_intercept, supply_slope, tax)
+    problems = []
+    for i in range(n):
+        params = {
+            "demand_intercept": int(demand_intercept[i]),
+            "demand_slope": -int(demand_slope[i]),
+            "supply_intercept": int(supply_intercept[i]),
+            "supply_slope": int(supply_slope[i]),
+            "tax": int(tax[i]),
+        }
+        solution = {"market_price": int(p[i]), "market_quantity": int(q[i])}
+        solution.update({name: float(taxed[name][i]) for name in batch.COLUMNS})
+        problems.append(Exercise("tax", canonical_key("tax", params), params, solution))
+    return problems
+
+
+def cost_problems(rng, n) -> list:
+    """Quadratic total costs with an integer efficient scale."""
+    scale = rng.integers(1, 51, n)
+    quadratic = rng.integers(1, 21, n)
+    linear = rng.integers(1, 101, n)
+    constant = quadratic * scale**2
+
+    costs = econ101.TotalCost(constant, linear, quadratic)
+    efficient_scale = costs.efficient_scale()
+    breakeven = costs.breakeven_price()
+    shutdown = costs.shutdown_price()
+    problems = []
+    for i in range(n):
+        params = {"constant": int(constant[i]), "linear": int(linear[i]), "quadratic": int(quadratic[i])}
+        solution = {
+            "efficient_scale": float(efficient_scale[i]),
+            "breakeven_price": float(breakeven[i]),
+            "shutdown_price": float(shutdown[i]),
+        }
+        problems.append(Exercise("cost", canonical_key("cost", params), params, solution))
+    return problems
+
+
+def game_problems(rng, n) -> list:
+    """2 x 2 games with payoffs 0 to 9 and their pure-strategy Nash equilibria."""
+    payoffs = rng.integers(0, 10, (n, 2, 2, 2))  # game, A action, B action, player
+    a, b = payoffs[..., 0], payoffs[..., 1]
+    a_best = a >= a[:, ::-1, :]  # A cannot gain by switching rows
+    b_best = b >= b[:, :, ::-1]
+    nash = a_best & b_best
+    problems = []
+    for i in range(n):
+        params = {"payoffs": payoffs[i].tolist()}
+        equilibria = ["A{}B{}".format(r, c) for r in (0, 1) for c in (0, 1) if nash[i, r, c]]
+        problems.append(Exercise("game", canonical_key("game", params), params, {"nash": equilibria}))
+    return problems
+
+
+SOLVERS = {"tax": tax_problems, "cost": cost_problems, "game": game_problems}
+
+
+def generate(n=None, kinds=KINDS, seed=None, batch_size=256, max_misses=None):
+    """Yield distinct exercises, cycling through *kinds*, each kind drawn and
+    solved *batch_size* problems at a time. Endless if *n* is None.
+
+    Raises RuntimeError once *max_misses* draws in a row (default: ten
+    batches) repeat earlier problems, meaning that kind is nearly exhausted."""
+    if max_misses is None:
+        max_misses = 10 * batch_size
+    rng = np.random.default_rng(seed)
+    seen = set()
+    pending = {kind: [] for kind in kinds}
+    found = dict.fromkeys(kinds, 0)
+
+    def stream():
+        while True:
+            for kind in kinds:
+                misses = 0
+                while True:
+                    if not pending[kind]:
+                        pending[kind] = SOLVERS[kind](rng, batch_size)[::-1]
+                    exercise = pending[kind].pop()
+                    if exercise.key not in seen:
+                        seen.add(exercise.key)
+                        found[kind] += 1
+                        yield exercise
+                        break
+                    misses += 1
+                    if misses >= max_misses:
+                        raise RuntimeError(
+                            "No new {!r} exercise in {} draws after {} distinct ones; "
+                            "the parameter space is exhausted.".format(kind, misses, found[kind])
+                        )
+
+    return islice(stream(), n)
+
+
+def _times(coefficient, variable) -> str:
+    """Product like `3Q`, dropping a unit coefficient."""
+    return variable if coefficient == 1 else "{}{}".format(coefficient, variable)
+
+
+def _tax_text(x):
+    return (
+        "Demand is $P = {demand_intercept} - {demand}$ and supply is "
+        "$P = {supply_intercept} + {supply}$. A per-unit tax of {tax} is imposed. "
+        "Find the market equilibrium, the quantity traded under the tax, the prices "
+        "paid by consumers and received by producers, government revenue and "
+        "deadweight loss."
+    ).format(demand=_times(-x["demand_slope"], "Q"), supply=_times(x["supply_slope"], "Q"), **x)
+
+
+def _cost_text(x):
+    return (
+        "A competitive firm has total cost $TC(q) = {constant} + {linear} + {quadratic}$. "
+        "Find its efficient scale, breakeven price and shutdown price."
+    ).format(
+        constant=x["constant"], linear=_times(x["linear"], "q"), quadratic=_times(x["quadratic"], "q^2")
+    )
+
+
+def _game_text(x):
+    (u00, u01), (u10, u11) = x["payoffs"]
+    cell = "{}, {}".format
+    return "\n".join(
+        [
+            "Find all pure-strategy Nash equilibria of the game (A chooses the row, B the column).",
+            "\\begin{center}",
+            "\\begin{tabular}{c|c|c}",
+            " & B0 & B1 \\\\ \\hline",
+            "A0 & {} & {} \\\\ \\hline".format(cell(*u00), cell(*u01)),
+            "A1 & {} & {} \\\\".format(cell(*u10), cell(*u11)),
+            "\\end{tabular}",
+            "\\end{center}",
+        ]
+    )
+
+
+TEMPLATES = {"tax": _tax_text, "cost": _cost_text, "game": _game_text}
+
+
+def write_problem_set(tex_path, answers_path, exercises) -> int:
+    """Stream *exercises* into a LaTeX file of `exercise` environments (see
+    `LaTeX/101.sty`) and a JSON answer key in one pass. Returns the count."""
+    count = 0
+    with open(tex_path, "w") as tex, open(answers_path, "w") as answers:
+        answers.write("[\n")
+        for count, exercise in enumerate(exercises, start=1):
+            tex.write("\\begin{exercise}\n% key: " + exercise.key + "\n")
+            tex.write(exercise.text + "\n\\end{exercise}\n\n")
+            entry = {"number": count, "kind": exercise.kind, "key": exercise.key}
+            entry.update(params=exercise.params, solution=exercise.solution)
+            answers.write((",\n" if count > 1 else "") + json.dumps(entry))
+        answers.write("\n]\n")
+    return count
@@ -0,0 +1,129 @@
+"""Externalities and Pigouvian taxes.
+
+The market outcome is where demand meets supply. With a marginal external cost
+(MEC) the marginal social cost is `MSC = supply + MEC`, and with a marginal
+external benefit (MEB) the marginal social benefit is `MSB = demand + MEB`.
+The efficient quantity is where MSB = MSC, and a per-unit Pigouvian tax of
+`MEC - MEB` at the efficient quantity (a subsidy when negative) moves the
+market there.
+
+Externalities are given as a number or array of per-unit values, or as a
+tuple of coefficients in the convention of `kernel` for externalities that
+depend on quantity, e.g. `(0, 0.5)` for `MEC(Q) = 0.5 * Q`. Arrays broadcast
+against each other and against curve parameters, so a sweep over many
+externality magnitudes is one call.
+"""
+import numpy as np
+import matplotlib.pyplot as plt  # type: ignore
+
+import kernel
+
+
+def external_coef(externality) -> tuple:
+    """Coefficients of a marginal externality: tuples are coefficients,
+    anything else is a per-unit value."""
+    if isinstance(externality, tuple):
+        return tuple(np.asarray(c, dtype=float) for c in externality)
+    return (np.asarray(externality, dtype=float),)
+
+
+def social_curves(demand_coef, supply_coef, external_cost=0, external_benefit=0):
+    """Coefficients of the marginal social benefit and marginal social cost curves."""
+    benefit = tuple(-c for c in external_coef(external_benefit))
+    cost = tuple(-c for c in external_coef(external_cost))
+    msb = kernel.difference(demand_coef, benefit)
+    msc = kernel.difference(supply_coef, cost)
+    return msb, msc
+
+
+def _crossing(coef, other_coef):
+    p, q = kernel.intersect(coef, other_coef)
+    q = np.maximum(np.nan_to_num(q, nan=0.0), 0)
+    return kernel.evaluate(coef, q), q
+
+
+def externality(
+    demand_intercept,
+    demand_slope,
+    supply_intercept,
+    supply_slope,
+    external_cost=0,
+    external_benefit=0,
+):
+    """Market and efficient outcomes, the Pigouvian tax and the DWL of the market
+    outcome for linear demand and supply. Returns a dict of columns."""
+    demand = (np.asarray(demand_intercept, dtype=float), np.asarray(demand_slope, dtype=float))
+    supply = (np.asarray(supply_intercept, dtype=float), np.asarray(supply_slope, dtype=float))
+    msb, msc = social_curves(demand, supply, external_cost, external_benefit)
+
+    market_price, market_q = _crossing(demand, supply)
+    efficient_price, efficient_q = _crossing(msb, msc)
+    tax = kernel.evaluate(kernel.difference(demand, supply), efficient_q)
+
+    net_benefit = kernel.integral(kernel.difference(msb, msc))
+    dwl = kernel.evaluate(net_benefit, efficient_q) - kernel.evaluate(net_benefit, market_q)
+    return {
+        "market_price": market_price,
+        "market_quantity": market_q,
+        "efficient_quantity": efficient_q,
+        "consumer_price": kernel.evaluate(demand, efficient_q),
+        "producer_price": kernel.evaluate(supply, efficient_q),
+        "pigouvian_tax": tax,
+        "dwl": np.abs(dwl),
+    }
+
+
+class Externality:
+    def __init__(self, demand, supply, external_cost=0, external_benefit=0):
+        """Market of *demand* and *supply* curves with a marginal external cost
+        and/or benefit, each a per-unit value or a tuple of coefficients."""
+        self.demand = demand
+        self.supply = supply
+        self.external_cost = external_cost
+        self.external_benefit = external_benefit
+        self.msb, self.msc = social_curves(demand.coef, supply.coef, external_cost, external_benefit)
+
+        result = externality(*demand.coef, *supply.coef, external_cost, external_benefit)
+        self.market_p = float(result["market_price"])
+        self.market_q = float(result["market_quantity"])
+        self.q = float(result["efficient_quantity"])
+        self.p_consumer = float(result["consumer_price"])
+        self.p_producer = float(result["producer_price"])
+        self.tax = float(result["pigouvian_tax"])
+        self.dwl = float(result["dwl"])
+
+    def marginal_social_benefit(self, q):
+        return kernel.evaluate(self.msb, q)
+
+    def marginal_social_cost(self, q):
+        return kernel.evaluate(self.msc, q)
+
+    def plot(self, ax=None, max_q=None, annotate=True):
+        """Plot demand, supply, MSB and MSC with the DWL of the market outcome."""
+        if ax is None:
+            ax = plt.gca()
+        if max_q is None:
+            max_q = 1.5 * max(self.q, self.market_q)
+        q = np.linspace(0, max_q, 100)
+        ax.plot(q, self.demand.p(q), color="black", linewidth=2)
+        ax.plot(q, self.supply.p(q), color="black", linewidth=2)
+        ax.plot(q, self.marginal_social_benefit(q), color="C0", linestyle="dashed", label="MSB")
+        ax.plot(q, self.marginal_social_cost(q), color="C1", linestyle="dashed", label="MSC")
+
+        lo, hi = sorted([self.q, self.market_q])
+        between = np.linspace(lo, hi, 50)
+        ax.fill_between(
+            between,
+            self.marginal_social_benefit(between),
+            self.marginal_social_cost(between),
+            color="red",
+            alpha=0.1,
+        )
+        ax.plot([self.market_q], [self.market_p], marker="o", color="black")
+        ax.plot([self.q], [self.marginal_social_cost(self.q)], marker="o", color="C2")
+        if annotate:
+            ax.text(0.5 * (lo + hi), self.market_p, " DWL", ha="center", va="center", size=8)
+        ax.set_ylabel("Price")
+        ax.set_xlabel("Quantity")
+        ax.legend()
+        return ax
@@ -0,0 +1,162 @@
+"""Fit linear demand and supply curves to observed prices and quantities.
+
+Curves are fitted in inverse form `P = intercept + slope * Q`, the form used by
+`curves.Demand` and `curves.Supply`, by least squares of price on quantity.
+"""
+import csv
+from dataclasses import dataclass
+from itertools import islice
+from typing import Iterable, Iterator, Optional, Tuple
+
+import numpy as np
+
+from curves import Curve, CurveArray, Demand, Point
+
+
+class OnlineLinearFit:
+    def __init__(self, kind=Demand, decay: float = 1.0):
+        """Least-squares fit updated one chunk of observations at a time.
+
+        Keeps only running weighted means and co-moments, so memory does not
+        grow with the number of observations. With *decay* below 1 each new
+        observation discounts the weight of all older ones by that factor."""
+        if not 0 < decay <= 1:
+            raise ValueError("Decay must be in (0, 1].")
+        self.kind = kind
+        self.decay = decay
+        self.weight = 0.0
+        self.mean_q = 0.0
+        self.mean_p = 0.0
+        self.m_qq = 0.0  # weighted sum of squared deviations of quantity
+        self.m_qp = 0.0  # weighted sum of cross deviations
+        self.n = 0
+
+    def update(self, price, quantity) -> Curve:
+        """Add a chunk of observations and return the updated curve."""
+        p = np.asarray(price, dtype=float).ravel()
+        q = np.asarray(quantity, dtype=float).ravel()
+        if p.shape != q.shape:
+            raise ValueError("Price and quantity must have equal length.")
+        if not p.size:
+            return self.curve
+
+        # weights of the chunk and discount of the previous statistics
+        w = self.decay ** np.arange(p.size - 1, -1, -1)
+        discount = self.decay**p.size
+        self.weight *= discount
+        self.m_qq *= discount
+        self.m_qp *= discount
+
+        # merge chunk statistics (Chan et al. pairwise update)
+        w_chunk = w.sum()
+        mean_q, mean_p = w @ q / w_chunk, w @ p / w_chunk
+        dq, dp = q - mean_q, p - mean_p
+        total = self.weight + w_chunk
+        delta_q, delta_p = mean_q - self.mean_q, mean_p - self.mean_p
+        between = self.weight * w_chunk / total
+        self.m_qq += w @ (dq * dq) + between * delta_q * delta_q
+        self.m_qp += w @ (dq * dp) + between * delta_q * delta_p
+        self.mean_q += delta_q * w_chunk / total
+        self.mean_p += delta_p * w_chunk / total
+        self.weight = total
+        self.n += p.size
+        return self.curve
+
+    @property
+    def slope(self) -> float:
+        return self.m_qp / self.m_qq if self.m_qq else np.nan
+
+    @property
+    def intercept(self) -> float:
+        return self.mean_p - self.slope * self.mean_q
+
+    @property
+    def curve(self) -> Curve:
+        """Current fitted curve."""
+        return self.kind(intercept=self.intercept, slope=self.slope)
+
+    def fit_stream(
+        self, chunks: Iterable[Tuple[np.ndarray, np.ndarray]], other=None
+    ) -> Iterator[Tuple[Curve, Optional[Point]]]:
+        """Consume (price, quantity) *chunks* and yield the updated curve after each
+        chunk, with its equilibrium against *other* (a curve or another fit)."""
+        for price, quantity in chunks:
+            curve = self.update(price, quantity)
+            if other is None:
+                yield curve, None
+            else:
+                other_curve = other.curve if isinstance(other, OnlineLinearFit) else other
+                yield curve, curve.equilibrium(other_curve)
+
+
+@dataclass
+class GroupedFit:
+    """Linear curves fitted separately for each group, stored as columns."""
+
+    groups: np.ndarray  # sorted unique group keys
+    curves: CurveArray
+    intercept_se: np.ndarray
+    slope_se: np.ndarray
+    n: np.ndarray  # observations per group
+
+    def __len__(self) -> int:
+        return self.groups.size
+
+    def curve(self, group) -> Curve:
+        """Fitted curve of a single *group*."""
+        key = np.searchsorted(self.groups, group)
+        if key == self.groups.size or self.groups[key] != group:
+            raise KeyError(group)
+        return self.curves[key]
+
+
+def fit_grouped(groups, price, quantity, kind=Demand) -> GroupedFit:
+    """Fit `P = intercept + slope * Q` for every group in one pass over the rows.
+
+    Rows are coded by group once and per-group sums are segmented reductions
+    with `np.bincount`, so there is no Python loop over groups. Standard errors
+    are the usual OLS ones; groups with fewer than three rows get NaN."""
+    p = np.asarray(price, dtype=float).ravel()
+    q = np.asarray(quantity, dtype=float).ravel()
+    keys, codes = np.unique(np.asarray(groups).ravel(), return_inverse=True)
+    m = keys.size
+
+    def group_sum(x):
+        return np.bincount(codes, weights=x, minlength=m)
+
+    n = np.bincount(codes, minlength=m)
+    mean_q, mean_p = group_sum(q) / n, group_sum(p) / n
+    dq, dp = q - mean_q[codes], p - mean_p[codes]
+    s_qq, s_qp, s_pp = group_sum(dq * dq), group_sum(dq * dp), group_sum(dp * dp)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        slope = np.where(s_qq > 0, s_qp / s_qq, np.nan)
+        intercept = mean_p - slope * mean_q
+        residual_var = np.where(n > 2, (s_pp - slope * s_qp) / (n - 2), np.nan)
+        residual_var = np.maximum(residual_var, 0)
+        slope_se = np.sqrt(residual_var / s_qq)
+        intercept_se = np.sqrt(residual_var * (1 / n + mean_q**2 / s_qq))
+
+    return GroupedFit(
+        groups=keys,
+        curves=CurveArray(intercept, slope, kind),
+        intercept_se=intercept_se,
+        slope_se=slope_se,
+        n=n,
+    )
+
+
+def read_csv_chunks(
+    path, chunk_size: int = 100_000, price: str = "price", quantity: str = "quantity"
+) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    """Read (price, quantity) arrays from a CSV file with a header, *chunk_size* rows at a time."""
+    with open(path, newline="") as f:
+        reader = csv.DictReader(f)
+        while True:
+            rows = list(islice(reader, chunk_size))
+            if not rows:
+                return
+            yield (
+                np.array([row[price] for row in rows], dtype=float),
+                np.array([row[quantity] for row in rows], dtype=float),
+            )
@@ -0,0 +1,201 @@
+"""Market equilibrium kept up to date under a stream of curve shifts.
+
+An aggregate of linear curves `P = a + s * Q` is piecewise linear in price,
+with a kink at every curve's intercept `a`: a demand curve buys
+`(a - p) / |s|` when `p < a` and a supply curve sells `(p - a) / s` when
+`p > a`. Between neighbouring kinks, excess demand is
+
+    sum over active curves of (a / |s|) - p * sum over active curves of (1 / |s|)
+
+so the clearing price only needs the sums of `1 / |s|` and `a / |s|` over the
+curves whose intercepts lie above (demand) or below (supply) the price.
+
+`IncrementalMarket` keeps all curves in a balanced search tree (a treap)
+ordered by intercept, with these sums stored for every subtree. A shift of
+one curve moves one tree node and the clearing price is found by a single
+descent from the root, so both take O(log n) expected time for n curves.
+Member curves notify the market through `Curve.subscribe()` whenever
+`vertical_shift()` or `horizontal_shift()` is called; assigning to
+`curve.intercept` directly bypasses the notification.
+"""
+import random
+
+
+class _Node:
+    __slots__ = ("key", "priority", "left", "right", "own", "sums")
+
+    def __init__(self, key, own):
+        self.key = key
+        self.priority = random.random()
+        self.left = None
+        self.right = None
+        # (w_demand, aw_demand, w_supply, aw_supply) of this curve and its subtree
+        self.own = own
+        self.sums = own
+
+
+def _sums(node):
+    return node.sums if node is not None else (0.0, 0.0, 0.0, 0.0)
+
+
+def _add(x, y):
+    return (x[0] + y[0], x[1] + y[1], x[2] + y[2], x[3] + y[3])
+
+
+def _update(node):
+    node.sums = _add(_add(_sums(node.left), node.own), _sums(node.right))
+    return node
+
+
+def _split(node, key):
+    """Split a treap into nodes with keys below *key* and the rest."""
+    if node is None:
+        return None, None
+    if node.key < key:
+        left, right = _split(node.right, key)
+        node.right = left
+        return _update(node), right
+    left, right = _split(node.left, key)
+    node.left = right
+    return left, _update(node)
+
+
+def _merge(left, right):
+    """Merge treaps where all keys of *left* are below those of *right*."""
+    if left is None:
+        return right
+    if right is None:
+        return left
+    if left.priority > right.priority:
+        left.right = _merge(left.right, right)
+        return _update(left)
+    right.left = _merge(left, right.left)
+    return _update(right)
+
+
+def _keys(node, out):
+    if node is not None:
+        _keys(node.left, out)
+        out.append(node.key)
+        _keys(node.right, out)
+    return out
+
+
+class IncrementalMarket:
+    def __init__(self, demand_curves=(), supply_curves=()):
+        """Market of linear *demand_curves* and *supply_curves* (from `econ101` or
+        `curves`) whose equilibrium follows shifts of its members."""
+        self._root = None
+        self._curves = {}  # id(curve) -> (curve, key)
+        self._cache = None
+        for curve in list(demand_curves) + list(supply_curves):
+            self.add(curve)
+
+    def __len__(self) -> int:
+        return len(self._curves)
+
+    def add(self, curve) -> None:
+        """Add a curve; demand or supply follows from the sign of its slope."""
+        if curve.slope == 0:
+            raise ValueError("Horizontal curves have no quantity as a function of price.")
+        self._insert(curve)
+        curve.subscribe(self._shifted)
+
+    def remove(self, curve) -> None:
+        curve.unsubscribe(self._shifted)
+        self._delete(curve)
+
+    def _own(self, curve):
+        w = 1 / abs(curve.slope)
+        if curve.slope < 0:
+            return (w, curve.intercept * w, 0.0, 0.0)
+        return (0.0, 0.0, w, curve.intercept * w)
+
+    def _insert(self, curve):
+        key = (curve.intercept, id(curve))
+        left, right = _split(self._root, key)
+        self._root = _merge(_merge(left, _Node(key, self._own(curve))), right)
+        self._curves[id(curve)] = (curve, key)
+        self._cache = None
+
+    def _delete(self, curve):
+        _, key = self._curves.pop(id(curve))
+        left, rest = _split(self._root, key)
+        _, right = _split(rest, (key[0], key[1] + 1))
+        self._root = _merge(left, right)
+        self._cache = None
+
+    def _shifted(self, curve, old_intercept):
+        """Observer callback: move the shifted curve to its new place in the tree.
+        Curves that are not members of this market are ignored."""
+        if self._curves.get(id(curve), (None,))[0] is not curve:
+            return
+        self._delete(curve)
+        self._insert(curve)
+
+    def breakpoints(self) -> list:
+        """Sorted prices where the aggregate curves have kinks."""
+        return [key[0] for key in _keys(self._root, [])]
+
+    def quantity_demanded(self, p) -> float:
+        w_d, aw_d, _, _ = self._above(p)
+        return aw_d - p * w_d
+
+    def quantity_supplied(self, p) -> float:
+        _, _, w_s, aw_s = self._below(p)
+        return p * w_s - aw_s
+
+    def _below(self, p):
+        """Sums over curves with intercepts below *p*."""
+        node, total = self._root, (0.0, 0.0, 0.0, 0.0)
+        while node is not None:
+            if node.key[0] < p:
+                total = _add(_add(total, _sums(node.left)), node.own)
+                node = node.right
+            else:
+                node = node.left
+        return total
+
+    def _above(self, p):
+        below = self._below(p)
+        total = _sums(self._root)
+        return tuple(t - b for t, b in zip(total, below))
+
+    def equilibrium(self):
+        """Clearing (price, quantity), cached until the next shift.
+        Without any trade the quantity is zero and the price is NaN."""
+        if self._cache is None:
+            self._cache = self._solve()
+        return self._cache
+
+    @property
+    def price(self) -> float:
+        return self.equilibrium()[0]
+
+    @property
+    def quantity(self) -> float:
+        return self.equilibrium()[1]
+
+    def _solve(self):
+        # find the highest kink with positive excess demand in one descent
+        total = _sums(self._root)
+        node, prefix = self._root, (0.0, 0.0, 0.0, 0.0)
+        lo_prefix = prefix  # sums over keys up to the lower end of the segment
+        while node is not None:
+            k = node.key[0]
+            left = _add(prefix, _sums(node.left))
+            w_d, aw_d = total[0] - left[0] - node.own[0], total[1] - left[1] - node.own[1]
+            excess = (aw_d - k * w_d) - (k * left[2] - left[3])
+            if excess > 0:
+                prefix = lo_prefix = _add(left, node.own)
+                node = node.right
+            else:
+                node = node.left
+
+        # excess demand is linear between the neighbouring kinks
+        w = (total[0] - lo_prefix[0]) + lo_prefix[2]
+        aw = (total[1] - lo_prefix[1]) + lo_prefix[3]
+        if w == 0:
+            return float("nan"), 0.0
+        p = aw / w
+        return p, (total[1] - lo_prefix[1]) - p * (total[0] - lo_prefix[0])
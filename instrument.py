@@ -0,0 +1,87 @@
+"""Opt-in counters and timers for solvers and plot methods.
+
+Public methods of `econ101` are wrapped with `instrumented`, and solvers
+report extra counts (iterations, matrix sizes) with `record`. Nothing is
+collected unless a `profile()` block is active or a callback is subscribed;
+otherwise the wrapper costs one flag check per call.
+
+```
+import instrument
+
+with instrument.profile() as stats:
+    demand.equilibrium(supply)
+stats["Aggregate.equilibrium"]   # {"calls": 1, "time": 0.002, "iterations": 41}
+
+instrument.subscribe(lambda name, fields: metrics.add(name, **fields))
+```
+"""
+import functools
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+_collectors = []
+_callbacks = []
+_active = False
+
+
+def _refresh() -> None:
+    global _active
+    _active = bool(_collectors or _callbacks)
+
+
+def enabled() -> bool:
+    return _active
+
+
+def record(name, **fields) -> None:
+    """Add numeric *fields* (such as `iterations=12`) to the counters of *name*."""
+    if not _active:
+        return
+    for stats in _collectors:
+        totals = stats[name]
+        for key, value in fields.items():
+            totals[key] = totals.get(key, 0) + value
+    for callback in _callbacks:
+        callback(name, fields)
+
+
+def instrumented(func):
+    """Count calls and wall time of *func* under its qualified name."""
+    name = func.__qualname__
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not _active:
+            return func(*args, **kwargs)
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            record(name, calls=1, time=time.perf_counter() - start)
+
+    return wrapper
+
+
+@contextmanager
+def profile():
+    """Collect counters inside a `with` block into a dict of dicts by method name."""
+    stats = defaultdict(dict)
+    _collectors.append(stats)
+    _refresh()
+    try:
+        yield stats
+    finally:
+        _collectors.remove(stats)
+        _refresh()
+
+
+def subscribe(callback) -> None:
+    """Call *callback(name, fields)* for every recorded event until unsubscribed."""
+    _callbacks.append(callback)
+    _refresh()
+
+
+def unsubscribe(callback) -> None:
+    _callbacks.remove(callback)
+    _refresh()
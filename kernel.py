@@ -0,0 +1,315 @@
+"""Polynomial curve kernel shared by `curves`, `econ101` and `dev/curves`.
+
+A curve is a sequence of coefficients in ascending order,
+`P(Q) = coef[0] + coef[1] * Q + coef[2] * Q**2 + ...`, the same convention as
+`np.polynomial.Polynomial`. Each coefficient may be a scalar or an array, so
+`(intercepts, slopes)` describes a whole collection of lines stored as columns.
+
+Affine curves (two coefficients) take closed-form fast paths. Only higher
+degrees fall back to general polynomial code.
+"""
+import numpy as np
+
+
+def degree(coef) -> int:
+    return len(coef) - 1
+
+
+def is_affine(coef) -> bool:
+    return len(coef) == 2
+
+
+def evaluate(coef, q):
+    """Price at quantity *q*."""
+    if is_affine(coef):
+        return coef[0] + coef[1] * q
+    # Horner's scheme
+    result = coef[-1]
+    for c in coef[-2::-1]:
+        result = result * q + c
+    return result
+
+
+def derivative(coef) -> tuple:
+    """Coefficients of the derivative dP/dQ."""
+    if len(coef) == 1:
+        return (0 * coef[0],)
+    return tuple(k * c for k, c in enumerate(coef) if k > 0)
+
+
+def integral(coef) -> tuple:
+    """Coefficients of the antiderivative that is zero at Q = 0."""
+    return (0 * coef[0],) + tuple(c / (k + 1) for k, c in enumerate(coef))
+
+
+def inverse(coef, p, branch="largest"):
+    """Quantity at price *p*, vectorized over price arrays.
+
+    Degree one and two use closed-form roots. Higher degrees split the
+    nonnegative quantity axis into monotone segments at the critical points
+    and solve on each segment with safeguarded Newton steps. When several
+    nonnegative roots exist, *branch* selects the "largest" one (the rising
+    part of a U-shaped marginal cost curve) or the "smallest" one.
+    NaN marks prices the curve never reaches at a nonnegative quantity.
+
+    Zero highest-degree coefficients are dropped first, so `(c, l, 0)` is
+    treated as the line `(c, l)`, which may return a negative quantity."""
+    if branch not in ("largest", "smallest"):
+        raise ValueError("Branch must be 'largest' or 'smallest'.")
+    coef = _trim(coef)
+    if is_affine(coef):
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.divide(np.subtract(p, coef[0]), coef[1])
+    if degree(coef) < 1:
+        return np.full(np.shape(p), np.nan) if np.ndim(p) else np.nan
+    if degree(coef) == 2:
+        return _quadratic_inverse(coef, p, branch)
+
+    # coefficient columns of higher degree: one segment search per distinct curve
+    if any(np.ndim(c) for c in coef):
+        *columns, p = np.broadcast_arrays(*coef, p)
+        table = np.stack([c.ravel() for c in columns], axis=1)
+        curves, which = np.unique(table, axis=0, return_inverse=True)
+        out = np.empty(p.size)
+        for key, c in enumerate(curves):
+            mask = which.ravel() == key
+            out[mask] = _monotone_inverse(_trim(c), p.ravel()[mask], branch)
+        return out.reshape(p.shape)
+    return _monotone_inverse(coef, p, branch)
+
+
+def pairwise_sum(x, axis=0):
+    """Sum along *axis* by adding halves, in the dtype of *x*.
+
+    Rounding error grows with the logarithm of the number of terms rather than
+    linearly as in a running sum, so float32 columns of millions of values
+    still sum to nearly float32 precision."""
+    x = np.moveaxis(np.asarray(x), axis, 0)
+    if x.shape[0] == 0:
+        return np.zeros(x.shape[1:], dtype=x.dtype)
+    while x.shape[0] > 1:
+        half = x.shape[0] // 2
+        pairs = x[:half] + x[half : 2 * half]
+        x = np.concatenate([pairs, x[2 * half :]]) if x.shape[0] % 2 else pairs
+    return x[0]
+
+
+def columns(coef_list) -> tuple:
+    """Stack coefficients of several curves into coefficient columns,
+    padding lower degrees with zeros."""
+    coef_list = [np.atleast_1d(np.asarray(c, dtype=float)) for c in coef_list]
+    n = max(c.size for c in coef_list)
+    table = np.zeros((len(coef_list), n))
+    for key, c in enumerate(coef_list):
+        table[key, : c.size] = c
+    return tuple(table.T)
+
+
+def batch_roots(coef) -> np.ndarray:
+    """Complex roots of many polynomials given as coefficient columns.
+
+    Eigenvalues of stacked companion matrices, one batched call per degree.
+    Returns an array of shape (..., degree) padded with NaN for curves of
+    lower degree."""
+    arrays = np.broadcast_arrays(*(np.asarray(c, dtype=float) for c in coef))
+    table = np.stack([a.ravel() for a in arrays], axis=1)
+    m, n = table.shape[0], table.shape[1] - 1
+    out = np.full((m, max(n, 0)), np.nan, dtype=complex)
+
+    nonzero = table != 0
+    row_degree = np.where(nonzero.any(axis=1), n - np.argmax(nonzero[:, ::-1], axis=1), 0)
+    for d in np.unique(row_degree):
+        if d < 1:
+            continue
+        rows = np.flatnonzero(row_degree == d)
+        c = table[rows, : d + 1]
+        companion = np.zeros((rows.size, d, d))
+        companion[:, 1:, :-1] = np.eye(d - 1)
+        companion[:, :, -1] = -c[:, :d] / c[:, d:]
+        out[rows, :d] = np.linalg.eigvals(companion)
+    return out.reshape(arrays[0].shape + (n,))
+
+
+def average_cost_minimum(coef):
+    """Quantity minimizing average cost `C(q) / q` and the minimal average cost,
+    for cost polynomials of any degree given as (columns of) coefficients.
+
+    Solves d(AC)/dq = 0, which after multiplying by q**2 is the polynomial
+    `-c0 + c2 * q**2 + 2 * c3 * q**3 + ... + (k - 1) * ck * q**k`. Without fixed
+    cost, the limit q -> 0 is also a candidate. Quantity is infinite when
+    average cost keeps falling."""
+    arrays = np.broadcast_arrays(*(np.asarray(c, dtype=float) for c in coef))
+    shape = arrays[0].shape
+    c = np.stack([a.ravel() for a in arrays], axis=1)
+    n = c.shape[1]
+    if n < 2:
+        c = np.column_stack([c, np.zeros(c.shape[0])])
+        n = 2
+
+    g = np.zeros_like(c)
+    g[:, 0] = -c[:, 0]
+    g[:, 2:] = (np.arange(2, n) - 1) * c[:, 2:]
+    r = batch_roots(tuple(g.T))
+    real = np.abs(r.imag) < 1e-9 * np.maximum(1, np.abs(r.real))
+    candidates = np.where(real & (r.real > 0), r.real, np.nan)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ac = evaluate(tuple(c.T[:, :, None]), candidates) / candidates
+    # limit q -> 0 without fixed cost
+    no_fixed = c[:, 0] == 0
+    candidates = np.column_stack([candidates, np.where(no_fixed, 0.0, np.nan)])
+    ac = np.column_stack([ac, np.where(no_fixed, c[:, 1], np.nan)])
+
+    found = ~np.isnan(ac).all(axis=1)
+    best = np.argmin(np.where(np.isnan(ac), np.inf, ac), axis=1)
+    rows = np.arange(c.shape[0])
+    q = np.where(found, candidates[rows, best], np.inf)
+    # average cost keeps falling: linear cost tends to its slope
+    falling = np.where(np.count_nonzero(c[:, 2:], axis=1) == 0, c[:, 1], np.nan)
+    ac_min = np.where(found, ac[rows, best], falling)
+    if not shape:
+        return float(q[0]), float(ac_min[0])
+    return q.reshape(shape), ac_min.reshape(shape)
+
+
+def roots(coef, p) -> np.ndarray:
+    """All (complex) roots of `P(Q) = p` for a single curve and scalar price."""
+    shifted = (coef[0] - p, *coef[1:])
+    return np.roots(shifted[::-1])
+
+
+def intersect(coef, other_coef):
+    """Price and quantity where two curves cross. Allows for negative values
+    for affine curves; otherwise takes the smallest nonnegative crossing.
+
+    Parallel lines have no single crossing: two scalar lines raise
+    `np.linalg.LinAlgError`, and parallel pairs within coefficient columns
+    give NaN."""
+    if is_affine(coef) and is_affine(other_coef):
+        gap = np.subtract(other_coef[1], coef[1])
+        parallel = gap == 0
+        if np.ndim(gap) == 0 and parallel:
+            raise np.linalg.LinAlgError("Parallel curves do not intersect.")
+        with np.errstate(divide="ignore", invalid="ignore"):
+            q = np.where(parallel, np.nan, np.divide(np.subtract(coef[0], other_coef[0]), gap))
+        if np.ndim(q) == 0:
+            q = q[()]
+    else:
+        q = inverse(difference(coef, other_coef), 0, branch="smallest")
+    return evaluate(coef, q), q
+
+
+def difference(coef, other_coef) -> tuple:
+    """Coefficients of `P(Q) - P_other(Q)`."""
+    n = max(len(coef), len(other_coef))
+    a = tuple(coef) + (0,) * (n - len(coef))
+    b = tuple(other_coef) + (0,) * (n - len(other_coef))
+    return tuple(np.subtract(x, y) for x, y in zip(a, b))
+
+
+def _trim(coef) -> tuple:
+    """Drop zero leading (highest degree) coefficients, or columns that are
+    zero for every curve."""
+    coef = tuple(coef)
+    while len(coef) > 1 and np.all(np.equal(coef[-1], 0)):
+        coef = coef[:-1]
+    return coef
+
+
+def _quadratic_inverse(coef, p, branch):
+    c, b, a = (np.asarray(x, dtype=float) for x in coef)
+    c = c - p
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # numerically stable pair of roots
+        t = -0.5 * (b + np.where(b >= 0, 1, -1) * np.sqrt(b * b - 4 * a * c))
+        r1, r2 = t / a, c / t
+        linear = -c / b
+    r1, r2 = _nonnegative(r1), _nonnegative(r2)
+    pick = np.fmax(r1, r2) if branch == "largest" else np.fmin(r1, r2)
+    # rows without a quadratic term are lines, negative quantities included
+    out = np.where(a == 0, linear, pick)
+    return out if out.ndim else float(out)
+
+
+def _nonnegative(x, tolerance=1e-12):
+    x = np.where(np.abs(x) < tolerance, 0.0, x)
+    return np.where(x >= 0, x, np.nan)
+
+
+def _monotone_inverse(coef, p, branch, max_doublings=200):
+    if len(coef) < 4:
+        return inverse(coef, p, branch)
+    if not np.ndim(p):
+        # a single companion-matrix root finding is cheaper for one price
+        r = roots(coef, p)
+        real = _nonnegative(r.real[np.abs(r.imag) < 1e-9])
+        real = real[~np.isnan(real)]
+        if not real.size:
+            return np.nan
+        return float(real.max() if branch == "largest" else real.min())
+    p = np.asarray(p, dtype=float)
+    flat = p.ravel()
+    out = np.full(flat.shape, np.nan)
+
+    # monotone segments between nonnegative critical points
+    critical = roots(derivative(coef), 0)
+    critical = np.sort(critical.real[(np.abs(critical.imag) < 1e-12) & (critical.real > 0)])
+    edges = np.concatenate([[0.0], critical])
+    segments = list(zip(edges, np.append(edges[1:], np.inf)))
+    if branch == "largest":
+        segments = segments[::-1]
+
+    lead = np.sign(coef[-1])
+    for lo, hi in segments:
+        todo = np.flatnonzero(np.isnan(out))
+        if not todo.size:
+            break
+        target = flat[todo]
+        f_lo = evaluate(coef, lo) - target
+        if np.isinf(hi):
+            # P goes monotonically to +/- infinity on the last segment
+            reachable = f_lo * lead <= 0
+            hi = np.full(target.shape, 2 * lo + 1)
+            for _ in range(max_doublings):
+                short = reachable & ((evaluate(coef, hi) - target) * lead < 0)
+                if not short.any():
+                    break
+                hi[short] = 2 * hi[short]
+        else:
+            hi = np.full(target.shape, hi)
+        inside = f_lo * (evaluate(coef, hi) - target) <= 0
+        if inside.any():
+            out[todo[inside]] = _bracketed_newton(
+                coef, target[inside], np.full(inside.sum(), lo), hi[inside]
+            )
+    return out.reshape(p.shape) if p.ndim else float(out[0])
+
+
+def _bracketed_newton(coef, p, lo, hi, tolerance=1e-12, max_iter=100):
+    """Solve `P(q) = p` for q in [lo, hi] where P is monotone, for arrays of p.
+    Newton steps that leave the bracket are replaced by bisection, and only
+    unconverged prices are iterated."""
+    slope = derivative(coef)
+    f_lo, f_hi = evaluate(coef, lo) - p, evaluate(coef, hi) - p
+    with np.errstate(divide="ignore", invalid="ignore"):
+        x = np.where(f_hi != f_lo, lo - f_lo * (hi - lo) / (f_hi - f_lo), 0.5 * (lo + hi))
+    x = np.where(np.isfinite(x), x, 0.5 * (lo + hi))
+    sign_lo = np.sign(f_lo)
+
+    active = np.arange(p.size)
+    for _ in range(max_iter):
+        xa, pa, la, ha = x[active], p[active], lo[active], hi[active]
+        f = evaluate(coef, xa) - pa
+        below = np.sign(f) == sign_lo[active]
+        la, ha = np.where(below, xa, la), np.where(below, ha, xa)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            newton = xa - f / evaluate(slope, xa)
+        x_new = np.where((newton >= la) & (newton <= ha), newton, 0.5 * (la + ha))
+        x_new = np.where(f == 0, xa, x_new)
+        x[active], lo[active], hi[active] = x_new, la, ha
+        scale = tolerance * (1 + np.abs(xa))
+        done = (np.abs(x_new - xa) <= scale) | (ha - la <= scale)
+        active = active[~done]
+        if not active.size:
+            break
+    return x
@@ -0,0 +1,174 @@
+"""TikZ/pgfplots code for market diagrams, written from curve coefficients.
+
+Each function returns a LaTeX string with a complete `tikzpicture`, ready to
+paste into a document that loads `pgfplots` (as `LaTeX/101.sty` does).
+Curves are written as pgfplots expressions or exact vertex lists, so the
+figures are vector-exact and nothing is rendered in Python.
+
+```
+from econ101 import Demand, Supply, Equilibrium
+import latex
+
+e = Equilibrium(Demand(12, -2), Supply(0, 1))
+e.set_tax(3)
+print(latex.equilibrium(e))
+```
+"""
+import numpy as np
+
+import kernel
+
+COLORS = ("blue", "red", "green!50!black", "orange", "violet")
+SURPLUS_COLORS = {"cs": "blue", "ps": "orange", "govt": "green", "dwl": "red"}
+
+
+def number(x) -> str:
+    """Short exact-enough representation of a number for TikZ."""
+    return "{:.6g}".format(float(x))
+
+
+def expression(coef, variable="x") -> str:
+    """pgfplots expression of a polynomial with ascending coefficients."""
+    terms = []
+    for power, c in enumerate(coef):
+        if c == 0 and (power > 0 or len(coef) > 1):
+            continue
+        term = number(c)
+        if power == 1:
+            term += "*" + variable
+        elif power > 1:
+            term += "*{}^{}".format(variable, power)
+        terms.append(term)
+    return " + ".join(terms or ["0"]).replace("+ -", "- ")
+
+
+def addplot(coef, domain, style="black, thick", label=None, reciprocal=0) -> str:
+    """`\\addplot` of a polynomial (plus an optional `reciprocal / x` term) over *domain*."""
+    coef = tuple(coef)
+    while len(coef) > 2 and coef[-1] == 0:
+        coef = coef[:-1]
+    expr = expression(coef)
+    if reciprocal:
+        expr += " + {}/x".format(number(reciprocal))
+    samples = 2 if kernel.is_affine(coef) and not reciprocal else 101
+    lines = [
+        "\\addplot[{}, domain={}:{}, samples={}] {{{}}};".format(
+            style, number(domain[0]), number(domain[1]), samples, expr
+        )
+    ]
+    if label:
+        lines.append("\\addlegendentry{{{}}}".format(label))
+    return "\n".join(lines)
+
+
+def polygon(points, style) -> str:
+    """Filled region through (q, p) *points*."""
+    path = " -- ".join("(axis cs:{},{})".format(number(q), number(p)) for q, p in points)
+    return "\\fill[{}] {} -- cycle;".format(style, path)
+
+
+def dashed_point(q, p) -> str:
+    """Marker at (q, p) with dashed lines to both axes."""
+    q, p = number(q), number(p)
+    return "\n".join(
+        [
+            "\\draw[dashed, gray] (axis cs:0,{p}) -- (axis cs:{q},{p}) -- (axis cs:{q},0);".format(p=p, q=q),
+            "\\addplot[only marks, mark=*] coordinates {{({},{})}};".format(q, p),
+        ]
+    )
+
+
+def tikzpicture(body, xmax, ymax, xlabel="Quantity", ylabel="Price", options="") -> str:
+    """Wrap *body* lines in a textbook-style axis."""
+    if not isinstance(body, str):
+        body = "\n".join(body)
+    axis_options = [
+        "axis lines=left",
+        "xmin=0",
+        "ymin=0",
+        "xmax={}".format(number(xmax)),
+        "ymax={}".format(number(ymax)),
+        "xlabel={{{}}}".format(xlabel),
+        "ylabel={{{}}}".format(ylabel),
+        "clip=true",
+    ]
+    if options:
+        axis_options.append(options)
+    return "\n".join(
+        [
+            "\\begin{tikzpicture}",
+            "\\begin{{axis}}[{}]".format(", ".join(axis_options)),
+            body,
+            "\\end{axis}",
+            "\\end{tikzpicture}",
+        ]
+    )
+
+
+def curves(*curves, max_q=None, labels=None) -> str:
+    """Demand and supply curves (any objects with `.coef`) on one axis."""
+    if max_q is None:
+        max_q = 1.1 * max(c.q_intercept for c in curves if c.slope < 0)
+    labels = labels or [None] * len(curves)
+    body = [addplot(c.coef, (0, max_q), label=label) for c, label in zip(curves, labels)]
+    ymax = 1.1 * max(max(c.p(0), c.p(max_q)) for c in curves)
+    return tikzpicture(body, max_q, ymax)
+
+
+def equilibrium(e, surplus=True, items=("cs", "ps", "govt", "dwl")) -> str:
+    """Demand, supply and the outcome of an `econ101.Equilibrium`, including taxes,
+    subsidies, price controls and quotas, with surplus regions."""
+    demand, supply = e.demand, e.supply
+    q = float(e.q)
+    p_consumer, p_producer = float(e.p_consumer), float(e.p_producer)
+    market_p, market_q = (float(x) for x in kernel.intersect(demand.coef, supply.coef))
+    max_q = 1.1 * max(demand.q_intercept, q, market_q)
+
+    body = []
+    if surplus:
+        regions = {
+            "cs": [(0, demand.intercept), (q, demand.p(q)), (q, p_consumer), (0, p_consumer)],
+            "ps": [(0, supply.intercept), (q, supply.p(q)), (q, p_producer), (0, p_producer)],
+            "govt": [(0, p_producer), (q, p_producer), (q, p_consumer), (0, p_consumer)],
+            "dwl": [(q, demand.p(q)), (market_q, market_p), (q, supply.p(q))],
+        }
+        for item in items:
+            body.append(polygon(regions[item], "{}, opacity=0.15".format(SURPLUS_COLORS[item])))
+    body.append(addplot(demand.coef, (0, max_q)))
+    body.append(addplot(supply.coef, (0, max_q)))
+    for p in sorted({p_consumer, p_producer}):
+        body.append(dashed_point(q, p))
+    ymax = 1.1 * max(demand.intercept, supply.p(max_q), p_consumer, p_producer)
+    return tikzpicture(body, max_q, ymax)
+
+
+def cost(*costs, max_q=10, labels=None, min_q=0.1, ymax=None) -> str:
+    """`econ101.Cost` curves, including average costs with a reciprocal term,
+    which start at *min_q*. The price axis ends above the highest cost at *max_q*
+    unless *ymax* is given."""
+    labels = labels or [None] * len(costs)
+    body = []
+    for key, (c, label) in enumerate(zip(costs, labels)):
+        lo = min_q if getattr(c, "reciprocal", 0) else 0
+        body.append(
+            addplot(
+                (c.constant, c.linear, c.quadratic),
+                (lo, max_q),
+                style="{}, thick".format(COLORS[key % len(COLORS)]),
+                label=label,
+                reciprocal=getattr(c, "reciprocal", 0),
+            )
+        )
+    if ymax is None:
+        ymax = 1.1 * max(float(np.max(c.cost(max_q))) for c in costs)
+    return tikzpicture(body, max_q, ymax, ylabel="Cost")
+
+
+def joint_ppf(ppf) -> str:
+    """Kinked joint production possibility frontier of an `econ101.JointPPF`."""
+    vertices = [(0, ppf.intercept2)] + list(ppf.kinks) + [(ppf.intercept1, 0)]
+    coordinates = " ".join("({},{})".format(number(x), number(y)) for x, y in vertices)
+    body = ["\\addplot[black, thick] coordinates {{{}}};".format(coordinates)]
+    body += [dashed_point(x, y) for x, y in ppf.kinks]
+    names = ppf.ppf_array[0].good_names
+    return tikzpicture(body, 1.1 * ppf.intercept1, 1.1 * ppf.intercept2, xlabel=names[0], ylabel=names[1])
@@ -0,0 +1,130 @@
+"""Sequential market loops, compiled with numba when it is installed.
+
+Some solvers cannot be vectorized because each step depends on the last one:
+the price walk of `Aggregate.equilibrium`, best responses in a `Game` and the
+comparative-advantage walk of `JointPPF.efficiency`. Their inner loops live
+here as plain functions over floats and arrays. With numba available they are
+compiled in nopython mode on first use; without it the same code runs as
+ordinary Python, so both paths give identical results. Uncompiled copies of
+all kernels, calling each other rather than compiled helpers, are in
+`loops.python`.
+
+```
+import loops
+
+loops.HAVE_NUMBA                       # True if kernels are compiled
+loops.step_search(...)                 # compiled when possible
+loops.python.step_search(...)          # always pure Python
+```
+"""
+import builtins
+import types
+
+import numpy as np
+
+try:
+    import numba  # type: ignore
+except ImportError:
+    numba = None
+
+HAVE_NUMBA = numba is not None
+
+# globals of the uncompiled copies, so they only call each other
+_python_globals = {"np": np, "__builtins__": builtins}
+python = types.SimpleNamespace()
+
+
+def _jit(func):
+    """Compile *func* if numba is available. An uncompiled copy whose calls to
+    other kernels stay uncompiled goes into `python`."""
+    copy = types.FunctionType(func.__code__, _python_globals, func.__name__, func.__defaults__)
+    copy.__doc__ = func.__doc__
+    _python_globals[func.__name__] = copy
+    setattr(python, func.__name__, copy)
+    if numba is None:
+        return copy
+    return numba.njit(cache=True)(func)
+
+
+@_jit
+def total_q(intercept, slope, p, clip):
+    """Sum of quantities of lines `P = intercept + slope * Q` at price *p*,
+    counting negative quantities as zero when *clip* is true. Terms are added
+    in order, as in `Aggregate.q`."""
+    total = 0.0
+    for i in range(intercept.size):
+        q = (p - intercept[i]) / slope[i]
+        total += max(0.0, q) if clip else q
+    return total
+
+
+@_jit
+def step_search(intercept, slope, other_intercept, other_slope, other_clip, sign, price, tolerance):
+    """Price walk of `Aggregate.equilibrium`: step the price up while excess
+    demand is positive (halving steps after the walk turns) and down by
+    *tolerance* otherwise. *sign* is 1 for a demand aggregate and -1 for supply.
+    Returns the price and the number of steps."""
+    excess = sign * (total_q(intercept, slope, price, True) - total_q(other_intercept, other_slope, price, other_clip))
+    counter, last_counter = 0, 0
+    scale = 1.0
+    while abs(excess) > tolerance:
+        if excess > 0:
+            price += tolerance * scale
+            if counter > last_counter:
+                scale *= 0.5
+            counter += 1
+            last_counter = counter
+        else:
+            price -= tolerance
+            counter += 1
+        excess = sign * (
+            total_q(intercept, slope, price, True) - total_q(other_intercept, other_slope, price, other_clip)
+        )
+    return price, counter
+
+
+@_jit
+def best_response(payoffs, a, b):
+    """Best responses of both players in a 2 x 2 game with *payoffs* indexed
+    by (A action, B action, player). Ties keep the current action."""
+    br_a = 1 - a if payoffs[1 - a, b, 0] > payoffs[a, b, 0] else a
+    br_b = 1 - b if payoffs[a, 1 - b, 1] > payoffs[a, b, 1] else b
+    return br_a, br_b
+
+
+@_jit
+def pure_nash(payoffs):
+    """Boolean table of action profiles where both players best respond."""
+    nash = np.zeros((2, 2), dtype=np.bool_)
+    for a in range(2):
+        for b in range(2):
+            br_a, br_b = best_response(payoffs, a, b)
+            nash[a, b] = br_a == a and br_b == b
+    return nash
+
+
+@_jit
+def ppf_shortfall(p1, p2, endowment, good1, good2):
+    """Amount of good 2 that cannot be made alongside *good1*, when producers
+    with costs *p1*, *p2* (ordered by comparative advantage in good 1) first
+    make good 1 and spend the remaining time on good 2. Negative values mean
+    slack; infinity means good 1 alone is out of reach."""
+    n = p1.size
+    left = good1
+    index = -1
+    time_left = endowment
+    while left > 0:
+        index += 1
+        if index == n:
+            return np.inf
+        time_needed = left / p1[index]
+        left -= min(time_needed / p1[index], endowment / p1[index])
+        time_left = max(0.0, endowment - time_needed)
+    if good1 <= 0:
+        index = 0
+        time_left = endowment
+    good2_left = good2
+    for i in range(index, n):
+        good2_left -= time_left / p2[i]
+        time_left = endowment
+    return good2_left
@@ -0,0 +1,205 @@
+"""Monopoly, Cournot and Bertrand markets.
+
+Markets have linear inverse demand `P = demand_intercept + demand_slope * Q`
+and firms have polynomial total costs `C(q) = c0 + c1 * q + c2 * q**2 + ...`,
+given as coefficient columns in the convention of `kernel`. Functions accept
+arrays and solve a whole batch of markets at once: market parameters broadcast
+over leading axes and firms are on the last axis. They return dicts of columns.
+
+The classes `Monopoly`, `Cournot` and `Bertrand` wrap the functions for a
+single `Demand` and `Cost`/`TotalCost` objects.
+"""
+import numpy as np
+
+import kernel
+
+
+def cost_coef(cost) -> tuple:
+    """Ascending cost coefficients of an `econ101.Cost` or `dev/curves.Cost` object."""
+    if hasattr(cost, "coef"):
+        return tuple(cost.coef)
+    return cost.constant, cost.linear, cost.quadratic
+
+
+def _columns(coef, min_length=3) -> tuple:
+    coef = tuple(np.asarray(c, dtype=float) for c in coef)
+    return coef + (np.zeros(()),) * (min_length - len(coef))
+
+
+def _quantity(q):
+    """Replace unreachable (NaN) and negative quantities by zero."""
+    return np.maximum(np.nan_to_num(q, nan=0.0), 0)
+
+
+def monopoly(demand_intercept, demand_slope, cost_coef):
+    """Profit-maximizing monopoly: quantity where MR = MC, price, profit,
+    consumer surplus, deadweight loss relative to P = MC and Lerner index."""
+    a, b = np.asarray(demand_intercept, dtype=float), np.asarray(demand_slope, dtype=float)
+    c = _columns(cost_coef)
+    mc = kernel.derivative(c)
+    if len(c) == 3:
+        # linear demand and linear MC
+        q = (a - c[1]) / (2 * c[2] - 2 * b)
+        q_competitive = (a - c[1]) / (2 * c[2] - b)
+    else:
+        q = kernel.inverse(kernel.difference(mc, (a, 2 * b)), 0)
+        q_competitive = kernel.inverse(kernel.difference(mc, (a, b)), 0)
+    q, q_competitive = _quantity(q), _quantity(q_competitive)
+
+    p = a + b * q
+    net_benefit = kernel.integral(kernel.difference((a, b), mc))
+    return {
+        "price": p,
+        "quantity": q,
+        "profit": p * q - kernel.evaluate(c, q),
+        "consumer_surplus": 0.5 * (a - p) * q,
+        "dwl": kernel.evaluate(net_benefit, q_competitive) - kernel.evaluate(net_benefit, q),
+        "lerner": (p - kernel.evaluate(mc, q)) / p,
+    }
+
+
+def cournot(
+    demand_intercept,
+    demand_slope,
+    cost_coef,
+    method="auto",
+    tolerance=1e-10,
+    max_iter=10_000,
+):
+    """N-firm Cournot equilibrium with heterogeneous costs.
+
+    With linear marginal costs (costs up to quadratic) the equilibrium is in
+    closed form, and firms that would produce negative quantities exit. Other
+    cost polynomials, or *method* "best_response", use damped simultaneous
+    best-response iteration."""
+    if method not in ("auto", "closed_form", "best_response"):
+        raise ValueError("Method must be 'auto', 'closed_form' or 'best_response'.")
+    a = np.asarray(demand_intercept, dtype=float)[..., None]
+    b = np.asarray(demand_slope, dtype=float)[..., None]
+    c = _columns(cost_coef)
+    shape = np.broadcast_shapes(a.shape, b.shape, *(x.shape for x in c))
+    c = tuple(np.broadcast_to(x, shape) for x in c)
+
+    if len(c) == 3 and method != "best_response":
+        q, iterations = _cournot_linear(a, b, c[1], c[2]), 0
+    elif method == "closed_form":
+        raise ValueError("Closed form needs costs of degree two or less.")
+    else:
+        q, iterations = _cournot_best_response(a, b, c, tolerance, max_iter)
+
+    total = q.sum(axis=-1)
+    p = a[..., 0] + b[..., 0] * total
+    with np.errstate(divide="ignore", invalid="ignore"):
+        shares = q / total[..., None]
+    return {
+        "price": p,
+        "quantity": total,
+        "firm_quantity": q,
+        "profit": p[..., None] * q - kernel.evaluate(c, q),
+        "consumer_surplus": 0.5 * (a[..., 0] - p) * total,
+        "hhi": 10_000 * (np.nan_to_num(shares) ** 2).sum(axis=-1),
+        "iterations": iterations,
+    }
+
+
+def _cournot_linear(a, b, c1, c2):
+    # FOC: a + b * Q + b * q_i - c1_i - 2 * c2_i * q_i = 0
+    k = 2 * c2 - b
+    active = np.ones(np.broadcast_shapes(a.shape, k.shape, c1.shape), dtype=bool)
+    for _ in range(active.shape[-1]):
+        s0 = (active / k).sum(axis=-1, keepdims=True)
+        s1 = (active * (a - c1) / k).sum(axis=-1, keepdims=True)
+        total = s1 / (1 - b * s0)
+        q = active * (a + b * total - c1) / k
+        still = active & (q > 0)
+        if (still == active).all():
+            break
+        active = still
+    return np.maximum(q, 0)
+
+
+def _cournot_best_response(a, b, c, tolerance, max_iter):
+    # best response solves MC_i(q) - 2 * b * q = a + b * Q_-i
+    h = kernel.difference(kernel.derivative(c), (0, 2 * b))
+    n = c[0].shape[-1]
+    step = 2 / (n + 1)  # damping that keeps simultaneous updates stable
+    q = np.zeros(c[0].shape)
+    for iteration in range(1, max_iter + 1):
+        others = q.sum(axis=-1, keepdims=True) - q
+        response = _quantity(kernel.inverse(h, a + b * others))
+        change = step * (response - q)
+        q = q + change
+        if np.abs(change).max() <= tolerance * (1 + np.abs(q).max()):
+            break
+    return q, iteration
+
+
+def bertrand(demand_intercept, demand_slope, marginal_cost, fixed_cost=0):
+    """Bertrand price competition with homogeneous goods and constant marginal costs.
+
+    The lowest-cost firm serves the market at the second-lowest marginal cost,
+    or at its monopoly price if that is lower. Tied lowest-cost firms split the
+    market at a price equal to their marginal cost."""
+    a = np.asarray(demand_intercept, dtype=float)
+    b = np.asarray(demand_slope, dtype=float)
+    mc = np.asarray(marginal_cost, dtype=float)
+    ordered = np.sort(mc, axis=-1)
+    lowest = ordered[..., 0]
+    second = ordered[..., 1] if mc.shape[-1] > 1 else np.inf
+    p = np.minimum(second, 0.5 * (a + lowest))
+
+    q = np.maximum((p - a) / b, 0)
+    winners = mc == lowest[..., None]
+    firm_q = winners * (q / winners.sum(axis=-1))[..., None]
+    return {
+        "price": p,
+        "quantity": q,
+        "firm_quantity": firm_q,
+        "profit": (p[..., None] - mc) * firm_q - fixed_cost,
+        "consumer_surplus": 0.5 * (a - p) * q,
+    }
+
+
+class Monopoly:
+    def __init__(self, demand, cost):
+        """Single-price monopoly facing *demand* with total *cost*."""
+        self.demand = demand
+        self.cost = cost
+        result = monopoly(demand.intercept, demand.slope, cost_coef(cost))
+        self.p = float(result["price"])
+        self.q = float(result["quantity"])
+        self.profit = float(result["profit"])
+        self.consumer_surplus = float(result["consumer_surplus"])
+        self.dwl = float(result["dwl"])
+        self.lerner = float(result["lerner"])
+
+
+class Cournot:
+    def __init__(self, demand, costs, method="auto"):
+        """Cournot quantity competition among firms with total *costs*."""
+        self.demand = demand
+        self.costs = costs
+        coef = kernel.columns([cost_coef(c) for c in costs])
+        result = cournot(demand.intercept, demand.slope, coef, method=method)
+        self.p = float(result["price"])
+        self.q = float(result["quantity"])
+        self.firm_q = result["firm_quantity"]
+        self.profits = result["profit"]
+        self.consumer_surplus = float(result["consumer_surplus"])
+        self.hhi = float(result["hhi"])
+
+
+class Bertrand:
+    def __init__(self, demand, costs):
+        """Bertrand price competition among firms with linear total *costs*."""
+        coef = kernel.columns([cost_coef(c) for c in costs])
+        if len(coef) > 2 and np.any(coef[2:]):
+            raise ValueError("Bertrand needs constant marginal costs.")
+        self.demand = demand
+        self.costs = costs
+        result = bertrand(demand.intercept, demand.slope, coef[1], coef[0])
+        self.p = float(result["price"])
+        self.q = float(result["quantity"])
+        self.firm_q = result["firm_quantity"]
+        self.profits = result["profit"]
+        self.consumer_surplus = float(result["consumer_surplus"])
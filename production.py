@@ -0,0 +1,243 @@
+"""Linear production with many producers and many goods.
+
+Generalizes `econ101.PPF` and `econ101.JointPPF` to *N* producers and *K* goods.
+Producer *i* makes `productivity[i, k]` units of good *k* per unit of endowment
+(time), so its PPF is the simplex `sum_k x_k / productivity[i, k] <= endowment[i]`.
+
+The joint frontier in a direction *d* (a consumption bundle) is the largest *t*
+such that the world can produce `t * d`. This is a linear program in the time
+shares `s[i, k]`:
+
+```
+max  t
+s.t. sum_k s[i, k] <= 1                                    for each producer i
+     t * d[k] - sum_i endowment[i] * productivity[i, k] * s[i, k] <= 0   for each good k
+     s, t >= 0
+```
+
+Its dual prices are the world (trade) prices of the goods and the income of
+each producer, which gives the gains from trade relative to autarky.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+
+
+@dataclass
+class TradeSolution:
+    """Solution of the joint production problem in one direction."""
+
+    scale: float  # number of bundles produced jointly
+    output: np.ndarray  # K, world output of each good
+    shares: np.ndarray  # N x K, share of endowment each producer spends on each good
+    prices: np.ndarray  # K, world prices, normalized so that the bundle costs 1
+    income: np.ndarray  # N, bundles each producer can buy at world prices
+    autarky: np.ndarray  # N, bundles each producer makes on its own
+    iterations: int = 0  # simplex pivots, fewer when warm-started
+
+    @property
+    def gains(self) -> np.ndarray:
+        """Gains from trade of each producer, in bundles."""
+        return self.income - self.autarky
+
+    @property
+    def total_gains(self) -> float:
+        """Gains from trade of the world, in bundles."""
+        return self.scale - self.autarky.sum()
+
+    def specialization(self, tolerance=1e-9) -> np.ndarray:
+        """N x K boolean array, True where a producer makes a good."""
+        return self.shares > tolerance
+
+
+class LinearProduction:
+    def __init__(self, productivity, endowment=1, good_names=None):
+        """Create N-producer, K-good linear production model from an N x K
+        array of *productivity* (output per unit of endowment)."""
+        self.productivity = productivity
+        n, k = self.productivity.shape
+        self.endowment = np.broadcast_to(np.asarray(endowment, dtype=float), (n,))
+        if good_names is None:
+            good_names = ["Good {}".format(j + 1) for j in range(k)]
+        self.good_names = good_names
+        self._basis = None  # optimal simplex basis of the last solve
+
+    @classmethod
+    def from_ppfs(cls, ppf_array) -> "LinearProduction":
+        """Create model from a list of two-good `econ101.PPF` objects."""
+        productivity = [[1 / ppf.p1, 1 / ppf.p2] for ppf in ppf_array]
+        endowment = [ppf.endowment for ppf in ppf_array]
+        return cls(productivity, endowment, ppf_array[0].good_names)
+
+    @property
+    def productivity(self) -> np.ndarray:
+        return self._productivity
+
+    @productivity.setter
+    def productivity(self, value):
+        # the previous basis is kept, so the next solve is warm-started
+        value = np.array(value, dtype=float)
+        if value.ndim != 2:
+            raise ValueError("Productivity must be an N x K array.")
+        if (value < 0).any():
+            raise ValueError("Negative productivity.")
+        self._productivity = value
+
+    @property
+    def n_producers(self) -> int:
+        return self.productivity.shape[0]
+
+    @property
+    def n_goods(self) -> int:
+        return self.productivity.shape[1]
+
+    @property
+    def max_output(self) -> np.ndarray:
+        """N x K array of output if a producer makes only that good."""
+        return self.productivity * self.endowment[:, None]
+
+    @property
+    def intercepts(self) -> np.ndarray:
+        """Joint frontier intercepts at each good axis."""
+        return self.max_output.sum(axis=0)
+
+    def opportunity_costs(self, numeraire=0) -> np.ndarray:
+        """N x K array of opportunity costs of each good in units of the *numeraire* good."""
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return self.productivity[:, [numeraire]] / self.productivity
+
+    def autarky(self, direction) -> np.ndarray:
+        """Bundles each producer makes on its own when consuming in proportions *direction*."""
+        d = _direction(direction, self.n_goods)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            time_per_bundle = (d / self.productivity).sum(axis=1, where=d > 0)
+        return self.endowment / time_per_bundle
+
+    def solve(self, direction, warm_start=True) -> TradeSolution:
+        """Find the joint frontier point in *direction*, specialization and world prices."""
+        d = _direction(direction, self.n_goods)
+        n, k = self.productivity.shape
+
+        # variables: shares s[i, k] in row-major order, then scale t
+        A = np.zeros((n + k, n * k + 1))
+        A[np.repeat(np.arange(n), k), np.arange(n * k)] = 1
+        A[n + np.tile(np.arange(k), n), np.arange(n * k)] = -self.max_output.ravel()
+        A[n:, -1] = d
+        b = np.concatenate([np.ones(n), np.zeros(k)])
+        c = np.zeros(n * k + 1)
+        c[-1] = 1
+
+        basis = self._basis if warm_start else None
+        x, duals, self._basis, iterations = _simplex(c, A, b, basis)
+
+        shares = x[:-1].reshape(n, k)
+        return TradeSolution(
+            scale=x[-1],
+            output=(self.max_output * shares).sum(axis=0),
+            shares=shares,
+            prices=duals[n:],
+            income=duals[:n],
+            autarky=self.autarky(d),
+            iterations=iterations,
+        )
+
+    def frontier(self, directions, warm_start=True) -> np.ndarray:
+        """M x K array of joint frontier points along each row of *directions*."""
+        directions = np.atleast_2d(directions)
+        points = np.empty(directions.shape, dtype=float)
+        for key, d in enumerate(directions):
+            points[key] = self.solve(d, warm_start=warm_start).output
+        return points
+
+    def gains_from_trade(self, direction) -> np.ndarray:
+        """Gains from trade of each producer, in bundles of *direction*."""
+        return self.solve(direction).gains
+
+    def efficiency(self, *bundle) -> str:
+        """Return if a bundle is inefficient, efficient, or unattainable.
+        The zero bundle is inefficient unless nothing can be produced, as in
+        `econ101.JointPPF.efficiency`."""
+        bundle = np.ravel(bundle)
+        if (bundle == 0).all():
+            return "inefficient" if self.intercepts.any() else "efficient"
+        scale = self.solve(bundle).scale
+        if np.isclose(scale, 1):
+            return "efficient"
+        elif scale > 1:
+            return "inefficient"
+        else:
+            return "unattainable"
+
+
+def _direction(direction, n_goods) -> np.ndarray:
+    d = np.asarray(direction, dtype=float)
+    if d.shape != (n_goods,):
+        raise ValueError("Direction must have one entry per good.")
+    if (d < 0).any() or not (d > 0).any():
+        raise ValueError("Direction must be nonnegative and nonzero.")
+    return d
+
+
+def _simplex(c, A, b, basis=None, tolerance=1e-9, max_iter=100_000):
+    """Maximize `c @ x` subject to `A @ x <= b`, `x >= 0` with `b >= 0`.
+
+    Dense tableau simplex that can start from a previous optimal *basis*.
+    Returns solution, dual prices of the constraints, the optimal basis and
+    the number of pivots.
+    """
+    m, n = A.shape
+    T = np.zeros((m + 1, n + m + 1))
+    T[:m, :n] = A
+    T[:m, n : n + m] = np.eye(m)
+    T[:m, -1] = b
+    T[m, :n] = -c
+
+    if basis is None or not _set_basis(T, basis, tolerance):
+        basis = np.arange(n, n + m)
+    else:
+        basis = np.array(basis)
+
+    degenerate = False
+    for iterations in range(max_iter):
+        reduced = T[m, :-1]
+        candidates = np.flatnonzero(reduced < -tolerance)
+        if not candidates.size:
+            break
+        # Dantzig's rule, Bland's rule after a degenerate pivot to avoid cycling
+        j = candidates[0] if degenerate else candidates[np.argmin(reduced[candidates])]
+
+        column = T[:m, j]
+        rows = np.flatnonzero(column > tolerance)
+        if not rows.size:
+            raise ValueError("Unbounded linear program.")
+        ratios = T[rows, -1] / column[rows]
+        ties = rows[ratios <= ratios.min() + tolerance]
+        r = ties[np.argmin(basis[ties])]
+
+        degenerate = T[r, -1] <= tolerance
+        T[r] /= T[r, j]
+        T -= np.outer(T[:, j], T[r]) * (np.arange(m + 1) != r)[:, None]
+        basis[r] = j
+    else:
+        raise RuntimeError("Simplex did not converge.")
+
+    x = np.zeros(n + m)
+    x[basis] = T[:m, -1]
+    return x[:n], T[m, n : n + m].copy(), basis, iterations
+
+
+def _set_basis(T, basis, tolerance) -> bool:
+    """Pivot tableau *T* in place onto a primal feasible *basis*."""
+    m = T.shape[0] - 1
+    if len(basis) != m:
+        return False
+    B = T[:m, basis]
+    try:
+        body = np.linalg.solve(B, T[:m])
+    except np.linalg.LinAlgError:
+        return False
+    if (body[:, -1] < -tolerance).any():
+        return False
+    T[:m] = body
+    T[m] -= T[m, basis] @ body
+    return True
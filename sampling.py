@@ -0,0 +1,45 @@
+"""Choose where to evaluate curves for plotting.
+
+Piecewise-linear curves (aggregates of linear demand or supply curves) are
+drawn exactly through their kink vertices. Smooth curves are sampled
+adaptively: intervals where the curve bends away from a straight line get
+more points. Each refinement round evaluates all new points in one
+vectorized call.
+"""
+import numpy as np
+
+
+def vertices(breakpoints, lo, hi) -> np.ndarray:
+    """Sorted unique *breakpoints* inside [lo, hi], with both ends added."""
+    x = np.asarray(breakpoints, dtype=float).ravel()
+    x = x[np.isfinite(x) & (x > lo) & (x < hi)]
+    return np.unique(np.concatenate([[lo], x, [hi]]))
+
+
+def adaptive(f, lo, hi, n_initial=9, tolerance=1e-3, max_rounds=12):
+    """Sample vectorized function *f* on [lo, hi], refining by curvature.
+
+    An interval is split while its midpoint deviates from the chord by more
+    than *tolerance* times the range of sampled values. Returns (x, y) arrays."""
+    x = np.linspace(lo, hi, n_initial)
+    y = np.asarray(f(x), dtype=float)
+    fresh = np.ones(x.size - 1, dtype=bool)  # intervals not checked yet
+    for _ in range(max_rounds):
+        left = np.flatnonzero(fresh)
+        if not left.size:
+            break
+        mid = 0.5 * (x[left] + x[left + 1])
+        y_mid = np.asarray(f(mid), dtype=float)
+        finite = np.isfinite(y)
+        scale = np.ptp(y[finite]) if finite.any() else 1.0
+        error = np.abs(y_mid - 0.5 * (y[left] + y[left + 1]))
+        split = error > tolerance * max(scale, 1e-12)
+
+        # both halves of a split interval are checked in the next round
+        x = np.concatenate([x, mid[split]])
+        y = np.concatenate([y, y_mid[split]])
+        fresh_points = np.concatenate([np.zeros(fresh.size + 1, bool), np.ones(split.sum(), bool)])
+        order = np.argsort(x, kind="stable")
+        x, y, fresh_points = x[order], y[order], fresh_points[order]
+        fresh = fresh_points[:-1] | fresh_points[1:]
+    return x, y
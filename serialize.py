@@ -0,0 +1,177 @@
+"""Schema-versioned `.npz` files for curves, markets, costs, games and PPFs.
+
+Everything is stored as plain arrays, so files load with `allow_pickle=False`:
+
+- single curves (`curves` or `econ101` lines) are rows of one shared curve
+  table (`curves/intercept`, `curves/slope`, `curves/kind`);
+- an `econ101.Aggregate` market is a column of row references into that table,
+  so its members must be linear curves from `curves` or `econ101` (an
+  aggregate holding e.g. a `consumer.MarketDemand` raises `TypeError`);
+- a `curves.CurveArray` keeps its own intercept and slope columns in its dtype;
+- costs are coefficient arrays, games are (A action, B action, player) payoff
+  tensors with their player and action names in the header, and a `JointPPF`
+  is a table of its member PPFs.
+
+A JSON header (`__schema__`) records the schema version and how to rebuild
+each named object. `load(path)` returns the objects. `load(path, arrays=True)`
+instead returns every curve collection, including aggregates, as a
+`curves.CurveArray`, so millions of curves load without per-curve objects.
+
+```
+import serialize
+
+serialize.save("market.npz", demand=Aggregate(demands), supply=Supply(0, 1), game=game)
+objects = serialize.load("market.npz")
+objects["demand"].equilibrium(objects["supply"])
+```
+
+Interventions such as taxes are not part of the format.
+"""
+import importlib
+import json
+
+import numpy as np
+
+from curves import CurveArray
+
+SCHEMA_VERSION = 1
+HEADER = "__schema__"
+MODULES = ("curves", "econ101")  # classes are only resolved from these modules
+
+
+def save(path, **objects) -> None:
+    """Write named *objects* to a compressed `.npz` file at *path*."""
+    table = {"intercept": [], "slope": [], "kind": []}
+    kinds = []
+    arrays, entries = {}, {}
+
+    def row(curve):
+        kind = _class_name(curve)
+        if kind not in kinds:
+            kinds.append(kind)
+        table["intercept"].append(curve.intercept)
+        table["slope"].append(curve.slope)
+        table["kind"].append(kinds.index(kind))
+        return len(table["kind"]) - 1
+
+    for name, obj in objects.items():
+        if "/" in name or name == HEADER:
+            raise ValueError("Invalid object name: {!r}.".format(name))
+        cls = type(obj).__name__
+        if isinstance(obj, CurveArray):
+            entries[name] = {"type": "curve_array", "kind": _class_name(obj.kind, is_class=True)}
+            arrays[name + "/intercept"] = obj.intercept
+            arrays[name + "/slope"] = obj.slope
+        elif hasattr(obj, "curve_array"):
+            entries[name] = {"type": "aggregate", "class": _class_name(obj)}
+            for curve in obj.curve_array:
+                if type(curve).__module__ not in MODULES:
+                    raise TypeError(
+                        "Aggregate {!r} has a {} member; only linear curves from {} can be saved.".format(
+                            name, type(curve).__qualname__, MODULES
+                        )
+                    )
+            arrays[name + "/rows"] = np.array([row(curve) for curve in obj.curve_array], dtype=np.int64)
+        elif hasattr(obj, "intercept") and hasattr(obj, "slope"):
+            entries[name] = {"type": "curve", "row": row(obj)}
+        elif hasattr(obj, "reciprocal"):
+            entries[name] = {"type": "cost", "class": _class_name(obj), "currency": obj.currency}
+            coef = (obj.constant, obj.linear, obj.quadratic, obj.reciprocal)
+            arrays[name + "/coef"] = np.stack(np.broadcast_arrays(*coef))
+        elif hasattr(obj, "payoffs00"):
+            entries[name] = {
+                "type": "game",
+                "class": _class_name(obj),
+                "player_names": obj.player_names,
+                "A_action_names": obj.A_action_names,
+                "B_action_names": obj.B_action_names,
+            }
+            arrays[name + "/payoffs"] = np.array([[obj.payoffs00, obj.payoffs01], [obj.payoffs10, obj.payoffs11]])
+        elif hasattr(obj, "ppf_array"):
+            members = obj.ppf_array
+            entries[name] = {"type": "joint_ppf", "good_names": list(members[0].good_names)}
+            arrays[name + "/ppf"] = np.array(
+                [[ppf.p1, ppf.p2, ppf.max1, ppf.max2, ppf.endowment] for ppf in members], dtype=float
+            )
+        else:
+            raise TypeError("Cannot serialize {} object {!r}.".format(cls, name))
+
+    arrays["curves/intercept"] = np.array(table["intercept"], dtype=float)
+    arrays["curves/slope"] = np.array(table["slope"], dtype=float)
+    arrays["curves/kind"] = np.array(table["kind"], dtype=np.int16)
+    header = {"schema_version": SCHEMA_VERSION, "kinds": kinds, "objects": entries}
+    np.savez_compressed(path, **{HEADER: np.array(json.dumps(header))}, **arrays)
+
+
+def read_header(path) -> dict:
+    """Schema version, curve kinds and object entries of a file."""
+    with np.load(path, allow_pickle=False) as data:
+        return json.loads(str(data[HEADER]))
+
+
+def load(path, names=None, arrays=False) -> dict:
+    """Read objects from *path* (all, or those in *names*). With *arrays*, curves
+    and aggregates come back as `curves.CurveArray` columns instead of objects."""
+    with np.load(path, allow_pickle=False) as data:
+        header = json.loads(str(data[HEADER]))
+        if header["schema_version"] > SCHEMA_VERSION:
+            raise ValueError("Unsupported schema version {}.".format(header["schema_version"]))
+        entries = header["objects"]
+        names = list(entries) if names is None else list(names)
+        kinds = [_resolve(kind) for kind in header["kinds"]]
+        table = None
+        if any(entries[name]["type"] in ("curve", "aggregate") for name in names):
+            table = data["curves/intercept"], data["curves/slope"], data["curves/kind"]
+        return {name: _build(name, entries[name], data, table, kinds, arrays) for name in names}
+
+
+def _build(name, entry, data, table, kinds, arrays):
+    kind = entry["type"]
+    if kind == "curve_array":
+        intercept = data[name + "/intercept"]
+        return CurveArray(intercept, data[name + "/slope"], _resolve(entry["kind"]), intercept.dtype.type)
+    if kind in ("curve", "aggregate"):
+        intercept, slope, codes = table
+        rows = data[name + "/rows"] if kind == "aggregate" else np.array([entry["row"]])
+        if arrays:
+            first = kinds[codes[rows[0]]] if rows.size else CurveArray.kind
+            return CurveArray(intercept[rows], slope[rows], first)
+        curves = [kinds[codes[i]](float(intercept[i]), float(slope[i])) for i in rows.tolist()]
+        return _resolve(entry["class"])(curves) if kind == "aggregate" else curves[0]
+    if kind == "cost":
+        cls = _resolve(entry["class"])
+        constant, linear, quadratic, reciprocal = (_scalar(x) for x in data[name + "/coef"])
+        cost = cls.__new__(cls)
+        _resolve("econ101.Cost").__init__(cost, constant, linear, quadratic, entry["currency"], reciprocal)
+        return cost
+    if kind == "game":
+        payoffs = data[name + "/payoffs"].tolist()
+        names = {key: entry[key] for key in ("player_names", "A_action_names", "B_action_names") if key in entry}
+        return _resolve(entry["class"])(*(tuple(cell) for rows in payoffs for cell in rows), **names)
+    if kind == "joint_ppf":
+        PPF = _resolve("econ101.PPF")
+        members = []
+        for p1, p2, max1, max2, endowment in data[name + "/ppf"].tolist():
+            ppf = PPF(p1=p1, p2=p2, endowment=endowment, good_names=entry["good_names"])
+            ppf.max1, ppf.max2 = max1, max2  # exact values, not recomputed
+            members.append(ppf)
+        return _resolve("econ101.JointPPF")(members)
+    raise ValueError("Unknown object type {!r}.".format(kind))
+
+
+def _scalar(x):
+    return x.item() if x.ndim == 0 else x
+
+
+def _class_name(obj, is_class=False) -> str:
+    cls = obj if is_class else type(obj)
+    if cls.__module__ not in MODULES:
+        raise TypeError("Only classes from {} can be serialized, got {}.".format(MODULES, cls.__qualname__))
+    return cls.__module__ + "." + cls.__qualname__
+
+
+def _resolve(name):
+    module, _, qualname = name.rpartition(".")
+    if module not in MODULES:
+        raise ValueError("Refusing to load class {!r}.".format(name))
+    return getattr(importlib.import_module(module), qualname)
@@ -0,0 +1,150 @@
+"""Asyncio facade that answers market requests in micro-batches.
+
+Concurrent requests arriving within *window* seconds are collected and solved
+in one call to the vectorized `batch` solvers. Large batches run in an
+executor, so the event loop stays responsive. The module only needs NumPy
+and does not import `econ101`, `curves` or matplotlib. Curves are given as
+`(intercept, slope)` pairs or any objects with `coef`, such as `curves.Demand`.
+
+```
+import asyncio
+from service import MarketService
+
+async def main():
+    async with MarketService() as markets:
+        results = await asyncio.gather(
+            *[markets.equilibrium((12, -2), (0, 1), tax=t) for t in range(5)]
+        )
+    return results  # dicts of floats with the columns of batch.equilibrium
+
+asyncio.run(main())
+```
+"""
+import asyncio
+
+import numpy as np
+
+import batch
+import instrument
+
+SOLVERS = {
+    "equilibrium": batch.equilibrium,
+    "price_ceiling": batch.price_ceiling,
+    "price_floor": batch.price_floor,
+    "quota": batch.quota,
+}
+
+
+class MarketService:
+    def __init__(self, window=0.001, max_batch=10000, offload=1000, executor=None):
+        """Collect requests for *window* seconds, or until *max_batch* are waiting,
+        and solve them together. Batches of at least *offload* markets run in
+        *executor* (the loop's default executor if None)."""
+        self.window = window
+        self.max_batch = max_batch
+        self.offload = offload
+        self.executor = executor
+        self._pending = {}  # solver name -> list of (arguments, future)
+        self._timers = {}
+        self._running = set()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.drain()
+
+    async def equilibrium(self, demand, supply, tax=0) -> dict:
+        """Outcome of a *demand* and *supply* market under a per-unit *tax*."""
+        return await self._submit("equilibrium", demand, supply, tax)
+
+    async def price_ceiling(self, demand, supply, ceiling) -> dict:
+        return await self._submit("price_ceiling", demand, supply, ceiling)
+
+    async def price_floor(self, demand, supply, floor) -> dict:
+        return await self._submit("price_floor", demand, supply, floor)
+
+    async def quota(self, demand, supply, limit) -> dict:
+        return await self._submit("quota", demand, supply, limit)
+
+    async def drain(self) -> None:
+        """Solve everything still waiting and wait for batches in executors."""
+        for solver in list(self._pending):
+            self._flush(solver)
+        if self._running:
+            await asyncio.gather(*self._running, return_exceptions=True)
+
+    def _submit(self, solver, demand, supply, value):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        try:
+            args = _arguments(demand, supply, value)
+        except (TypeError, ValueError) as error:
+            future.set_exception(error)
+            return future
+        queue = self._pending.setdefault(solver, [])
+        queue.append((args, future))
+        if len(queue) >= self.max_batch:
+            self._flush(solver)
+        elif len(queue) == 1:
+            self._timers[solver] = loop.call_later(self.window, self._flush, solver)
+        return future
+
+    def _flush(self, solver):
+        timer = self._timers.pop(solver, None)
+        if timer is not None:
+            timer.cancel()
+        queue = self._pending.pop(solver, [])
+        if not queue:
+            return
+        futures = [future for _, future in queue]
+        instrument.record("MarketService." + solver, batches=1, requests=len(queue))
+        if len(queue) < self.offload:
+            try:
+                columns = np.array([args for args, _ in queue], dtype=float).T
+                result = SOLVERS[solver](*columns)
+            except Exception as error:
+                _fail(futures, error)
+            else:
+                _deliver(futures, result)
+            return
+        columns = np.array([args for args, _ in queue], dtype=float).T
+        loop = asyncio.get_running_loop()
+        task = loop.run_in_executor(self.executor, SOLVERS[solver], *columns)
+        self._running.add(task)
+        task.add_done_callback(lambda done: self._finished(done, futures))
+
+    def _finished(self, task, futures):
+        self._running.discard(task)
+        if task.cancelled():
+            for future in futures:
+                future.cancel()
+        elif task.exception() is not None:
+            _fail(futures, task.exception())
+        else:
+            _deliver(futures, task.result())
+
+
+def _arguments(demand, supply, value) -> tuple:
+    """Five scalar floats for one market, checked before the request joins a
+    batch so a malformed request fails alone."""
+    intercept, slope = getattr(demand, "coef", demand)
+    supply_intercept, supply_slope = getattr(supply, "coef", supply)
+    args = intercept, slope, supply_intercept, supply_slope, value
+    if any(np.ndim(x) != 0 for x in args):
+        raise ValueError("Market arguments must be scalars, got {!r}.".format(args))
+    return tuple(float(x) for x in args)
+
+
+def _deliver(futures, result):
+    """Hand row *i* of the result columns to future *i*."""
+    rows = {name: np.broadcast_to(column, len(futures)).tolist() for name, column in result.items()}
+    for i, future in enumerate(futures):
+        if not future.done():
+            future.set_result({name: column[i] for name, column in rows.items()})
+
+
+def _fail(futures, error):
+    for future in futures:
+        if not future.done():
+            future.set_exception(error)
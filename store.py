@@ -0,0 +1,160 @@
+"""Disk-backed columnar store for large scenario sweeps.
+
+Each column is a preallocated `.npy` file opened as a memory map, and a small
+`metadata.json` sidecar records the schema, number of filled rows and
+user metadata. Rows are written in chunks, so a sweep producing tens of
+millions of equilibria runs in bounded memory. Results open zero-copy:
+
+```
+with ResultStore("sweep", n_rows=10**7) as store:
+    for chunk in chunks:
+        store.append(batch.equilibrium(*chunk))
+
+columns = load("sweep")   # dict of read-only memory maps
+columns["dwl"].mean()
+```
+"""
+import json
+import os
+
+import numpy as np
+
+from batch import COLUMNS, equilibrium
+
+SCHEMA_VERSION = 1
+METADATA_FILE = "metadata.json"
+
+
+class ResultStore:
+    def __init__(self, path, n_rows, columns=COLUMNS, dtype="float64", metadata=None):
+        """Create a store at directory *path* with *n_rows* preallocated rows
+        for each of *columns*. *dtype* is one type for all columns or a dict
+        of types by column name (others default to float64). Existing column
+        files are overwritten."""
+        self.path = path
+        self.n_rows = int(n_rows)
+        self.columns = tuple(columns)
+        if isinstance(dtype, dict):
+            self.dtypes = {name: np.dtype(dtype.get(name, "float64")) for name in self.columns}
+        else:
+            self.dtypes = {name: np.dtype(dtype) for name in self.columns}
+        self.metadata = dict(metadata or {})
+        self.filled = 0
+
+        os.makedirs(path, exist_ok=True)
+        self._arrays = {
+            name: np.lib.format.open_memmap(
+                _column_path(path, name), mode="w+", dtype=self.dtypes[name], shape=(self.n_rows,)
+            )
+            for name in self.columns
+        }
+        self._write_metadata()
+
+    def append(self, chunk: dict) -> int:
+        """Write a chunk of rows given as a dict of equal-length columns.
+        Returns the number of rows written."""
+        missing = set(self.columns) - set(chunk)
+        if missing:
+            raise KeyError("Missing columns: {}".format(sorted(missing)))
+
+        lengths = {np.size(chunk[name]) for name in self.columns}
+        if len(lengths) != 1:
+            raise ValueError("Columns in a chunk must have equal length.")
+        n = lengths.pop()
+        if self.filled + n > self.n_rows:
+            raise ValueError("Store is full: {} rows preallocated.".format(self.n_rows))
+
+        for name in self.columns:
+            self._arrays[name][self.filled : self.filled + n] = np.ravel(chunk[name])
+        self.filled += n
+        return n
+
+    def flush(self) -> None:
+        """Write buffered rows and the metadata sidecar to disk."""
+        for array in self._arrays.values():
+            array.flush()
+        self._write_metadata()
+
+    def close(self) -> None:
+        self.flush()
+        self._arrays = {}
+
+    def __enter__(self) -> "ResultStore":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _write_metadata(self) -> None:
+        sidecar = {
+            "schema_version": SCHEMA_VERSION,
+            "n_rows": self.n_rows,
+            "filled": self.filled,
+            "columns": {name: self.dtypes[name].str for name in self.columns},
+            "metadata": self.metadata,
+        }
+        with open(os.path.join(self.path, METADATA_FILE), "w") as f:
+            json.dump(sidecar, f, indent=2)
+
+
+def read_metadata(path) -> dict:
+    """Read the metadata sidecar of a store."""
+    with open(os.path.join(path, METADATA_FILE)) as f:
+        return json.load(f)
+
+
+def load(path, columns=None, mmap_mode="r") -> dict:
+    """Open filled rows of a store as a dict of memory-mapped arrays (no copy)."""
+    sidecar = read_metadata(path)
+    if sidecar["schema_version"] > SCHEMA_VERSION:
+        raise ValueError("Unsupported schema version {}.".format(sidecar["schema_version"]))
+    if columns is None:
+        columns = list(sidecar["columns"])
+    n = sidecar["filled"]
+    return {
+        name: np.load(_column_path(path, name), mmap_mode=mmap_mode)[:n]
+        for name in columns
+    }
+
+
+def save(path, columns: dict, metadata=None) -> dict:
+    """Write a complete dict of equal-length *columns* to a store at *path*,
+    keeping the dtype of each column. Returns the columns opened from disk."""
+    dtype = {name: np.asarray(values).dtype for name, values in columns.items()}
+    n = np.size(next(iter(columns.values()))) if columns else 0
+    with ResultStore(path, n, list(columns), dtype, metadata) as store:
+        store.append(columns)
+    return load(path)
+
+
+def to_csv(path, columns: dict) -> None:
+    """Write a dict of equal-length *columns* to a CSV file with a header row."""
+    names = list(columns)
+    table = np.column_stack([np.ravel(columns[name]) for name in names])
+    fmt = ["%d" if np.asarray(columns[name]).dtype.kind in "biu" else "%.17g" for name in names]
+    np.savetxt(path, table, fmt=fmt, delimiter=",", header=",".join(names), comments="")
+
+
+def tax_sweep(path, demand, supply, taxes, chunk_size=10**6, dtype="float64"):
+    """Solve the *demand* and *supply* market for each tax in *taxes* and write
+    results to a store at *path*, *chunk_size* rows at a time."""
+    taxes = np.asarray(taxes)
+    metadata = {
+        "sweep": "tax",
+        "demand": [demand.intercept, demand.slope],
+        "supply": [supply.intercept, supply.slope],
+    }
+    columns = ("tax",) + COLUMNS
+    with ResultStore(path, taxes.size, columns, dtype, metadata) as store:
+        for start in range(0, taxes.size, chunk_size):
+            tax = taxes.ravel()[start : start + chunk_size]
+            chunk = equilibrium(
+                demand.intercept, demand.slope, supply.intercept, supply.slope, tax, dtype=dtype
+            )
+            chunk["tax"] = tax
+            store.append(chunk)
+    return load(path)
+
+
+def _column_path(path, name) -> str:
+    return os.path.join(path, name + ".npy")
@@ -0,0 +1,120 @@
+"""Exact consumer and producer surplus of aggregates of linear curves.
+
+A demand curve `P = a + s * Q` (s < 0) buys `w * (a - p)` at prices below its
+intercept, where `w = 1 / |s|`, and its consumer surplus is the triangle
+`w * (a - p)**2 / 2`. Supply curves mirror this below the price. An
+aggregate is kinked at every intercept, so its quantity and surplus are
+piecewise quadratic in price:
+
+    surplus(p) = (S2 - 2 * p * S1 + p**2 * S0) / 2
+
+with `S0, S1, S2` the sums of `w`, `a * w` and `a**2 * w` over the curves
+active at `p`. `KinkTable` sorts the intercepts once and keeps prefix sums of
+these three columns, so totals at an array of prices cost a binary search
+per price. `participants()` returns the surplus of every curve.
+
+```
+from econ101 import Aggregate, Demand, Supply
+import surplus
+
+demand = Aggregate([Demand(10, -1), Demand(8, -2)])
+supply = Aggregate([Supply(0, 1), Supply(2, 1)])
+surplus.market(demand.kink_table(), supply.kink_table())
+# {"price": 4.571, "quantity": 6.857, "consumer_surplus": ..., ...}
+```
+"""
+import numpy as np
+
+
+class KinkTable:
+    def __init__(self, intercept, slope):
+        """Aggregate of lines with *intercept* and *slope* columns, either all
+        demand (negative slopes) or all supply (positive slopes)."""
+        intercept = np.atleast_1d(np.asarray(intercept, dtype=float))
+        slope = np.atleast_1d(np.asarray(slope, dtype=float))
+        if intercept.size == 0:
+            raise ValueError("An aggregate needs at least one curve.")
+        if not ((slope < 0).all() or (slope > 0).all()):
+            raise ValueError("Slopes must be all negative (demand) or all positive (supply).")
+        self.is_demand = bool(slope[0] < 0)
+        self.intercept = intercept
+        self.slope = slope
+
+        self.order = np.argsort(intercept, kind="stable")
+        self.kinks = intercept[self.order]
+        w = 1 / np.abs(slope[self.order])
+        columns = np.stack([w, self.kinks * w, self.kinks**2 * w])
+        self._prefix = np.concatenate([np.zeros((3, 1)), np.cumsum(columns, axis=1)], axis=1)
+
+    @classmethod
+    def from_curves(cls, curves) -> "KinkTable":
+        """Table of `econ101` or `curves` lines, an `Aggregate` or a `CurveArray`."""
+        curves = getattr(curves, "curve_array", curves)
+        if hasattr(curves, "intercept"):
+            return cls(curves.intercept, curves.slope)
+        return cls([c.intercept for c in curves], [c.slope for c in curves])
+
+    def __len__(self) -> int:
+        return self.kinks.size
+
+    def _active(self, p):
+        """Sums (S0, S1, S2) over curves trading at price *p*, each shaped like *p*."""
+        p = np.asarray(p, dtype=float)
+        if self.is_demand:
+            k = np.searchsorted(self.kinks, p, side="right")
+            return self._prefix[:, -1].reshape((3,) + (1,) * p.ndim) - self._prefix[:, k]
+        return self._prefix[:, np.searchsorted(self.kinks, p, side="left")]
+
+    def quantity(self, p):
+        """Aggregate quantity at price *p*."""
+        s0, s1, _ = self._active(p)
+        return s1 - p * s0 if self.is_demand else p * s0 - s1
+
+    def surplus(self, p):
+        """Total consumer (demand) or producer (supply) surplus at price *p*."""
+        s0, s1, s2 = self._active(p)
+        # exact zero when nothing trades, nonnegative despite rounding
+        return np.maximum(0.5 * (s2 - 2 * p * s1 + p * p * s0), 0)
+
+    def participants(self, p):
+        """Surplus of each curve, in the original order, shaped `(n,) + shape(p)`."""
+        p = np.asarray(p, dtype=float)
+        shape = self.intercept.shape + (1,) * p.ndim
+        a, w = self.intercept.reshape(shape), 1 / np.abs(self.slope.reshape(shape))
+        gap = np.maximum(a - p if self.is_demand else p - a, 0)
+        return 0.5 * w * gap**2
+
+
+def clearing_price(demand: KinkTable, supply: KinkTable):
+    """Price where aggregate demand equals aggregate supply. Excess demand is
+    linear between neighbouring kinks, so the bracketing segment is found at
+    the merged kinks and solved exactly. NaN if the curves never meet at a
+    positive quantity."""
+    kinks = np.union1d(demand.kinks, supply.kinks)
+    excess = demand.quantity(kinks) - supply.quantity(kinks)
+    below = np.flatnonzero(excess > 0)
+    if below.size == 0 or below[-1] + 1 == kinks.size:
+        return np.nan
+    k = below[-1]
+    # S0 and S1 are constant on the open segment above kink k
+    mid = kinks[k] + 0.5 * (kinks[k + 1] - kinks[k])
+    d0, d1, _ = demand._active(mid)
+    s0, s1, _ = supply._active(mid)
+    return float((d1 + s1) / (d0 + s0))
+
+
+def market(demand: KinkTable, supply: KinkTable, price=None) -> dict:
+    """Price, quantity and surplus of an aggregate market at its clearing price,
+    or at *price* (scalar or array) where each side's surplus is evaluated on
+    its own quantity. Per-curve surplus vectors are under "consumer" and "producer"."""
+    p = clearing_price(demand, supply) if price is None else np.asarray(price, dtype=float)
+    cs, ps = demand.surplus(p), supply.surplus(p)
+    return {
+        "price": p,
+        "quantity": np.minimum(demand.quantity(p), supply.quantity(p)),
+        "consumer_surplus": cs,
+        "producer_surplus": ps,
+        "total_surplus": cs + ps,
+        "consumer": demand.participants(p),
+        "producer": supply.participants(p),
+    }
@@ -0,0 +1,68 @@
+import numpy as np
+
+from batch import equilibrium, price_ceiling, price_floor, quota, supply_schedule
+from econ101 import Demand, Equilibrium, Supply, TotalCost
+
+
+def test_price_ceiling():
+    x = price_ceiling(10, -1, 0, 1, ceiling=np.array([3, 7]))
+    assert x["quantity"].tolist() == [3, 5]
+    assert x["shortage"].tolist() == [4, 0]
+    assert x["consumer_surplus"].tolist() == [16.5, 12.5]
+    assert x["dwl"].tolist() == [4, 0]
+
+
+def test_price_floor():
+    x = price_floor(10, -1, 0, 1, floor=np.array([3, 8]))
+    assert x["quantity"].tolist() == [5, 2]
+    assert x["excess_supply"].tolist() == [0, 6]
+    assert x["producer_surplus"].tolist() == [12.5, 14]
+
+
+def test_quota_matches_equilibrium():
+    e = Equilibrium(Demand(10, -1), Supply(0, 1))
+    e.set_quota(2)
+    assert e.p == (8, 2)
+    assert (e.quota_rent, e.dwl) == (12, 9)
+    x = quota(10, -1, 0, 1, limit=np.array([2, 7]))
+    assert x["quota_rent"].tolist() == [12, 0]
+    # surplus is conserved
+    total = x["consumer_surplus"] + x["producer_surplus"] + x["quota_rent"] + x["dwl"]
+    assert np.allclose(total, 25)
+
+
+def test_policies_replace_each_other():
+    e = Equilibrium(Demand(10, -1), Supply(0, 1))
+    e.set_quota(2)
+    e.set_tax(2)
+    assert (e.quota_rent, e.shortage, e.excess_supply) == (0, 0, 0)
+    assert (e.q, e.dwl, e.consumer_surplus, e.producer_surplus) == (4, 1, 8, 8)
+    e.set_price_floor(8)
+    assert (e.tax, e.subsidy, e.distortion) == (0, 0, 0) and e.excess_supply == 6
+    e.set_subsidy(2)
+    assert e.excess_supply == 0 and (e.tax, e.subsidy) == (0, 2)
+
+
+def test_float32_columns():
+    rng = np.random.default_rng(0)
+    args = rng.uniform(10, 20, 1000), -rng.uniform(0.5, 2, 1000), rng.uniform(0, 5, 1000), rng.uniform(0.5, 2, 1000)
+    single, double = equilibrium(*args, tax=1, dtype=np.float32), equilibrium(*args, tax=1)
+    for name in single:
+        assert single[name].dtype == np.float32
+        assert np.allclose(single[name], double[name], rtol=1e-5, atol=1e-4)
+    assert price_floor(*args, floor=15, dtype=np.float32)["shortage"].dtype == np.float32
+    assert supply_schedule([5, 10], 10, 2, 1, dtype=np.float32)["profit"].dtype == np.float32
+    assert supply_schedule([5, 10], 10, 2, 1)["profit"].dtype == np.float64
+    assert TotalCost(10, 2, 1).supply_schedule([5, 10], dtype=np.float32)["quantity"].dtype == np.float32
+
+
+def test_prohibitive_tax_dwl():
+    taxes = np.array([3, 12, 20, 100])
+    x = equilibrium(12, -2, 0, 1, taxes)
+    assert x["quantity"].tolist() == [3, 0, 0, 0]
+    # a prohibitive tax loses exactly the whole surplus of 24
+    assert x["dwl"].tolist() == [1.5, 24, 24, 24]
+    assert equilibrium(12, -2, 0, 1, -3)["dwl"] == 1.5
+    e = Equilibrium(Demand(12, -2), Supply(0, 1))
+    e.set_tax(20)
+    assert (e.q, e.dwl) == (0, 24)
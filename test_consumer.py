@@ -0,0 +1,40 @@
+import numpy as np
+
+from consumer import CES, CobbDouglas, MarketDemand, PerfectComplements, PerfectSubstitutes
+from econ101 import LinearConstraint
+
+
+def test_choice_on_budget_line():
+    budget = LinearConstraint(p1=2, p2=3, endowment=60)
+    assert CobbDouglas(0.3).choice(budget) == (9, 14)
+    assert PerfectSubstitutes(1, 2).choice(budget) == (0, 20)
+    assert PerfectComplements(1, 2).choice(budget) == (7.5, 15)
+
+
+def test_duality():
+    for u in CobbDouglas(0.3), CES(0.3, -1), PerfectSubstitutes(1, 2), PerfectComplements(1, 2):
+        v = u.indirect_utility(2, 3, 60)
+        assert np.isclose(u.expenditure(2, 3, v), 60)
+        assert np.allclose(u.hicksian(2, 3, v), u.marshallian(2, 3, 60))
+
+
+def test_market_demand_vectorized():
+    alpha = np.array([0.2, 0.5, 0.8])
+    market = MarketDemand(CobbDouglas(alpha), income=[10, 20, 30])
+    assert np.isclose(market.q(2), (0.2 * 10 + 0.5 * 20 + 0.8 * 30) / 2)
+    assert market.q(np.array([1, 2, 4])).shape == (3,)
+    demand = market.linear(2)
+    assert demand.slope < 0
+    assert np.isclose(demand.q(2), market.q(2))
+
+
+def test_market_demand_tangent_is_cached(monkeypatch):
+    market = MarketDemand(CobbDouglas(0.5), income=[10, 20], other_price=2, good=2)
+    assert np.isclose(market.q(1), 15)  # other_price is the price of good 1
+    slope, intercept = market.slope, market.intercept
+    calls, linear = [], market.linear
+    monkeypatch.setattr(market, "linear", lambda price=None: calls.append(price) or linear(price))
+    assert (market.slope, market.intercept) == (slope, intercept) and not calls
+    market.reference_price = 2
+    market.slope
+    assert calls == [None]
@@ -1,3 +1,6 @@
+import numpy as np
+
+import econ101
 from curves import Demand, Supply
 
 
@@ -33,3 +36,34 @@ def test_plotting():
     demand.plot_surplus(e.price, ax=ax)
     supply.plot_surplus(e.price, ax=ax)
     clean_axis(ax)
+
+
+def test_curve_array():
+    from curves import CurveArray, Demand, Supply
+
+    demands = CurveArray.from_curves([Demand(12, -2), Demand(20, -2)])
+    assert demands[1] == Demand(20, -2)
+    assert demands.q(4).tolist() == [4, 8]
+    e = demands.equilibrium(Supply(intercept=0, slope=1))
+    assert e.price.round(4).tolist() == [4, 6.6667]
+
+
+def test_float32_aggregate_quantity():
+    from curves import CurveArray
+
+    rng = np.random.default_rng(1)
+    intercept, slope = rng.uniform(5, 20, 10**6), -rng.uniform(0.5, 2, 10**6)
+    single = CurveArray(intercept, slope, dtype=np.float32)
+    double = CurveArray(single.intercept, single.slope)
+    assert single.intercept.dtype == np.float32 and single[:2].dtype == np.float32
+    prices = np.array([6.0, 10.0, 15.0])
+    q32, q64 = single.total_q(prices), double.total_q(prices)
+    assert q32.dtype == np.float32 and q32.shape == (3,)
+    assert np.all(np.abs(q32 - q64) / q64 < 1e-5)
+
+
+def test_producer_surplus():
+    assert Supply(2, 1).producer_surplus(6) == 8
+    assert Supply(2, 1).producer_surplus(0) == 0  # nothing supplied
+    assert Supply(-2, 1).producer_surplus(6) == econ101.Supply(-2, 1).producer_surplus(6) == 32
+    assert Demand(12, -2).consumer_surplus(4) == 16
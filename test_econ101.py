@@ -0,0 +1,42 @@
+import numpy as np
+
+from econ101 import MarginalCost, TotalCost
+
+
+def test_cost_over_grids():
+    c = TotalCost(50, 1, 4)
+    q = np.array([0, 1, 2.0])
+    assert c.cost(q).tolist() == [50, 55, 68]
+    assert c.average_cost().cost(q).tolist() == [np.inf, 55, 34]
+    # many firms on the first axis, quantities on the second
+    firms = TotalCost(np.array([[10], [20]]), 1, np.array([[1], [2]]))
+    assert firms.cost(q).shape == (2, 3)
+
+
+def test_derived_costs_are_fresh():
+    c = TotalCost(50, 1, 4)
+    mc = c.marginal_cost()
+    assert mc is not c.marginal_cost()
+    mc.linear = 0  # a caller's changes do not leak into later calls
+    c.quadratic = 2
+    assert c.marginal_cost().linear == 4
+
+
+def test_marginal_cost_q():
+    assert MarginalCost(2, 2).q(1) == -0.5  # below the intercept of a linear MC
+    assert MarginalCost(2, 2).q(np.array([1, 4])).tolist() == [-0.5, 1]
+    assert np.isclose(MarginalCost(10, -4, 1).q(8), 2 + np.sqrt(2))  # rising branch
+
+
+def test_supply_schedule(tmp_path):
+    firms = TotalCost(np.array([50, 10]), np.array([1, 2]), np.array([4, 1]))
+    table = firms.supply_schedule([0.5, 41])
+    assert table["firm"].tolist() == [0, 0, 1, 1]
+    assert table["quantity"].tolist() == [0, 5, 0, 19.5]
+    assert table["shutdown"].tolist() == [True, False, True, False]
+    # a single firm matches the plotted optimum: P = MC and profit = q * (P - ATC)
+    c = TotalCost(50, 1, 4)
+    row = c.supply_schedule([41])
+    q = c.marginal_cost().q(41)
+    assert row["quantity"][0] == q
+    assert row["profit"][0] == q * (41 - c.average_cost().cost(q))
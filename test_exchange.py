@@ -0,0 +1,41 @@
+import numpy as np
+import matplotlib.pyplot as plt
+
+from consumer import CobbDouglas
+from exchange import ExchangeEconomy, MultiCES, MultiCobbDouglas
+
+
+def test_two_agent_cobb_douglas():
+    # agent 1 owns good 1 and spends 20% on it, agent 2 owns good 2 and spends 40% on good 1
+    e = ExchangeEconomy(CobbDouglas(np.array([0.2, 0.4])), [[1, 0], [0, 1]])
+    r = e.walras()
+    # 0.2 * p1 + 0.4 * p2 = p1
+    assert r.converged
+    assert np.allclose(r.prices, [1, 2])
+    assert np.allclose(r.allocation.sum(axis=0), [1, 1])
+
+
+def test_methods_agree():
+    rng = np.random.default_rng(0)
+    n, k = 2000, 5
+    e = ExchangeEconomy(MultiCES(rng.uniform(size=(n, k)), sigma=rng.uniform(0.3, 3, n)), rng.uniform(size=(n, k)))
+    newton = e.walras(method="newton")
+    tatonnement = e.walras(method="tatonnement")
+    assert newton.converged and tatonnement.converged
+    assert newton.iterations < tatonnement.iterations
+    assert np.allclose(newton.prices, tatonnement.prices, rtol=1e-6)
+    assert newton.history["max_excess"][-1] <= 1e-10
+
+
+def test_walras_law():
+    rng = np.random.default_rng(1)
+    e = ExchangeEconomy(MultiCobbDouglas(rng.uniform(size=(100, 4))), rng.uniform(size=(100, 4)))
+    p = rng.uniform(0.5, 2, size=(3, 4))
+    assert np.allclose((p * e.excess_demand(p)).sum(axis=-1), 0)
+
+
+def test_edgeworth_plot():
+    fig, ax = plt.subplots()
+    ExchangeEconomy(CobbDouglas(np.array([0.2, 0.4])), [[1, 0], [0, 1]]).edgeworth_plot(ax=ax)
+    assert ax.get_xlim() == (0, 1)
+    plt.close(fig)
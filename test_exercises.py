@@ -0,0 +1,46 @@
+import json
+
+import pytest
+
+import exercises
+from econ101 import Game
+
+
+def test_relabelled_games_share_key():
+    game = [[[2, 7], [4, 1]], [[2, 4], [0, 5]]]
+    swapped = [game[1], game[0]]
+    assert exercises.canonical_key("game", {"payoffs": game}) == exercises.canonical_key(
+        "game", {"payoffs": swapped}
+    )
+
+
+def test_problem_set(tmp_path):
+    tex, answers = tmp_path / "problems.tex", tmp_path / "answers.json"
+    n = exercises.write_problem_set(tex, answers, exercises.generate(300, seed=0, batch_size=64))
+    key = json.loads(answers.read_text())
+    assert n == len(key) == tex.read_text().count("\\begin{exercise}") == 300
+    assert len({entry["key"] for entry in key}) == 300
+    for entry in key:
+        solution = entry["solution"]
+        if entry["kind"] == "tax":
+            assert solution["quantity"] == int(solution["quantity"])
+        if entry["kind"] == "game":
+            (u00, u01), (u10, u11) = (map(tuple, row) for row in entry["params"]["payoffs"])
+            assert Game(u00, u01, u10, u11).nash() == set(solution["nash"])
+
+
+def test_thousands_of_distinct_exercises():
+    keys = {e.key for e in exercises.generate(5000, kinds=("cost",), seed=0)}
+    assert len(keys) == 5000
+    assert len({e.key for e in exercises.generate(10000, seed=0)}) == 10000
+
+
+def test_exhausted_space_raises(monkeypatch):
+    def one_problem(rng, n):
+        return [exercises.Exercise("cost", "same", {})] * n
+
+    monkeypatch.setitem(exercises.SOLVERS, "cost", one_problem)
+    stream = exercises.generate(None, kinds=("cost",), batch_size=8)
+    assert next(stream).key == "same"
+    with pytest.raises(RuntimeError, match="exhausted"):
+        next(stream)
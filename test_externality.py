@@ -0,0 +1,28 @@
+import numpy as np
+
+from econ101 import Demand, Supply
+from externality import Externality, externality
+
+
+def test_external_cost():
+    e = Externality(Demand(10, -1), Supply(0, 1), external_cost=2)
+    assert (e.market_q, e.q, e.tax, e.dwl) == (5, 4, 2, 1)
+
+
+def test_quantity_dependent_benefit():
+    # MSB = 10 - 0.5 Q meets supply at Q = 20 / 3, the tax is a subsidy
+    e = Externality(Demand(10, -1), Supply(0, 1), external_benefit=(0, 0.5))
+    assert round(e.q, 4) == 6.6667
+    assert round(e.tax, 4) == -3.3333
+    assert round(e.dwl, 4) == 2.0833
+
+
+def test_sweep():
+    r = externality(10, -1, 0, 1, external_cost=np.linspace(0, 4, 5))
+    assert r["pigouvian_tax"].tolist() == [0, 1, 2, 3, 4]
+    assert r["dwl"].tolist() == [0, 0.25, 1, 2.25, 4]
+
+
+def test_curve_externality():
+    assert Supply(0, 1).externality(2).intercept == 2
+    assert Demand(10, -1).externality(2, is_positive=False).intercept == 8
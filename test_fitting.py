@@ -0,0 +1,53 @@
+import numpy as np
+
+from curves import CurveArray, Demand, Supply
+from fitting import OnlineLinearFit, fit_grouped, read_csv_chunks
+
+
+def make_data(n=1000, seed=0):
+    rng = np.random.default_rng(seed)
+    q = rng.uniform(0, 6, n)
+    return 12 - 2 * q + rng.normal(0, 0.1, n), q
+
+
+def test_online_fit_matches_batch_fit():
+    p, q = make_data()
+    fit = OnlineLinearFit(Demand)
+    for chunk in np.array_split(np.arange(p.size), 7):
+        fit.update(p[chunk], q[chunk])
+    slope, intercept = np.polyfit(q, p, 1)
+    assert np.isclose(fit.slope, slope) and np.isclose(fit.intercept, intercept)
+    assert isinstance(fit.curve, Demand)
+
+
+def test_decay_follows_shift():
+    p, q = make_data()
+    fit = OnlineLinearFit(Demand, decay=0.99)
+    fit.update(p, q)
+    fit.update(p + 5, q)
+    assert abs(fit.intercept - 17) < 0.1
+
+
+def test_stream_from_csv(tmp_path):
+    p, q = make_data(100)
+    path = tmp_path / "obs.csv"
+    np.savetxt(path, np.column_stack([p, q]), delimiter=",", header="price,quantity", comments="")
+    results = list(OnlineLinearFit(Demand).fit_stream(read_csv_chunks(path, 30), Supply(0, 1)))
+    assert len(results) == 4
+    curve, e = results[-1]
+    assert abs(e.price - 4) < 0.1
+
+
+def test_grouped_fit():
+    rng = np.random.default_rng(1)
+    sku = rng.integers(0, 50, 5000)
+    q = rng.uniform(0, 6, sku.size)
+    p = (10 + sku) - 2 * q + rng.normal(0, 0.1, sku.size)
+    fit = fit_grouped(sku, p, q)
+    assert len(fit) == 50
+    mask = sku == 7
+    slope, intercept = np.polyfit(q[mask], p[mask], 1)
+    assert np.isclose(fit.curve(7).slope, slope)
+    assert np.isclose(fit.curves.intercept[7], intercept)
+    assert (fit.slope_se < 0.01).all()
+    assert np.allclose(fit.curves.equilibrium(CurveArray(0, np.ones(50))).price, (10 + np.arange(50)) / 3, atol=0.1)
@@ -0,0 +1,68 @@
+import copy
+from dataclasses import asdict
+
+import numpy as np
+
+import curves
+import econ101
+from econ101 import Aggregate, Demand, Supply
+from incremental import IncrementalMarket
+
+
+def brute_force(demands, supplies):
+    """Clearing price by bisection on the aggregate curves."""
+    demand, supply = Aggregate(demands), Aggregate(supplies)
+    lo, hi = -100.0, 100.0
+    for _ in range(100):
+        mid = 0.5 * (lo + hi)
+        lo, hi = (mid, hi) if demand.q(mid) > supply.q(mid) else (lo, mid)
+    return lo, demand.q(lo)
+
+
+def test_follows_shifts():
+    rng = np.random.default_rng(0)
+    demands = [Demand(rng.uniform(5, 20), -rng.uniform(0.5, 2)) for _ in range(50)]
+    supplies = [Supply(rng.uniform(0, 10), rng.uniform(0.5, 2)) for _ in range(50)]
+    market = IncrementalMarket(demands, supplies)
+    assert np.allclose(market.equilibrium(), brute_force(demands, supplies))
+    for _ in range(200):
+        curve = (demands + supplies)[rng.integers(100)]
+        curve.vertical_shift(rng.normal())
+        curve.horizontal_shift(rng.normal())
+    assert np.allclose(market.equilibrium(), brute_force(demands, supplies))
+    assert market.breakpoints() == sorted(c.intercept for c in demands + supplies)
+
+
+def test_observers_are_not_fields():
+    demand = curves.Demand(10, -1)
+    IncrementalMarket([demand], [curves.Supply(0, 1)])
+    assert asdict(demand) == {"intercept": 10, "slope": -1}
+    assert repr(demand) == "Demand(intercept=10, slope=-1)"
+    assert demand == curves.Demand(10, -1)
+
+
+def test_dataclass_curves():
+    demand, supply = curves.Demand(10, -1), curves.Supply(0, 1)
+    market = IncrementalMarket([demand], [supply])
+    assert market.equilibrium() == (5, 5)
+    demand.horizontal_shift(2)
+    assert market.equilibrium() == (6, 6)
+    market.remove(supply)
+    demand.vertical_shift(1)
+    assert not supply._observers
+    assert market.quantity == 0
+
+
+def test_copies_do_not_share_observers():
+    for module in (curves, econ101):
+        demand, supply = module.Demand(10, -1), module.Supply(0, 1)
+        market = IncrementalMarket([demand], [supply])
+        for clone in (copy.copy(demand), copy.deepcopy(demand)):
+            clone.vertical_shift(4)  # not a member, the market does not move
+            assert market.equilibrium() == (5, 5)
+        demand.vertical_shift(2)
+        assert market.equilibrium() == (6, 6)
+
+    stray = curves.Demand(3, -1)
+    market._shifted(stray, 3)  # unknown curves are ignored
+    assert len(market) == 2
@@ -0,0 +1,35 @@
+import instrument
+from econ101 import Aggregate, Demand, Supply
+
+
+def market():
+    return Aggregate([Demand(10, -1), Demand(8, -2)]), Aggregate([Supply(0, 1), Supply(2, 1)])
+
+
+def test_profile_counts_calls_and_iterations():
+    demand, supply = market()
+    with instrument.profile() as stats:
+        demand.equilibrium(supply)
+        demand.equilibrium(supply)
+    assert stats["Aggregate.equilibrium"]["calls"] == 2
+    assert stats["Aggregate.equilibrium"]["iterations"] > 0
+    assert stats["Aggregate.equilibrium"]["time"] >= 0
+    assert not instrument.enabled()
+
+
+def test_subscribe_and_disabled():
+    demand, supply = market()
+    events = []
+
+    def callback(name, fields):
+        events.append((name, fields))
+
+    instrument.subscribe(callback)
+    demand.productive_efficiency(5)
+    instrument.unsubscribe(callback)
+    assert ("Aggregate.productive_efficiency", {"matrix_size": 3}) in events
+    assert any(name == "Aggregate.productive_efficiency" and "calls" in fields for name, fields in events)
+
+    count = len(events)
+    demand.equilibrium(supply)
+    assert len(events) == count
@@ -0,0 +1,91 @@
+import numpy as np
+import pytest
+
+import kernel
+
+
+def test_affine_fast_path():
+    assert kernel.evaluate((12, -2), 3) == 6
+    assert kernel.inverse((12, -2), 6) == 3
+    assert kernel.intersect((12, -2), (0, 1)) == (4, 4)
+
+
+def test_coefficient_columns():
+    coef = np.array([12, 20]), np.array([-2, -4])
+    assert kernel.inverse(coef, 4).tolist() == [4, 4]
+    assert kernel.evaluate(coef, np.array([[0], [1]])).tolist() == [[12, 20], [10, 16]]
+
+
+def test_polynomial_path():
+    coef = (50, 1, 4)
+    assert kernel.evaluate(coef, 2) == 68
+    assert kernel.derivative(coef) == (1, 8)
+    assert np.isclose(kernel.inverse(coef, 68), 2)
+    p, q = kernel.intersect((0, 0, 1), (2, 1))
+    assert np.isclose(q, 2) and np.isclose(p, 4)
+
+
+def test_vectorized_inverse():
+    u_shaped = (10, -4, 1)
+    assert np.isclose(kernel.inverse(u_shaped, 8), 2 + np.sqrt(2))
+    assert np.isclose(kernel.inverse(u_shaped, 8, branch="smallest"), 2 - np.sqrt(2))
+    assert np.isnan(kernel.inverse(u_shaped, 5))
+
+    cubic = (10, -6, 1.5, 0.05)
+    p = np.linspace(0, 100, 101)
+    q = kernel.inverse(cubic, p)
+    found = ~np.isnan(q)
+    assert np.allclose(kernel.evaluate(cubic, q[found]), p[found])
+    assert np.allclose(q[found], [kernel.inverse(cubic, x) for x in p[found]])
+
+
+def test_zero_leading_coefficients():
+    assert kernel.inverse((2, 2, 0), 1) == -0.5  # a line, negative quantity kept
+    cubic = (np.array([10, 2]), np.array([-6, 2]), np.array([1.5, 0]), np.array([0.05, 0]))
+    q = kernel.inverse(cubic, np.array([20, 1]))
+    assert q[1] == -0.5 and np.isclose(q[0], kernel.inverse((10, -6, 1.5, 0.05), 20))
+    mixed = (np.array([10, 2]), np.array([-4, 2]), np.array([1, 0]))
+    assert np.allclose(kernel.inverse(mixed, 8), [2 + np.sqrt(2), kernel.inverse((2, 2), 8)])
+    assert kernel.inverse(mixed, 1)[1] == kernel.inverse((2, 2), 1) == -0.5
+
+
+def test_root_choice():
+    # inverse takes the rising branch, intersect the first crossing
+    u_shaped = (10, -4, 1)
+    assert np.isclose(kernel.inverse(u_shaped, 8), 2 + np.sqrt(2))
+    p, q = kernel.intersect(u_shaped, (8,))
+    assert np.isclose(q, 2 - np.sqrt(2)) and np.isclose(p, 8)
+
+
+def test_average_cost_minimum():
+    q, ac = kernel.average_cost_minimum((50, 1, 4))
+    assert np.isclose(q, np.sqrt(50 / 4)) and np.isclose(ac, 1 + 8 * np.sqrt(50 / 4))
+    assert kernel.average_cost_minimum((0, 10, -2, 0.5)) == (2, 8)  # minimal AVC
+    assert kernel.average_cost_minimum((5, 10)) == (np.inf, 10)
+
+    cubic = (50, 10, -2, 0.5)
+    grid = np.linspace(0.1, 20, 100_001)
+    q, ac = kernel.average_cost_minimum(kernel.columns([(50, 1, 4), cubic]))
+    assert np.isclose(ac[1], (kernel.evaluate(cubic, grid) / grid).min())
+
+
+def test_pairwise_sum_float32():
+    x = np.random.default_rng(0).uniform(0, 1, 10**6).astype(np.float32)
+    exact = np.sum(x, dtype=np.float64)
+    error = abs(float(kernel.pairwise_sum(x)) - exact) / exact
+    assert error < 2 * np.finfo(np.float32).eps * np.log2(x.size)
+    assert error < abs(float(np.cumsum(x)[-1]) - exact) / exact  # running sum drifts
+    assert kernel.pairwise_sum(np.ones((3, 5)), axis=1).tolist() == [5, 5, 5]
+
+
+def test_parallel_lines():
+    with pytest.raises(np.linalg.LinAlgError):
+        kernel.intersect((12, -2), (0, -2))
+    p, q = kernel.intersect((np.array([12, 12]), np.array([-2, -2])), (0, np.array([1, -2])))
+    assert q[0] == 4 and np.isnan(q[1]) and np.isnan(p[1])
+
+
+def test_dev_curves_use_root_kernel():
+    from dev import curves as dev_curves
+
+    assert dev_curves.kernel is kernel
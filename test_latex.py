@@ -0,0 +1,25 @@
+import latex
+from econ101 import PPF, Demand, Equilibrium, JointPPF, Supply, TotalCost
+
+
+def test_expression():
+    assert latex.expression((12, -2)) == "12 - 2*x"
+    assert latex.expression((50, 1, 4)) == "50 + 1*x + 4*x^2"
+
+
+def test_equilibrium_with_tax():
+    e = Equilibrium(Demand(12, -2), Supply(0, 1))
+    e.set_tax(3)
+    code = latex.equilibrium(e)
+    assert code.startswith("\\begin{tikzpicture}")
+    assert "{12 - 2*x}" in code
+    # DWL triangle between the taxed and the market quantity
+    assert "(axis cs:3,6) -- (axis cs:4,4) -- (axis cs:3,3) -- cycle" in code
+
+
+def test_cost_and_ppf():
+    c = TotalCost(50, 1, 4)
+    code = latex.cost(c.average_cost(), c.marginal_cost(), labels=["ATC", "MC"])
+    assert "{1 + 4*x + 50/x}" in code and "\\addlegendentry{MC}" in code
+    joint = JointPPF([PPF(max1=10, max2=20), PPF(max1=30, max2=15)])
+    assert "coordinates {(0,35) (30,20) (40,0)}" in latex.joint_ppf(joint)
@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+
+import loops
+from econ101 import PPF, Aggregate, Demand, Game, JointPPF, Supply
+
+
+def test_compiled_and_python_paths_agree():
+    rng = np.random.default_rng(0)
+    for _ in range(20):
+        args = (
+            rng.uniform(10, 20, 5),
+            -rng.uniform(0.5, 2, 5),
+            rng.uniform(0, 5, 3),
+            rng.uniform(0.5, 2, 3),
+            True,
+            1.0,
+            1.0,
+            0.01,
+        )
+        assert loops.step_search(*args) == loops.python.step_search(*args)
+
+        payoffs = rng.integers(0, 5, (2, 2, 2)).astype(float)
+        assert (loops.pure_nash(payoffs) == loops.python.pure_nash(payoffs)).all()
+
+        p1, p2 = rng.uniform(1, 3, 4), rng.uniform(1, 3, 4)
+        goods = 100.0, rng.uniform(0, 200), rng.uniform(0, 200)
+        assert loops.ppf_shortfall(p1, p2, *goods) == loops.python.ppf_shortfall(p1, p2, *goods)
+
+
+@pytest.mark.parametrize("path", [loops, loops.python], ids=["default", "python"])
+def test_kernel_results(path):
+    args = np.array([10.0, 8.0]), np.array([-1.0, -2.0]), np.array([0.0, 2.0]), np.array([1.0, 1.0])
+    price, steps = path.step_search(*args, True, 1.0, 1.0, 0.05)
+    assert abs(price - 16 / 3.5) < 0.05 and steps > 0
+    prisoners = np.array([[[3, 3], [0, 5]], [[5, 0], [1, 1]]], dtype=float)
+    assert path.pure_nash(prisoners).tolist() == [[False, False], [False, True]]
+    assert path.best_response(prisoners, 0, 0) == (1, 1)
+    assert path.ppf_shortfall(np.array([0.1, 1 / 30]), np.array([0.05, 1 / 15]), 1.0, 0.0, 35.0) == 0
+    # the uncompiled kernels only call uncompiled helpers
+    assert loops.python.step_search.__globals__["total_q"] is loops.python.total_q
+
+
+def test_market_loops():
+    demand = Aggregate([Demand(10, -1), Demand(8, -2)])
+    p, q = demand.equilibrium(Aggregate([Supply(0, 1), Supply(2, 1)]))
+    assert abs(p - 16 / 3.5) < 0.05 and abs(q - demand.q(p)) < 1e-12
+    assert demand.equilibrium(Supply(0, 1))[0] > p
+
+    prisoners = Game((3, 3), (0, 5), (5, 0), (1, 1))
+    assert prisoners.nash() == {"A1B1"}
+    assert prisoners.best_response("00") == [1, 1]
+    assert prisoners.best_response((1, 1)) == [1, 1]
+
+    ppf = JointPPF([PPF(max1=10, max2=20), PPF(max1=30, max2=15)])
+    assert ppf.efficiency(5, 5) == "inefficient"
+    assert ppf.efficiency(0, 35) == "efficient"
+    assert ppf.efficiency(60, 0) == "unattainable"
+
+
+def test_nonlinear_other_uses_generic_search():
+    from consumer import CobbDouglas, MarketDemand
+
+    demand = MarketDemand(CobbDouglas(0.5), income=np.full(1000, 0.5))
+    p, q = Aggregate([Supply(0, 10)]).equilibrium(demand)
+    assert abs(p - 50) < 0.5 and abs(q - demand.q(p)) < 0.05
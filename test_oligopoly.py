@@ -0,0 +1,48 @@
+import numpy as np
+
+from econ101 import Demand, TotalCost
+from oligopoly import Bertrand, Cournot, Monopoly, cournot, monopoly
+
+
+def test_monopoly():
+    m = Monopoly(Demand(100, -1), TotalCost(0, 20, 0))
+    assert (m.p, m.q, m.profit, m.dwl) == (60, 40, 1600, 800)
+    assert round(m.lerner, 4) == 0.6667
+
+
+def test_monopoly_cubic_cost():
+    r = monopoly(100, -1, (0, 20, -1, 0.1))
+    # MR = MC at the chosen quantity
+    q = r["quantity"]
+    assert abs((100 - 2 * q) - (20 - 2 * q + 0.3 * q**2)) < 1e-9
+
+
+def test_cournot_duopoly():
+    c = Cournot(Demand(100, -1), [TotalCost(0, 20, 0)] * 2)
+    assert round(c.p, 4) == 46.6667
+    assert c.hhi == 5000
+    iterative = Cournot(Demand(100, -1), [TotalCost(0, 20, 0)] * 2, method="best_response")
+    assert np.allclose(iterative.firm_q, c.firm_q)
+
+
+def test_cournot_exit():
+    costs = [TotalCost(0, 10, 1), TotalCost(0, 20, 0), TotalCost(0, 95, 0)]
+    c = Cournot(Demand(100, -1), costs)
+    assert c.firm_q[2] == 0
+    assert np.allclose(c.firm_q, Cournot(Demand(100, -1), costs, "best_response").firm_q, atol=1e-6)
+
+
+def test_cournot_batch():
+    n = np.arange(1, 6)
+    # symmetric firms: Q = N / (N + 1) * (a - c) / b
+    mc = np.where(np.arange(5) < n[:, None], 20, 200)
+    r = cournot(100, -1, (0, mc))
+    assert np.allclose(r["quantity"], n / (n + 1) * 80)
+
+
+def test_bertrand():
+    b = Bertrand(Demand(100, -1), [TotalCost(0, 20, 0), TotalCost(0, 30, 0)])
+    assert b.p == 30
+    assert b.firm_q.tolist() == [70, 0]
+    tie = Bertrand(Demand(100, -1), [TotalCost(0, 20, 0)] * 2)
+    assert tie.firm_q.tolist() == [40, 40]
@@ -0,0 +1,39 @@
+import numpy as np
+
+from econ101 import PPF
+from production import LinearProduction
+
+
+def make_model():
+    return LinearProduction.from_ppfs([PPF(max1=10, max2=20), PPF(max1=30, max2=15)])
+
+
+def test_intercepts():
+    assert make_model().intercepts.tolist() == [40, 35]
+
+
+def test_specialization_and_gains():
+    s = make_model().solve([1, 1])
+    assert round(s.scale, 4) == 23.3333
+    assert s.specialization().tolist() == [[False, True], [True, True]]
+    assert round(s.prices @ [1, 1], 4) == 1
+    assert round(s.total_gains, 4) == round(s.gains.sum(), 4) == 6.6667
+
+
+def test_efficiency():
+    model = make_model()
+    assert model.efficiency(20, 20) == "inefficient"
+    assert model.efficiency(40, 0) == "efficient"
+    assert model.efficiency(30, 30) == "unattainable"
+    assert model.efficiency(0, 0) == "inefficient"
+
+
+def test_warm_start():
+    rng = np.random.default_rng(0)
+    model = LinearProduction(rng.uniform(0.5, 5, (50, 20)))
+    d = rng.uniform(0.5, 1.5, 20)
+    model.solve(d)
+    model.productivity = model.productivity * rng.uniform(0.99, 1.01, (50, 20))
+    warm, cold = model.solve(d), model.solve(d, warm_start=False)
+    assert np.isclose(warm.scale, cold.scale)
+    assert warm.iterations < cold.iterations
@@ -0,0 +1,27 @@
+import numpy as np
+
+import sampling
+from econ101 import Aggregate, Demand
+
+
+def test_vertices():
+    assert sampling.vertices([5, 30, 2, 5], 0, 20).tolist() == [0, 2, 5, 20]
+
+
+def test_adaptive_sampling_follows_curvature():
+    x, y = sampling.adaptive(lambda q: 2 + 3 * q, 0, 10)
+    assert len(x) == 9
+    x, y = sampling.adaptive(lambda q: 50 / q + 4 * q, 0.5, 20)
+    assert np.all(np.diff(x) > 0)
+    assert np.diff(x)[0] < np.diff(x)[-1]  # denser where the curve bends
+
+
+def test_aggregate_plot_through_kinks():
+    import matplotlib.pyplot as plt
+
+    demand = Aggregate([Demand(10, -1), Demand(6, -0.5), Demand(20, -2)])
+    assert demand.q(np.array([0, 5])).tolist() == [32, 14.5]
+    fig, ax = plt.subplots()
+    demand.plot(ax=ax)
+    xy = ax.lines[0].get_xydata()
+    assert xy.tolist() == [[32, 0], [11, 6], [5, 10], [0, 20]]
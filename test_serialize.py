@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+import curves
+import serialize
+from consumer import CobbDouglas, MarketDemand
+from econ101 import PPF, Aggregate, Demand, Game, JointPPF, MarginalCost, Supply, TotalCost
+
+
+def test_round_trip(tmp_path):
+    path = tmp_path / "objects.npz"
+    demand = Aggregate([Demand(10, -1), Demand(8, -2)])
+    game = Game((3, 3), (0, 5), (5, 0), (1, 1), player_names=["Row", "Column"], B_action_names=["left", "right"])
+    ppf = JointPPF([PPF(max1=10, max2=20), PPF(max1=30, max2=15)])
+    serialize.save(
+        path,
+        demand=demand,
+        supply=Supply(0, 1),
+        line=curves.Demand(12, -2),
+        total=TotalCost(10, 2, 1),
+        mc=MarginalCost(2, 2),
+        game=game,
+        ppf=ppf,
+    )
+    x = serialize.load(path)
+    assert type(x["demand"]) is Aggregate and type(x["demand"].curve_array[1]) is Demand
+    assert x["demand"].equilibrium(x["supply"]) == demand.equilibrium(Supply(0, 1))
+    assert x["line"] == curves.Demand(12, -2)
+    assert type(x["total"]) is TotalCost and x["total"].efficient_scale() == TotalCost(10, 2, 1).efficient_scale()
+    assert type(x["mc"]) is MarginalCost and x["mc"].cost(3) == MarginalCost(2, 2).cost(3)
+    assert x["game"].payoffs01 == (0, 5) and x["game"].nash() == game.nash()
+    assert x["game"].player_names == ["Row", "Column"] and x["game"].B_action_names == ["left", "right"]
+    assert x["game"].A_action_names == ["action 0", "action 1"]
+    assert x["ppf"].kinks == ppf.kinks and x["ppf"].efficiency(5, 5) == "inefficient"
+    assert serialize.read_header(path)["schema_version"] == serialize.SCHEMA_VERSION
+
+
+def test_bulk_columns(tmp_path):
+    path = tmp_path / "bulk.npz"
+    rng = np.random.default_rng(0)
+    population = curves.CurveArray(rng.uniform(5, 20, 10**6), -rng.uniform(0.5, 2, 10**6), curves.Demand, np.float32)
+    serialize.save(path, population=population, market=Aggregate([Demand(10, -1), Demand(8, -2)]))
+    loaded = serialize.load(path, arrays=True)
+    assert loaded["population"].kind is curves.Demand and loaded["population"].intercept.dtype == np.float32
+    assert np.array_equal(loaded["population"].slope, population.slope)
+    assert loaded["market"].intercept.tolist() == [10, 8] and loaded["market"].kind is Demand
+
+
+def test_rejects_unknown(tmp_path):
+    with pytest.raises(TypeError):
+        serialize.save(tmp_path / "x.npz", thing=object())
+    with pytest.raises(ValueError):
+        serialize.save(tmp_path / "x.npz", **{"a/b": Supply(0, 1)})
+    market = Aggregate([Demand(10, -1), MarketDemand(CobbDouglas(0.5), income=np.full(10, 0.5))])
+    with pytest.raises(TypeError, match="MarketDemand"):
+        serialize.save(tmp_path / "x.npz", market=market)
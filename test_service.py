@@ -0,0 +1,58 @@
+import asyncio
+import subprocess
+import sys
+
+import numpy as np
+
+import batch
+import instrument
+from curves import Demand, Supply
+from service import MarketService
+
+
+def test_concurrent_requests_share_a_batch():
+    taxes = np.linspace(0, 5, 50)
+
+    async def main():
+        async with MarketService(window=0.01) as markets:
+            return await asyncio.gather(
+                *[markets.equilibrium(Demand(12, -2), Supply(0, 1), tax=t) for t in taxes],
+                markets.quota((10, -1), (0, 1), 2),
+            )
+
+    with instrument.profile() as stats:
+        *results, quota = asyncio.run(main())
+    assert stats["MarketService.equilibrium"] == {"batches": 1, "requests": 50}
+    expected = batch.equilibrium(12, -2, 0, 1, taxes)
+    for name in batch.COLUMNS:
+        assert np.allclose([r[name] for r in results], expected[name])
+    assert quota["quota_rent"] == 12
+
+
+def test_offloaded_batches_and_errors():
+    async def main():
+        markets = MarketService(window=0.01, offload=2)
+        ok = asyncio.gather(*[markets.equilibrium(Demand(12, -2), Supply(0, 1)) for _ in range(3)])
+        bad = markets.equilibrium((12, -2, 1), (0, 1))
+        return await ok, await asyncio.gather(bad, return_exceptions=True)
+
+    results, (error,) = asyncio.run(main())
+    assert [r["quantity"] for r in results] == [4, 4, 4]
+    assert isinstance(error, ValueError)
+
+
+def test_import_is_light():
+    code = "import sys, service; print('matplotlib' in sys.modules)"
+    assert subprocess.check_output([sys.executable, "-c", code], text=True).strip() == "False"
+
+
+def test_bad_request_fails_alone():
+    async def main():
+        markets = MarketService(window=0.01)
+        good = markets.equilibrium((12, -2), (0, 1), tax=3)
+        bad = markets.equilibrium((12, -2), (0, 1), tax=[1, 2])
+        return await asyncio.wait_for(asyncio.gather(good, bad, return_exceptions=True), 1)
+
+    good, bad = asyncio.run(main())
+    assert good["quantity"] == 3
+    assert isinstance(bad, ValueError)
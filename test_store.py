@@ -0,0 +1,44 @@
+import numpy as np
+
+from batch import equilibrium, supply_schedule
+from econ101 import Demand, Equilibrium, Supply
+from store import ResultStore, load, read_metadata, save, tax_sweep, to_csv
+
+
+def test_batch_equilibrium_matches_set_tax():
+    demand, supply = Demand(12, -2), Supply(0, 1)
+    e = Equilibrium(demand, supply)
+    e.set_tax(3)
+    x = equilibrium(12, -2, 0, 1, tax=np.array([0, 3]))
+    assert np.allclose(x["quantity"], [4, e.q])
+    assert np.isclose(x["dwl"][1], e.dwl)
+    assert np.isclose(x["price_consumer"][1], e.p_consumer)
+
+
+def test_chunked_store(tmp_path):
+    path = str(tmp_path / "sweep")
+    with ResultStore(path, n_rows=5, columns=["a", "b"], metadata={"x": 1}) as store:
+        store.append({"a": [1, 2], "b": [3, 4]})
+        store.append({"a": [5], "b": [6]})
+    columns = load(path)
+    assert columns["a"].tolist() == [1, 2, 5]
+    assert isinstance(columns["b"].base, np.memmap)
+    assert read_metadata(path)["metadata"] == {"x": 1}
+
+
+def test_tax_sweep(tmp_path):
+    taxes = np.linspace(0, 6, 101)
+    columns = tax_sweep(str(tmp_path / "taxes"), Demand(12, -2), Supply(0, 1), taxes, chunk_size=7)
+    assert np.allclose(columns["tax"], taxes)
+    assert columns["quantity"][0] == 4
+
+
+def test_save_keeps_dtypes(tmp_path):
+    table = supply_schedule([1, 2, 3], constant=[5, 6], linear=1, quadratic=0.5)
+    columns = save(str(tmp_path / "schedule"), table)
+    assert columns["firm"].dtype.kind == "i"
+    assert columns["shutdown"].dtype == bool
+    to_csv(tmp_path / "schedule.csv", table)
+    lines = (tmp_path / "schedule.csv").read_text().splitlines()
+    assert lines[0] == ",".join(table)
+    assert len(lines) == 7
@@ -0,0 +1,73 @@
+import numpy as np
+import pytest
+
+import curves
+import surplus
+from consumer import CobbDouglas, MarketDemand
+from econ101 import Aggregate, Demand, Equilibrium, Supply
+
+
+def brute_surplus(curves, p):
+    """Numerically integrated surplus of each curve at price p."""
+    out = []
+    for c in curves:
+        q = np.linspace(0, max(float(c.q(p)), 0), 20001)
+        gap = np.abs(c.p(q) - p)
+        out.append(np.sum(0.5 * (gap[1:] + gap[:-1]) * np.diff(q)))
+    return np.array(out)
+
+
+def test_aggregate_surplus_matches_integration():
+    rng = np.random.default_rng(0)
+    demands = [Demand(rng.uniform(5, 20), -rng.uniform(0.5, 2)) for _ in range(30)]
+    supplies = [Supply(rng.uniform(-2, 8), rng.uniform(0.5, 2)) for _ in range(30)]
+    demand, supply = Aggregate(demands), Aggregate(supplies)
+    prices = np.linspace(-5, 25, 61)
+    assert np.allclose(demand.surplus(prices), demand.surplus_by_curve(prices).sum(axis=0))
+    assert np.allclose(supply.surplus(prices), supply.surplus_by_curve(prices).sum(axis=0))
+    assert np.allclose(demand.surplus_by_curve(7.5), brute_surplus(demands, 7.5), atol=1e-6)
+    assert np.allclose(supply.surplus_by_curve(7.5), brute_surplus(supplies, 7.5), atol=1e-6)
+    assert np.allclose(demand.kink_table().quantity(prices), demand.q(prices))
+    assert demand.surplus(25) == 0 and supply.surplus(-5) == 0
+
+
+def test_market_at_clearing_price():
+    demand = Aggregate([Demand(10, -1), Demand(8, -2)])
+    supply = Aggregate([Supply(0, 1), Supply(2, 1)])
+    m = surplus.market(demand.kink_table(), supply.kink_table())
+    assert np.isclose(m["price"], 16 / 3.5)
+    assert np.isclose(demand.q(m["price"]), supply.q(m["price"]))
+    assert np.isclose(m["consumer_surplus"], 0.5 * (10 - m["price"]) ** 2 + 0.25 * (8 - m["price"]) ** 2)
+    assert m["consumer"].shape == (2,) and np.isclose(m["total_surplus"], m["consumer"].sum() + m["producer"].sum())
+    assert np.isnan(surplus.clearing_price(surplus.KinkTable(5, -1), surplus.KinkTable(6, 1)))
+
+    demand.curve_array[0].vertical_shift(2)  # cached table follows shifts
+    assert np.isclose(surplus.market(demand.kink_table(), supply.kink_table())["price"], 18 / 3.5)
+
+
+def test_equilibrium_surplus():
+    e = Equilibrium(Demand(12, -2), Supply(0, 1))
+    e.set_tax(3)
+    ps, cs, govt = e.surplus()
+    assert (ps, cs, govt) == (4.5, 9, 9)
+
+
+def test_negative_intercept_producer_surplus():
+    e = Equilibrium(Demand(14, -1), Supply(-2, 1))
+    ps, _, _ = e.surplus()
+    table = surplus.KinkTable.from_curves([e.supply])
+    assert ps == table.surplus(e.p) == e.supply.producer_surplus(e.p) == curves.Supply(-2, 1).producer_surplus(e.p) == 32
+
+
+def test_kink_table_cache_and_members():
+    demand = Aggregate([Demand(10, -1), Demand(8, -2)])
+    table = demand.kink_table()
+    assert demand.kink_table() is table
+    demand.curve_array[1].horizontal_shift(1)
+    assert demand.kink_table() is not table and demand.kink_table().quantity(0) == 15
+    demand.curve_array.append(Demand(6, -1))
+    assert demand.kink_table().quantity(0) == 21
+
+    market = Aggregate([Demand(10, -1), MarketDemand(CobbDouglas(0.5), income=np.full(10, 0.5))])
+    with pytest.raises(TypeError):
+        market.surplus(2)
@@ -0,0 +1,37 @@
+import numpy as np
+import matplotlib.pyplot as plt
+
+from econ101 import Demand, Supply
+from trade import OpenEconomy, import_quota, tariff
+
+
+def test_tariff():
+    o = OpenEconomy(Demand(10, -1), Supply(0, 1), world_price=2)
+    assert o.imports == 6
+    o.set_tariff(2)
+    assert (o.p, o.imports, o.tariff_revenue) == (4, 2, 4)
+    assert (o.production_dwl, o.consumption_dwl) == (2, 2)
+
+
+def test_equivalent_quota():
+    x = import_quota(10, -1, 0, 1, world_price=2, quota=np.array([2, 10]))
+    assert x["domestic_price"].tolist() == [4, 2]
+    assert x["quota_rent"].tolist() == [4, 0]
+
+
+def test_sensitivity_table():
+    x = tariff(10, -1, 0, 1, world_price=np.array([2, 4, 6])[:, None], rate=np.array([0, 1, 10]))
+    assert x["imports"].tolist() == [[6, 4, 0], [2, 0, 0], [-2, -2, -2]]
+    # prohibitive tariff loses all gains from trade
+    assert x["dwl"][0].tolist() == [0, 1, 9]
+
+
+def test_plot_layers():
+    fig, ax = plt.subplots()
+    o = OpenEconomy(Demand(10, -1), Supply(0, 1), world_price=2)
+    o.set_tariff(2)
+    o.plot(ax=ax)
+    o.plot_revenue(ax=ax)
+    o.plot_dwl(ax=ax)
+    assert len(ax.collections) == 3
+    plt.close(fig)
@@ -0,0 +1,168 @@
+"""Small open economy facing a world price, with tariffs and import quotas.
+
+The domestic market is a linear demand and supply pair as in
+`econ101.Equilibrium`. Without barriers, the domestic price equals the world
+price and the gap between consumption and production is imported (or exported
+when the world price is above the autarky price). A tariff raises the domestic
+price of imports by its amount, and an import quota raises the domestic price
+until imports fall to the quota. Both create a production and a consumption
+DWL triangle relative to free trade.
+
+Functions take scalars or arrays that broadcast against each other and return
+dicts of columns, so `world_price[:, None]` and `rate[None, :]` give a
+sensitivity table of every world price against every tariff rate.
+"""
+import numpy as np
+import matplotlib.pyplot as plt  # type: ignore
+
+import batch
+
+COLUMNS = (
+    "domestic_price",
+    "consumption",
+    "production",
+    "imports",
+    "consumer_surplus",
+    "producer_surplus",
+    "tariff_revenue",
+    "quota_rent",
+    "production_dwl",
+    "consumption_dwl",
+    "dwl",
+)
+
+
+def autarky_price(demand_intercept, demand_slope, supply_intercept, supply_slope):
+    """Domestic market-clearing price without trade."""
+    q = batch.market_quantity(demand_intercept, demand_slope, supply_intercept, supply_slope)
+    return demand_intercept + demand_slope * q
+
+
+def tariff(demand_intercept, demand_slope, supply_intercept, supply_slope, world_price, rate=0):
+    """Outcome under a per-unit import tariff of *rate*. A tariff that raises the price
+    above the autarky price is prohibitive; exports are not taxed."""
+    world_price = np.asarray(world_price, dtype=float)
+    p_autarky = autarky_price(demand_intercept, demand_slope, supply_intercept, supply_slope)
+    price = np.where(world_price >= p_autarky, world_price, np.minimum(world_price + rate, p_autarky))
+    result = _open_market(
+        demand_intercept, demand_slope, supply_intercept, supply_slope, world_price, price
+    )
+    result["tariff_revenue"] = (price - world_price) * np.maximum(result["imports"], 0)
+    return result
+
+
+def import_quota(demand_intercept, demand_slope, supply_intercept, supply_slope, world_price, quota):
+    """Outcome when imports are limited to *quota*. Importers buy at the world
+    price, sell at the domestic price and keep the quota rent."""
+    world_price = np.asarray(world_price, dtype=float)
+    p_autarky = autarky_price(demand_intercept, demand_slope, supply_intercept, supply_slope)
+    # domestic price where excess demand Qd(p) - Qs(p) equals the quota
+    binding = (quota + demand_intercept / demand_slope - supply_intercept / supply_slope) / (
+        1 / demand_slope - 1 / supply_slope
+    )
+    price = np.where(world_price >= p_autarky, world_price, np.clip(binding, world_price, p_autarky))
+    result = _open_market(
+        demand_intercept, demand_slope, supply_intercept, supply_slope, world_price, price
+    )
+    result["quota_rent"] = (price - world_price) * np.maximum(result["imports"], 0)
+    return result
+
+
+def _open_market(demand_intercept, demand_slope, supply_intercept, supply_slope, world_price, price):
+    """Columns at domestic *price*, with DWL triangles relative to free trade at *world_price*."""
+
+    def demanded(p):
+        return np.maximum((p - demand_intercept) / demand_slope, 0)
+
+    def supplied(p):
+        return np.maximum((p - supply_intercept) / supply_slope, 0)
+
+    consumption, production = demanded(price), supplied(price)
+    free_consumption, free_production = demanded(world_price), supplied(world_price)
+
+    # areas between the curves and the world price over the quantities lost
+    production_dwl = (supply_intercept - world_price) * (production - free_production) + 0.5 * supply_slope * (
+        production**2 - free_production**2
+    )
+    consumption_dwl = (demand_intercept - world_price) * (free_consumption - consumption) + 0.5 * demand_slope * (
+        free_consumption**2 - consumption**2
+    )
+    return {
+        "domestic_price": price,
+        "consumption": consumption,
+        "production": production,
+        "imports": consumption - production,
+        "consumer_surplus": (demand_intercept - price) * consumption + 0.5 * demand_slope * consumption**2,
+        "producer_surplus": (price - supply_intercept) * production - 0.5 * supply_slope * production**2,
+        "tariff_revenue": 0 * price,
+        "quota_rent": 0 * price,
+        "production_dwl": production_dwl,
+        "consumption_dwl": consumption_dwl,
+        "dwl": production_dwl + consumption_dwl,
+    }
+
+
+class OpenEconomy:
+    def __init__(self, demand, supply, world_price):
+        """Domestic *demand* and *supply* facing a *world_price*. Initialized with free trade."""
+        self.demand = demand
+        self.supply = supply
+        self.world_price = world_price
+        self.autarky_price = float(autarky_price(*demand.coef, *supply.coef))
+        self.set_tariff(0)
+
+    def set_tariff(self, rate):
+        """Impose a per-unit import tariff, replacing any tariff or quota."""
+        self._set(tariff(*self.demand.coef, *self.supply.coef, self.world_price, rate))
+
+    def set_import_quota(self, quota):
+        """Limit imports to *quota*, replacing any tariff or quota."""
+        self._set(import_quota(*self.demand.coef, *self.supply.coef, self.world_price, quota))
+
+    def _set(self, result):
+        for key, value in result.items():
+            setattr(self, key, float(value))
+        self.p = self.domestic_price
+
+    def plot(self, ax=None, max_q=None):
+        """Plot demand, supply, the world price and the domestic price."""
+        if ax is None:
+            ax = plt.gca()
+        if max_q is None:
+            max_q = 1.2 * self.demand.q_intercept
+        for curve in self.demand, self.supply:
+            q = np.array([0, max_q])
+            ax.plot(q, curve.p(q), color="black", linewidth=2)
+        ax.axhline(self.world_price, color="C0", linestyle="dashed")
+        if self.p != self.world_price:
+            ax.axhline(self.p, color="C3", linestyle="dashed")
+        for q in self.production, self.consumption:
+            ax.plot([q, q], [0, self.p], linestyle="dotted", color="C0")
+        ax.set_ylabel("Price")
+        ax.set_xlabel("Quantity")
+        return ax
+
+    def plot_revenue(self, ax=None, annotate=True):
+        """Fill the tariff revenue or quota rent rectangle."""
+        if ax is None:
+            ax = plt.gca()
+        ax.fill_between(
+            [self.production, self.consumption], self.world_price, self.p, color="C2", alpha=0.1
+        )
+        if annotate and self.p != self.world_price:
+            label = "Revenue" if self.tariff_revenue else "Quota rent"
+            x = 0.5 * (self.production + self.consumption)
+            ax.text(x, 0.5 * (self.p + self.world_price), label, ha="center", va="center", size=8)
+
+    def plot_dwl(self, ax=None, annotate=True):
+        """Fill the production and consumption DWL triangles."""
+        if ax is None:
+            ax = plt.gca()
+        w, p = self.world_price, self.p
+        free_production = max(float(self.supply.q(w)), 0)
+        free_consumption = max(float(self.demand.q(w)), 0)
+        ax.fill_between([free_production, self.production], w, [w, p], color="red", alpha=0.1)
+        ax.fill_between([self.consumption, free_consumption], w, [p, w], color="red", alpha=0.1)
+        if annotate and p != w:
+            for q in self.production, self.consumption:
+                ax.text(q, w, "DWL", ha="center", va="bottom", size=8)